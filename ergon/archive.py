@@ -0,0 +1,287 @@
+import re
+from datetime import date, timedelta
+
+from ergon import db
+
+# Έργα σε αυτές τις καταστάσεις, χωρίς κίνηση για ARCHIVE_AFTER_DAYS,
+# προτείνονται για αρχειοθέτηση. Η κατάσταση είναι ελεύθερο κείμενο: η
+# σύγκριση γίνεται μετά το gr_fold (χωρίς τόνους, πεζά) και η σελίδα
+# Αρχείο έργων / το manage.py archive --status ορίζουν άλλες τιμές.
+CLOSED_STATUSES = ("ΟΛΟΚΛΗΡΩΘΗΚΕ", "ΟΛΟΚΛΗΡΩΜΕΝΟ", "ΑΚΥΡΩΘΗΚΕ", "ΑΚΥΡΩΜΕΝΟ")
+ARCHIVE_AFTER_DAYS = 365
+
+
+# ------------------------------------------------------------
+# ΑΡΧΕΙΟΘΕΤΗΣΗ ΚΛΕΙΣΤΩΝ ΕΡΓΩΝ
+# ------------------------------------------------------------
+
+# Ένα έργο μεταφέρεται μαζί με τα παραστατικά και το ημερολόγιό του στη
+# βάση αρχείου (db.archive_path()), με τα ίδια id. Η διαγραφή από την
+# κύρια βάση περνά από τα triggers της, οπότε υπόλοιπα, μηνιαία σύνολα,
+# ώρες και ευρετήρια αναζήτησης ενημερώνονται όπως σε κάθε διαγραφή· τα
+# AUTOINCREMENT id δεν ξαναδίνονται, οπότε η επαναφορά δεν συγκρούεται.
+#
+# Σε WAL μια συναλλαγή δεν είναι ατομική ανάμεσα σε δύο αρχεία, οπότε η
+# μεταφορά γίνεται σε δύο συναλλαγές: πρώτα αντιγραφή στον προορισμό και
+# commit, μετά διαγραφή από την πηγή μόνο όσων γραμμών υπάρχουν ήδη στον
+# προορισμό. Αν διακοπεί ανάμεσα, οι γραμμές μένουν και στα δύο αρχεία
+# (ποτέ σε κανένα)· η αντιγραφή σβήνει πρώτα ό,τι υπάρχει ήδη στον
+# προορισμό, οπότε μια επανάληψη της ίδιας εντολής διορθώνει τα διπλότυπα.
+#
+# Μόνο με SQLite (ATTACH δεύτερου αρχείου)· η PostgreSQL δεν έχει βάση
+# αρχείου και η σελίδα Αρχείο έργων δεν εμφανίζεται.
+
+# (πίνακας, στήλη έργου), με τη σειρά εισαγωγής
+ARCHIVED_TABLES = (
+    ("projects", "id"),
+    ("documents", "project_id"),
+    ("worklog", "project_id"),
+)
+
+ARCHIVE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS archive.idx_documents_project ON documents(project_id)",
+    """CREATE INDEX IF NOT EXISTS archive.idx_documents_supplier_statement
+       ON documents(supplier_id, IFNULL(doc_date,0), id, charge, vat, credit, payments)""",
+    "DROP INDEX IF EXISTS archive.idx_documents_date",
+    "CREATE INDEX IF NOT EXISTS archive.idx_documents_list ON documents(IFNULL(doc_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_worklog_project ON worklog(project_id)",
+)
+
+# Αναζήτηση στο αρχείο (search.ARCHIVED_ENTITIES)
+ARCHIVE_FTS = ("projects", "documents")
+
+# Πίνακες που αλλάζουν σε μια μεταφορά (για την ακύρωση του cache)
+MOVE_TABLES = (
+    db.ARCHIVE_SCHEMA, "projects", "documents", "worklog",
+    "project_cost", "project_hours", "document_months",
+)
+
+_CREATE_TABLE_RE = re.compile(r'^\s*CREATE TABLE\s+"?\w+"?', re.IGNORECASE)
+
+
+def _require_sqlite():
+    if db.is_postgres():
+        raise ValueError("Η αρχειοθέτηση έργων υπάρχει μόνο με βάση SQLite.")
+
+
+def _closed_filter(statuses=None):
+    # (συνθήκη, παράμετροι) για τα έργα p σε κλειστή κατάσταση
+    if statuses is None:
+        statuses = CLOSED_STATUSES
+    folded = tuple(sorted({db.fold_text(s) for s in statuses} - {""}))
+    if not folded:
+        return "1 = 0", ()
+    return f"gr_fold(p.status) IN ({', '.join('?' * len(folded))})", folded
+
+
+def _columns(conn, table):
+    return [r[1] for r in conn.execute(f"PRAGMA main.table_info({table})")]
+
+
+def _ensure_schema(conn):
+    # Οι πίνακες του αρχείου αντιγράφουν το σημερινό σχήμα της κύριας βάσης
+    conn.execute(f"PRAGMA {db.ARCHIVE_SCHEMA}.journal_mode=WAL")
+    for table, _ in ARCHIVED_TABLES:
+        ddl = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        conn.execute(_CREATE_TABLE_RE.sub(
+            f"CREATE TABLE IF NOT EXISTS {db.ARCHIVE_SCHEMA}.{table}", ddl, count=1
+        ))
+    for stmt in ARCHIVE_INDEXES:
+        conn.execute(stmt)
+    for table in ARCHIVE_FTS:
+        _ensure_search(conn, table)
+
+
+def _ensure_search(conn, table):
+    # Ευρετήρια αρχείου από πριν το db.SCHEMA_V16 (external content)
+    # ξαναχτίζονται ως contentless, όπως της κύριας βάσης
+    fts = f"{table}_fts"
+    row = conn.execute(
+        f"SELECT sql FROM {db.ARCHIVE_SCHEMA}.sqlite_master WHERE name = ?", (fts,)
+    ).fetchone()
+    stale = row is not None and "content=''" not in row[0]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if stale:
+            conn.execute(f"DROP TABLE {db.ARCHIVE_SCHEMA}.{fts}")
+        for stmt in db.fts_ddl(table, db.FTS_INDEXES[table], schema=db.ARCHIVE_SCHEMA):
+            conn.execute(stmt)
+        if stale:
+            db.fill_search(conn, table, schema=db.ARCHIVE_SCHEMA)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _copy(conn, source, target):
+    # 1η συναλλαγή: τα έργα του temp.move_ids και οι γραμμές τους στον προορισμό
+    for table, key in ARCHIVED_TABLES:
+        columns = ", ".join(_columns(conn, table))
+        selected = f"{key} IN (SELECT id FROM temp.move_ids)"
+        conn.execute(f"DELETE FROM {target}.{table} WHERE {selected}")
+        conn.execute(f"""
+            INSERT INTO {target}.{table} ({columns})
+            SELECT {columns} FROM {source}.{table} WHERE {selected}
+        """)
+
+
+def _remove(conn, source, target):
+    # 2η συναλλαγή: από την πηγή φεύγουν μόνο γραμμές που ο προορισμός έχει ήδη
+    for table, key in reversed(ARCHIVED_TABLES):
+        conn.execute(f"""
+            DELETE FROM {source}.{table}
+            WHERE {key} IN (SELECT id FROM temp.move_ids)
+              AND id IN (SELECT id FROM {target}.{table})
+        """)
+    if source == "main":
+        # Τα triggers αφήνουν μηδενικές γραμμές για έργα που δεν υπάρχουν πια
+        for table in ("project_cost", "project_hours"):
+            conn.execute(f"""
+                DELETE FROM main.{table}
+                WHERE project_id IN (SELECT id FROM temp.move_ids)
+                  AND project_id NOT IN (SELECT id FROM main.projects)
+            """)
+
+
+def _transfer(project_ids, source, target, where="", params=()):
+    # Exclusive εργασία: το ATTACH / DETACH δεν γίνεται μέσα σε συναλλαγή
+    _require_sqlite()
+    project_ids = list(project_ids)
+
+    def run(conn):
+        db.attach_archive(conn)
+        try:
+            # Το σχήμα του αρχείου δημιουργείται πριν τη μεταφορά (autocommit),
+            # ώστε ένα αρχείο που υπάρχει να έχει πάντα πίνακες.
+            _ensure_schema(conn)
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS move_request (id INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS move_ids (id INTEGER PRIMARY KEY)")
+            conn.execute("BEGIN IMMEDIATE")
+            # Ξαναελέγχεται μέσα στη συναλλαγή ποια έργα ισχύουν ακόμη
+            conn.execute("DELETE FROM temp.move_request")
+            conn.execute("DELETE FROM temp.move_ids")
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.move_request (id) VALUES (?)", [(i,) for i in project_ids]
+            )
+            conn.execute(f"""
+                INSERT INTO temp.move_ids (id)
+                SELECT p.id FROM {source}.projects p
+                WHERE p.id IN (SELECT id FROM temp.move_request) {where}
+            """, params)
+            moved = conn.execute("SELECT COUNT(*) FROM temp.move_ids").fetchone()[0]
+            if moved:
+                _copy(conn, source, target)
+            conn.commit()
+            if moved:
+                conn.execute("BEGIN IMMEDIATE")
+                _remove(conn, source, target)
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            db.detach_archive(conn)
+        return moved
+
+    return db.get_manager().write(run, MOVE_TABLES, exclusive=True)
+
+
+def archive_projects(project_ids, statuses=None):
+    # Μόνο έργα που είναι ακόμη κλειστά τη στιγμή της μεταφοράς
+    closed, params = _closed_filter(statuses)
+    return _transfer(project_ids, "main", db.ARCHIVE_SCHEMA, f"AND {closed}", params)
+
+
+def unarchive_projects(project_ids):
+    if not db.archive_exists():
+        return 0
+    return _transfer(project_ids, db.ARCHIVE_SCHEMA, "main")
+
+
+def compact():
+    # Επιστρέφει στο σύστημα τις σελίδες που άδειασαν από την αρχειοθέτηση
+    _require_sqlite()
+
+    def run(conn):
+        conn.execute("VACUUM")
+    db.get_manager().write(run, exclusive=True)
+
+
+# ------------------------------------------------------------
+# ΛΙΣΤΕΣ
+# ------------------------------------------------------------
+
+CANDIDATE_LABELS = {
+    "code": "Κωδ. έργου",
+    "employer_name": "Εργοδότης",
+    "status": "Κατάσταση",
+    "reg_date": "Ημ/νια εγγραφής",
+    "last_activity": "Τελευταία κίνηση",
+    "docs": "Παραστατικά",
+    "logs": "Ημερολόγιο",
+}
+
+
+def default_cutoff():
+    return date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def _activity_sql(where, schema=None):
+    # Τελευταία κίνηση = η νεότερη από εγγραφή, παραστατικό, ημερολόγιο·
+    # στην κύρια βάση τα MAX/COUNT λύνονται στα idx_*_project_list. Οι
+    # πίνακες της κύριας βάσης μένουν χωρίς πρόθεμα (βλ. db.read_tables).
+    schema = f"{schema}." if schema else ""
+    return f"""
+        SELECT p.id, p.code, p.employer_name, p.status, p.reg_date,
+               MAX(IFNULL(p.reg_date, 0),
+                   IFNULL((SELECT MAX(IFNULL(d.doc_date, 0)) FROM {schema}documents d
+                           WHERE d.project_id = p.id), 0),
+                   IFNULL((SELECT MAX(IFNULL(w.log_date, 0)) FROM {schema}worklog w
+                           WHERE w.project_id = p.id), 0)) AS last_activity,
+               (SELECT COUNT(*) FROM {schema}documents d WHERE d.project_id = p.id) AS docs,
+               (SELECT COUNT(*) FROM {schema}worklog w WHERE w.project_id = p.id) AS logs
+        FROM {schema}projects p
+        {where}
+    """
+
+
+def status_options():
+    # Οι καταστάσεις των έργων όπως γράφτηκαν, για επιλογή στη σελίδα
+    rows = db.fetch_all("""
+        SELECT DISTINCT status FROM projects
+        WHERE status IS NOT NULL AND status <> ''
+        ORDER BY status
+    """)
+    return [r["status"] for r in rows]
+
+
+def default_statuses(options):
+    # Όσες από τις options αντιστοιχούν (μετά το gr_fold) στις CLOSED_STATUSES
+    closed = {db.fold_text(s) for s in CLOSED_STATUSES}
+    return [s for s in options if db.fold_text(s) in closed]
+
+
+def candidates(before=None, statuses=None):
+    # Κλειστά έργα χωρίς καμία κίνηση από το before (date) και μετά·
+    # statuses: κλειστές καταστάσεις (προεπιλογή CLOSED_STATUSES)
+    _require_sqlite()
+    before = before or default_cutoff()
+    closed, params = _closed_filter(statuses)
+    return db.fetch_columns(f"""
+        SELECT * FROM ({_activity_sql(f"WHERE {closed}")})
+        WHERE last_activity < ?
+        ORDER BY last_activity, id
+    """, params + (db.to_day_key(before),), labels=CANDIDATE_LABELS)
+
+
+def archived_projects():
+    if not db.archive_exists():
+        return None
+    return db.fetch_columns(f"""
+        SELECT * FROM ({_activity_sql("", db.ARCHIVE_SCHEMA)})
+        ORDER BY last_activity DESC, id DESC
+    """, labels=CANDIDATE_LABELS)
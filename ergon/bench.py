@@ -0,0 +1,248 @@
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# BENCHMARKS ΣΕΛΙΔΩΝ
+# ------------------------------------------------------------
+
+# Τρία επίπεδα: τα ερωτήματα κάθε σελίδας (με άδειο cache, ώστε να
+# μετράει η SQLite και όχι το LRU), ολόκληρη η σελίδα μέσω του AppTest
+# του Streamlit, και η ψυχρή εκκίνηση (imports + πρώτη σελίδα) σε νέα
+# διεργασία. Για κάθε μέτρηση: p50/p95 σε ms και μέγιστη μνήμη
+# (tracemalloc, σε ξεχωριστή εκτέλεση για να μην αλλοιώνει τους
+# χρόνους). Τα αποτελέσματα συγκρίνονται με αποθηκευμένη baseline.
+
+BASELINE_PATH = "bench_baseline.json"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+
+def _list_page(key, filters=None, pages=1):
+    from ergon import listing
+    spec = listing.LISTS[key]
+
+    def run():
+        after = None
+        for _ in range(pages):
+            _, after, has_next = listing.fetch_page(spec, filters or {}, after)
+            if not has_next:
+                break
+        listing.count_rows(spec, filters or {})
+    return run
+
+
+def _busiest(column):
+    rows = db.fetch_all(f"""
+        SELECT {column} AS v FROM documents WHERE {column} IS NOT NULL
+        GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    return rows[0]["v"] if rows else None
+
+
+def query_benchmarks():
+    from ergon import pickers
+    from ergon import reports
+    from ergon import search
+
+    today = date.today()
+    five_years = date(today.year - 5, today.month, 1)
+    supplier = _busiest("supplier_id")
+    project = _busiest("project_id")
+
+    return {
+        "clients.list": _list_page("clients"),
+        "suppliers.list": _list_page("suppliers"),
+        "projects.list": _list_page("projects"),
+        "projects.list.status": _list_page("projects", {"status": "ΣΕ ΕΞΕΛΙΞΗ"}),
+        "documents.list": _list_page("documents"),
+        "documents.list.page10": _list_page("documents", pages=10),
+        "documents.list.supplier": _list_page("documents", {"supplier": supplier}),
+        "documents.list.range": _list_page("documents", {"doc_date": (date(today.year, 1, 1), today)}),
+        "worklog.list": _list_page("worklog"),
+        "worklog.list.project": _list_page("worklog", {"project": project}),
+        "reports.monthly_5y": lambda: reports.period_report(five_years, today, "month"),
+        "reports.quarterly_supplier": lambda: reports.period_report(five_years, today, "quarter", "supplier"),
+        "reports.supplier_balances": lambda: db.fetch_all("""
+            SELECT s.company_name, IFNULL(b.balance, 0) AS balance
+            FROM suppliers s
+            LEFT JOIN supplier_balance b ON b.supplier_id = s.id
+            ORDER BY s.company_name
+        """),
+        "dashboard.profitability": lambda: reports.project_profitability(),
+        "dashboard.profitability.filtered": lambda: reports.project_profitability(
+            {"status": "ΣΕ ΕΞΕΛΙΞΗ"}, "margin_pct"
+        ),
+        "search.global": lambda: search.search("παπαδ"),
+        "pickers.projects": lambda: pickers.fetch_options("projects", "αθ"),
+        "pickers.suppliers.default": lambda: pickers.fetch_options("suppliers", ""),
+    }
+
+
+PAGES = ("clients", "suppliers", "projects", "documents", "worklog", "fees", "reports", "dashboard")
+
+
+def page_benchmarks(pages=PAGES):
+    from streamlit.testing.v1 import AppTest
+
+    def render(page):
+        def run():
+            db.query_cache.clear()
+            at = AppTest.from_file(APP_PATH, default_timeout=120)
+            at.query_params["page"] = page
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+        return run
+    return {f"page.{page}": render(page) for page in pages}
+
+
+# Τρέχει σε νέα διεργασία: το harness του AppTest φορτώνεται πριν το
+# χρονόμετρο, ώστε να μετράνε μόνο τα imports και η πρώτη σελίδα της
+# εφαρμογής. Τυπώνει {"ms": ..., "peak": bytes}.
+STARTUP_SCRIPT = """
+import json, sys, time, tracemalloc
+from streamlit.testing.v1 import AppTest
+app, db_path, page, traced = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4] == "1"
+if traced:
+    tracemalloc.start()
+start = time.perf_counter()
+from ergon import db
+db.DB_PATH = db_path
+if page:
+    at = AppTest.from_file(app, default_timeout=120)
+    at.query_params["page"] = page
+    at.run()
+    if at.exception:
+        sys.exit(f"{page}: {at.exception[0].value}")
+else:
+    import ergon.pages, ergon.profiler
+ms = (time.perf_counter() - start) * 1000
+peak = tracemalloc.get_traced_memory()[1] if traced else 0
+print(json.dumps({"ms": ms, "peak": peak}))
+"""
+
+STARTUP_PAGES = ("clients", "documents", "reports", "dashboard", "data")
+
+
+def _run_startup(page, traced=False):
+    out = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, APP_PATH, os.path.abspath(db.DB_PATH),
+         page, "1" if traced else "0"],
+        cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"startup {page or 'import'}: {out.stderr.strip()[-500:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def startup_benchmarks(pages=STARTUP_PAGES):
+    # Σε κάθε κλήση νέα διεργασία: δεν χρειάζεται ζέσταμα ούτε καθάρισμα cache
+    def cold(page):
+        return lambda repeat: summarize(
+            [_run_startup(page)["ms"] for _ in range(repeat)],
+            _run_startup(page, traced=True)["peak"]
+        )
+    benchmarks = {"startup.import": cold("")}
+    benchmarks.update({f"startup.{page}": cold(page) for page in pages})
+    return benchmarks
+
+
+def summarize(timings, peak):
+    timings = sorted(timings)
+    p95_index = min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))
+    return {
+        "p50": round(statistics.median(timings), 2),
+        "p95": round(timings[p95_index], 2),
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def measure(func, repeat):
+    func()  # ζέσταμα: imports, page cache της SQLite
+    timings = []
+    for _ in range(repeat):
+        db.query_cache.clear()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    db.query_cache.clear()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(timings, peak)
+
+
+def run(repeat=10, pages=True, startup=True, only=None, progress=None):
+    benchmarks = query_benchmarks()
+    if pages:
+        benchmarks.update(page_benchmarks())
+    cold = startup_benchmarks() if startup else {}
+    results = {}
+    for name, func in list(benchmarks.items()) + list(cold.items()):
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        # Σελίδες και εκκινήσεις είναι πιο αργές· λιγότερες επαναλήψεις
+        slow_repeat = max(3, repeat // 3)
+        if name in cold:
+            results[name] = func(slow_repeat)
+        else:
+            results[name] = measure(func, slow_repeat if name.startswith("page.") else repeat)
+        if progress:
+            progress(name, results[name])
+    return results
+
+
+def environment():
+    counts = {
+        table: db.fetch_all(f"SELECT COUNT(*) FROM {table}", cache=False)[0][0]
+        for table in ("clients", "suppliers", "projects", "documents", "worklog")
+    }
+    return {
+        "rows": counts,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+    }
+
+
+# ------------------------------------------------------------
+# BASELINE
+# ------------------------------------------------------------
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+def compare(results, baseline, tolerance=0.25, floor_ms=2.0):
+    # Παλινδρόμηση: p95 πάνω από baseline × (1 + tolerance) και κατά
+    # τουλάχιστον floor_ms (για να μη χτυπάει ο θόρυβος στα πολύ γρήγορα).
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        limit = previous["p95"] * (1 + tolerance)
+        if current["p95"] > limit and current["p95"] - previous["p95"] > floor_ms:
+            regressions.append((name, previous["p95"], current["p95"]))
+    return regressions
@@ -0,0 +1,232 @@
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from ergon import db
+from ergon.profiler import section
+
+BULK_ROWS = 20
+
+
+# ------------------------------------------------------------
+# ΜΑΖΙΚΗ ΚΑΤΑΧΩΡΗΣΗ (πίνακας τύπου Excel)
+# ------------------------------------------------------------
+
+# Όλες οι γραμμές ελέγχονται μαζί, οι αναφορές (έργο/προμηθευτής)
+# λύνονται με ένα ερώτημα ανά οντότητα και η εισαγωγή γίνεται με ένα
+# executemany σε μία συναλλαγή: ή περνάνε όλες οι γραμμές ή καμία.
+#
+# Στήλες: (στήλη, επικεφαλίδα, τύπος, υποχρεωτική). Τύποι: text, int,
+# number, money, date, και ref:<πίνακας> για αναφορά με κείμενο.
+
+BULK = {
+    "documents": {
+        "table": "documents",
+        "columns": (
+            ("seq_no", "α/α", "int", False),
+            ("doc_date", "Ημ/νία", "date", True),
+            ("project_id", "Έργο (κωδικός)", "ref:projects", False),
+            ("supplier_id", "Προμηθευτής (επωνυμία ή ΑΦΜ)", "ref:suppliers", False),
+            ("billing_type", "Τιμολόγηση", "text", False),
+            ("work_title", "Εργασία", "text", False),
+            ("description", "Περιγραφή", "text", False),
+            ("charge", "Χρέωση (€)", "money", False),
+            ("vat", "ΦΠΑ (€)", "money", False),
+            ("credit", "Πίστωση (€)", "money", False),
+            ("payment_method", "Τρόπος Πληρωμής", "text", False),
+            ("payments", "Καταβολές (€)", "money", False),
+            ("payment_target", "Πού καταβλήθηκαν", "text", False),
+        ),
+    },
+    "worklog": {
+        "table": "worklog",
+        "columns": (
+            ("log_date", "Ημερομηνία", "date", True),
+            ("employee", "Υπάλληλος", "text", True),
+            ("project_id", "Έργο (κωδικός)", "ref:projects", False),
+            ("work_desc", "Εργασία", "text", False),
+            ("hours", "Ώρες", "number", True),
+        ),
+    },
+}
+
+# Εκφράσεις με τις οποίες αναγνωρίζεται μια αναφορά (μετά από gr_fold)
+REF_LABELS = {
+    "projects": ("code", "IFNULL(code,'') || ' : ' || IFNULL(employer_name,'')"),
+    "suppliers": ("company_name", "afm", "IFNULL(last_name,'') || ' ' || IFNULL(first_name,'')"),
+}
+
+
+def resolve_refs(entity, labels):
+    # Ένα ερώτημα για όλες τις ετικέτες της παρτίδας· επιστρέφει
+    # {ετικέτα με fold: id}, με προτίμηση στο μικρότερο id.
+    keys = sorted({db.fold_text(label) for label in labels} - {""})
+    if not keys:
+        return {}
+    exprs = REF_LABELS[entity]
+    marks = ", ".join("?" * len(keys))
+    rows = db.fetch_all(f"""
+        SELECT id, {", ".join(f"gr_fold({e}) AS k{i}" for i, e in enumerate(exprs))}
+        FROM {entity}
+        WHERE {" OR ".join(f"gr_fold({e}) IN ({marks})" for e in exprs)}
+        ORDER BY id
+    """, tuple(keys) * len(exprs), cache=False)
+    wanted = set(keys)
+    lookup = {}
+    for r in rows:
+        for i in range(len(exprs)):
+            if r[f"k{i}"] in wanted:
+                lookup.setdefault(r[f"k{i}"], r["id"])
+    return lookup
+
+
+def empty_frame(kind, rows=BULK_ROWS):
+    data = {}
+    for column, _, col_type, _ in BULK[kind]["columns"]:
+        if col_type == "date":
+            data[column] = pd.Series([None] * rows, dtype="datetime64[ns]")
+        elif col_type in ("int", "number", "money"):
+            data[column] = pd.Series([None] * rows, dtype="float64")
+        else:
+            data[column] = pd.Series([None] * rows, dtype="object")
+    return pd.DataFrame(data)
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, float) and value != value) or (
+        isinstance(value, str) and not value.strip()
+    ) or value is pd.NaT
+
+
+def _to_date(value):
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def validate(kind, df):
+    # Επιστρέφει (γραμμές για executemany, λάθη [(γραμμή, στήλη, μήνυμα)]).
+    # Οι εντελώς κενές γραμμές αγνοούνται.
+    columns = BULK[kind]["columns"]
+    records = [
+        (i + 1, r) for i, r in enumerate(df.to_dict("records"))
+        if not all(_is_blank(r.get(c)) for c, _, _, _ in columns)
+    ]
+
+    lookups = {}
+    for column, _, col_type, _ in columns:
+        if col_type.startswith("ref:"):
+            entity = col_type[4:]
+            lookups[column] = resolve_refs(
+                entity, [str(r[column]) for _, r in records if not _is_blank(r.get(column))]
+            )
+
+    rows = []
+    errors = []
+    for row_no, record in records:
+        values = []
+        for column, label, col_type, required in columns:
+            value = record.get(column)
+            if _is_blank(value):
+                if required:
+                    errors.append((row_no, label, "Υποχρεωτικό πεδίο"))
+                values.append(None)
+                continue
+            try:
+                if col_type == "date":
+                    value = db.to_day_key(_to_date(value))
+                elif col_type == "int":
+                    value = int(value)
+                elif col_type in ("number", "money"):
+                    value = float(value)
+                    if value < 0:
+                        errors.append((row_no, label, "Αρνητική τιμή"))
+                    if col_type == "money":
+                        value = db.to_cents(value)
+                elif col_type.startswith("ref:"):
+                    key = db.fold_text(value)
+                    if key not in lookups[column]:
+                        errors.append((row_no, label, f"Δεν βρέθηκε: {value}"))
+                    value = lookups[column].get(key)
+                else:
+                    value = str(value).strip()
+            except (TypeError, ValueError):
+                errors.append((row_no, label, f"Μη έγκυρη τιμή: {value}"))
+                value = None
+            values.append(value)
+        rows.append(tuple(values))
+    return rows, errors
+
+
+def insert_rows(kind, rows):
+    spec = BULK[kind]
+    names = [c for c, _, _, _ in spec["columns"]]
+    # Ένα executemany = μία εργασία του writer: αν αποτύχει μια γραμμή,
+    # αναιρείται ολόκληρη η παρτίδα.
+    db.executemany(
+        f"INSERT INTO {spec['table']} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+        rows
+    )
+    return len(rows)
+
+
+# ------------------------------------------------------------
+# UI
+# ------------------------------------------------------------
+
+def column_config(kind):
+    config = {}
+    for column, label, col_type, required in BULK[kind]["columns"]:
+        if col_type == "date":
+            config[column] = st.column_config.DateColumn(label, format="DD/MM/YYYY", required=required)
+        elif col_type == "int":
+            config[column] = st.column_config.NumberColumn(label, min_value=0, step=1, format="%d")
+        elif col_type in ("number", "money"):
+            config[column] = st.column_config.NumberColumn(label, min_value=0.0, format="%.2f")
+        else:
+            config[column] = st.column_config.TextColumn(label, required=required)
+    return config
+
+
+def render_bulk_entry(kind):
+    # Νέο κλειδί editor μετά από κάθε επιτυχή αποθήκευση = κενός πίνακας
+    generation_key = f"bulk_{kind}_generation"
+    generation = st.session_state.setdefault(generation_key, 0)
+    saved = st.session_state.pop(f"bulk_{kind}_saved", None)
+    if saved:
+        st.success(f"Αποθηκεύτηκαν {saved} εγγραφές.")
+
+    with section("editor"):
+        edited = st.data_editor(
+            empty_frame(kind),
+            column_config=column_config(kind),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key=f"bulk_{kind}_{generation}"
+        )
+
+    if not st.button("Αποθήκευση όλων", key=f"bulk_{kind}_save"):
+        return
+
+    with section("validate"):
+        rows, errors = validate(kind, edited)
+    if errors:
+        st.error(f"Βρέθηκαν {len(errors)} λάθη· δεν αποθηκεύτηκε καμία γραμμή.")
+        st.dataframe(
+            pd.DataFrame(errors, columns=["Γραμμή", "Στήλη", "Λάθος"]),
+            use_container_width=True, hide_index=True
+        )
+        return
+    if not rows:
+        st.info("Ο πίνακας είναι κενός.")
+        return
+
+    insert_rows(kind, rows)
+    st.session_state[generation_key] = generation + 1
+    st.session_state[f"bulk_{kind}_saved"] = len(rows)
+    st.rerun()
+
@@ -0,0 +1,2064 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from urllib.parse import urlsplit
+
+# Αρχείο SQLite ή postgresql://χρήστης@server/βάση (postgres.py). Στην
+# εκκίνηση του Streamlit από το ERP_ERGON_DB, στα εργαλεία από το --db.
+DB_ENV = "ERP_ERGON_DB"
+DB_PATH = os.environ.get(DB_ENV) or "erp_ergon.db"
+POSTGRES_SCHEMES = ("postgresql://", "postgres://")
+
+# Ταυτότητα της διεργασίας στις σημειώσεις αλλαγών (db_changes / NOTIFY):
+# κάθε διεργασία αγνοεί τις δικές της, που έχει ήδη ακυρώσει στο cache.
+CHANGE_SOURCE = uuid.uuid4().hex
+# Σημειώσεις αλλαγών που κρατιούνται στο db_changes (SQLite)
+CHANGE_LOG_KEEP = 1000
+
+# Ρυθμίσεις που εφαρμόζονται μία φορά σε κάθε νέα σύνδεση
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",       # 256 MB
+    "PRAGMA cache_size=-65536",         # 64 MB page cache
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+# ------------------------------------------------------------
+# ΔΙΑΧΕΙΡΙΣΗ ΣΥΝΔΕΣΕΩΝ
+# ------------------------------------------------------------
+
+# Δύο υλοποιήσεις με την ίδια διεπαφή (get_manager): το ConnectionManager
+# εδώ για SQLite και το postgres.PostgresManager. Οι συνδέσεις που δίνουν
+# συμπεριφέρονται όπως το sqlite3.Connection (execute / executemany /
+# cursor / commit, γραμμές sqlite3.Row), οπότε τα ερωτήματα και οι
+# εργασίες εγγραφής (func(conn)) είναι ίδια και για τις δύο βάσεις.
+
+def is_postgres():
+    return DB_PATH.startswith(POSTGRES_SCHEMES)
+
+
+def has_full_text_search():
+    # Τα ευρετήρια *_fts (FTS5) υπάρχουν μόνο στο SQLite
+    return not is_postgres()
+
+
+def database_location():
+    # Για άλλες διεργασίες (jobs): απόλυτη διαδρομή του αρχείου ή το URL
+    return DB_PATH if is_postgres() else os.path.abspath(DB_PATH)
+
+
+def local_root():
+    # Πρόθεμα για τοπικά αρχεία της βάσης (π.χ. <βάση>_jobs)· για
+    # PostgreSQL, το όνομα της βάσης στον τρέχοντα κατάλογο.
+    if is_postgres():
+        return os.path.abspath(urlsplit(DB_PATH).path.strip("/") or "erp_ergon")
+    return os.path.splitext(os.path.abspath(DB_PATH))[0]
+
+
+def configure_connection(conn):
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    # Χρησιμοποιείται από τα triggers αναζήτησης (FTS)· κάθε σύνδεση που
+    # γράφει στους πίνακες πρέπει να την έχει.
+    conn.create_function("gr_fold", 1, fold_text, deterministic=True)
+    return conn
+
+
+def get_connection():
+    # Νέα σύνδεση έξω από τον manager· την κλείνει ο καλών
+    if is_postgres():
+        from ergon import postgres
+        return postgres.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    return configure_connection(conn)
+
+
+class WriteJob:
+
+    def __init__(self, func, tables=(), exclusive=False, replayable=False):
+        self.func = func
+        self.tables = tables
+        self.exclusive = exclusive
+        self.replayable = replayable
+        self.future = Future()
+
+
+class ConnectionManager:
+    # Ένας reader ανά thread (WAL: οι αναγνώσεις δεν μπλοκάρουν) και ένα
+    # thread εγγραφής με δική του σύνδεση. Κάθε εγγραφή μπαίνει σε ουρά ως
+    # συνάρτηση(conn)· ό,τι έχει μαζευτεί στην ουρά εκτελείται σε μία
+    # συναλλαγή (group commit)· ένα λάθος αναιρεί μόνο τη δική του
+    # εργασία. Στην ίδια συναλλαγή μπαίνουν μόνο εργασίες replayable
+    # (συναρτήσεις μόνο της σύνδεσης, χωρίς αρχεία κ.λπ.)· οι άλλες
+    # τρέχουν μόνες τους, ώστε να μην ξανατρέξουν ποτέ λόγω λάθους άλλης
+    # εργασίας. Μία μόνο σύνδεση γράφει, οπότε τα sessions δεν
+    # ανταγωνίζονται για το lock της βάσης.
+    #
+    # Άλλες διεργασίες (εργασίες, manage.py) γράφουν με δικό τους manager.
+    # Κάθε commit σημειώνει στο db_changes ποιοι πίνακες άλλαξαν· πριν από
+    # κάθε ανάγνωση από το cache, το PRAGMA data_version της σύνδεσης
+    # (αλλάζει μόνο όταν κάνει commit άλλη σύνδεση) δείχνει αν υπάρχουν
+    # νέες σημειώσεις.
+
+    dialect = "sqlite"
+    errors = (sqlite3.Error,)
+    max_batch = 64
+
+    def __init__(self, path):
+        self.path = path
+        self._readers = {}
+        self._readers_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer_thread = None
+        self._writer_conn = None
+        self._writer_lock = threading.Lock()
+        self._current = None
+        self._data_versions = {}
+        self._change_id = None
+        self._changes_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        return configure_connection(conn)
+
+    def _prune_readers(self):
+        # Το Streamlit δημιουργεί νέα threads ανά rerun· κλείνουμε
+        # τις συνδέσεις threads που δεν υπάρχουν πια.
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in list(self._readers):
+            if ident not in alive:
+                self._readers.pop(ident).close()
+                self._data_versions.pop(ident, None)
+
+    def reader(self):
+        ident = threading.get_ident()
+        conn = self._readers.get(ident)
+        if conn is None:
+            with self._readers_lock:
+                self._prune_readers()
+                conn = self._connect()
+                self._readers[ident] = conn
+        return conn
+
+    @contextmanager
+    def reading(self, query=""):
+        # Η σύνδεση ανάγνωσης του thread· με ATTACH της βάσης αρχείου όταν
+        # το ερώτημα αναφέρεται σε archive.<πίνακας>.
+        conn = self.reader()
+        if _ARCHIVE_RE.search(query):
+            attach_archive(conn)
+        yield conn
+
+    def plan(self, query, params=()):
+        with self.reading(query) as conn:
+            rows = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+        return [r["detail"] for r in rows]
+
+    def version(self):
+        with self.reading() as conn:
+            return schema_version(conn)
+
+    def migrate(self):
+        # Τα migrations κάνουν δικές τους συναλλαγές (ένα BEGIN ανά έκδοση)
+        return self.write(apply_migrations, exclusive=True)
+
+    # --------------------------------------------------------
+    # Ακύρωση cache ανάμεσα σε διεργασίες
+    # --------------------------------------------------------
+
+    def sync_cache(self):
+        conn = self.reader()
+        ident = threading.get_ident()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._data_versions.get(ident) == version:
+            return
+        self._data_versions[ident] = version
+        with self._changes_lock:
+            if self._change_id is None:
+                # Πρώτη ανάγνωση της διεργασίας: το cache είναι άδειο
+                self._change_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM db_changes").fetchone()[0]
+                return
+            rows = conn.execute(
+                "SELECT id, source, tables FROM db_changes WHERE id > ? ORDER BY id", (self._change_id,)
+            ).fetchall()
+            if not rows:
+                return
+            if rows[0][0] > self._change_id + 1:
+                # Οι σημειώσεις που λείπουν σβήστηκαν (CHANGE_LOG_KEEP)
+                query_cache.clear()
+            else:
+                for _, source, tables in rows:
+                    if source != CHANGE_SOURCE:
+                        query_cache.bump(tables.split(","))
+            self._change_id = rows[-1][0]
+
+    def _log_changes(self, conn, tables):
+        expanded = dependent_tables(tables)
+        if not expanded:
+            return
+        change_id = conn.execute(
+            "INSERT INTO db_changes (source, tables) VALUES (?, ?)",
+            (CHANGE_SOURCE, ",".join(sorted(expanded)))
+        ).lastrowid
+        if change_id % CHANGE_LOG_KEEP == 0:
+            conn.execute("DELETE FROM db_changes WHERE id <= ?", (change_id - CHANGE_LOG_KEEP,))
+
+    # --------------------------------------------------------
+    # Thread εγγραφής
+    # --------------------------------------------------------
+
+    def submit(self, func, tables=(), exclusive=False, replayable=False):
+        # Επιστρέφει Future με το αποτέλεσμα της func(conn). Οι exclusive
+        # εργασίες (π.χ. migrations) τρέχουν μόνες και κάνουν οι ίδιες
+        # BEGIN/COMMIT.
+        job = WriteJob(func, tables, exclusive, replayable)
+        thread = self._writer_thread
+        if thread is not None and thread.ident == threading.get_ident():
+            # Εγγραφή μέσα από εργασία: τρέχει στη συναλλαγή που ήδη υπάρχει
+            # και οι πίνακές της ακυρώνονται μαζί με την εξωτερική εργασία.
+            self._current.tables = tuple(self._current.tables) + tuple(tables)
+            job.future.set_result(func(self._writer_conn))
+            return job.future
+        self._ensure_writer()
+        self._queue.put(job)
+        return job.future
+
+    def write(self, func, tables=(), exclusive=False, replayable=False):
+        return self.submit(func, tables, exclusive, replayable).result()
+
+    def _ensure_writer(self):
+        if self._writer_thread is None:
+            with self._writer_lock:
+                if self._writer_thread is None:
+                    self._writer_conn = self._connect()
+                    thread = threading.Thread(target=self._run_writer, name="db-writer", daemon=True)
+                    thread.start()
+                    self._writer_thread = thread
+
+    def _run_writer(self):
+        carry = None
+        stop = False
+        while not stop:
+            job = carry if carry is not None else self._queue.get()
+            carry = None
+            if job is None:
+                break
+            if job.exclusive:
+                self._run_exclusive(job)
+                continue
+            # Ό,τι replayable περιμένει ήδη στην ουρά μπαίνει στην ίδια συναλλαγή
+            batch = [job]
+            while job.replayable and len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                if job.exclusive or not job.replayable:
+                    carry = job
+                    break
+                batch.append(job)
+            self._run_batch(batch)
+        self._writer_conn.close()
+
+    def _run_exclusive(self, job):
+        conn = self._writer_conn
+        self._current = job
+        try:
+            result = job.func(conn)
+        except BaseException as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            job.future.set_exception(exc)
+            return
+        if conn.in_transaction:
+            conn.commit()
+        if job.tables:
+            # Οι exclusive εργασίες κάνουν δικό τους commit· η σημείωση
+            # αλλαγών γράφεται μετά, σε δική της συναλλαγή.
+            self._log_changes(conn, job.tables)
+            conn.commit()
+        invalidate(*job.tables)
+        job.future.set_result(result)
+
+    def _run_batch(self, batch):
+        # Χωρίς SAVEPOINT ανά εργασία: σε WAL κάθε εντολή μέσα σε savepoint
+        # κοστίζει ανάλογα με το μέγεθος της βάσης. Αν μια εργασία αποτύχει,
+        # η συναλλαγή αναιρείται και οι υπόλοιπες ξανατρέχουν χωρίς αυτήν.
+        # Παρτίδα με περισσότερες από μία εργασίες έχει μόνο replayable
+        # (βλ. _run_writer), οπότε η επανάληψη είναι ασφαλής.
+        conn = self._writer_conn
+        pending = list(batch)
+        while pending:
+            outcomes = []
+            failed = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for job in pending:
+                    self._current = job
+                    try:
+                        result = job.func(conn)
+                    except Exception as exc:
+                        failed = (job, exc)
+                        break
+                    outcomes.append((job, result))
+                if failed:
+                    conn.rollback()
+                    job, exc = failed
+                    pending.remove(job)
+                    job.future.set_exception(exc)
+                    continue
+                self._log_changes(conn, [t for job, _ in outcomes for t in job.tables])
+                conn.commit()
+            except BaseException as exc:
+                if conn.in_transaction:
+                    conn.rollback()
+                for job in pending:
+                    job.future.set_exception(exc)
+                return
+            # Ακύρωση cache πριν ξυπνήσει ο καλών, ώστε η επόμενη ανάγνωσή
+            # του να δει τις αλλαγές.
+            invalidate(*(t for job, _ in outcomes for t in job.tables))
+            for job, result in outcomes:
+                job.future.set_result(result)
+            return
+
+    def close_all(self):
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is not None:
+                self._queue.put(None)
+                thread.join()
+                self._writer_thread = None
+        with self._readers_lock:
+            for conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                if is_postgres():
+                    from ergon.postgres import PostgresManager
+                    manager = PostgresManager(DB_PATH)
+                else:
+                    manager = ConnectionManager(DB_PATH)
+                atexit.register(manager.close_all)
+                _manager = manager
+    return _manager
+
+
+# ------------------------------------------------------------
+# ΒΑΣΗ ΑΡΧΕΙΟΥ (ATTACH)
+# ------------------------------------------------------------
+
+# Τα κλειστά έργα με τα παραστατικά / το ημερολόγιό τους μεταφέρονται σε
+# ξεχωριστό αρχείο (archive.py). Μια σύνδεση κάνει ATTACH το αρχείο μόνο
+# όταν ένα ερώτημα αναφέρεται ρητά σε archive.<πίνακας>, και το κρατά
+# συνδεδεμένο από εκεί και πέρα· οι υπόλοιπες δεν το αγγίζουν ποτέ.
+
+ARCHIVE_SCHEMA = "archive"
+_ARCHIVE_RE = re.compile(rf"\b{ARCHIVE_SCHEMA}\.", re.IGNORECASE)
+
+
+def archive_path():
+    root, ext = os.path.splitext(DB_PATH)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def archive_exists():
+    return not is_postgres() and os.path.exists(archive_path())
+
+
+def attach_archive(conn):
+    attached = {r[1] for r in conn.execute("PRAGMA database_list")}
+    if ARCHIVE_SCHEMA not in attached:
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (archive_path(),))
+    return conn
+
+
+def detach_archive(conn):
+    attached = {r[1] for r in conn.execute("PRAGMA database_list")}
+    if ARCHIVE_SCHEMA in attached:
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+
+# ------------------------------------------------------------
+# ΤΥΠΟΙ ΑΠΟΘΗΚΕΥΣΗΣ: ΗΜΕΡΟΜΗΝΙΕΣ / ΠΟΣΑ
+# ------------------------------------------------------------
+
+# Οι ημερομηνίες αποθηκεύονται ως ακέραιοι ΕΕΕΕΜΜΗΗ (20240131) και τα
+# ποσά σε ακέραια λεπτά του ευρώ: συμπαγείς γραμμές, αριθμητικές
+# συγκρίσεις στα εύρη και ακριβή αθροίσματα χωρίς σφάλματα float.
+
+DAY_COLUMNS = frozenset({"doc_date", "reg_date", "log_date", "last_activity"})
+CENT_COLUMNS = frozenset({
+    "charge", "vat", "credit", "payments",
+    "agreed_amount", "invoice_expenses", "amount",
+    "balance", "total_cost", "margin",
+    "doc_cost", "labour_cost", "hourly_rate",
+})
+
+
+def to_day_key(value):
+    if value is None:
+        return None
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def from_day_key(key):
+    if key is None:
+        return None
+    key = int(key)
+    return date(key // 10000, key // 100 % 100, key % 100)
+
+
+def to_cents(amount):
+    # Μισό λεπτό στρογγυλεύεται προς τα πάνω (0,005 € -> 1 λεπτό), από το
+    # δεκαδικό κείμενο του ποσού: το round() της Python στρογγυλεύει στον
+    # άρτιο και το 0.285 * 100 βγαίνει 28.499999…
+    if amount is None:
+        return None
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    if cents is None:
+        return None
+    return cents / 100
+
+
+# ------------------------------------------------------------
+# ΣΧΗΜΑ ΒΑΣΗΣ / MIGRATIONS
+# ------------------------------------------------------------
+
+# Κάθε migration είναι (έκδοση, βήματα). Η τρέχουσα έκδοση της βάσης
+# κρατιέται στο PRAGMA user_version· εφαρμόζονται μόνο οι νεότερες.
+
+SCHEMA_V1 = (
+    # ΕΡΓΟΔΟΤΕΣ / ΠΕΛΑΤΕΣ (από φύλλο "Εργοδότες")
+    """
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT,          -- Επωνυμία
+            last_name TEXT,             -- Επίθετο
+            first_name TEXT,            -- Όνομα
+            entity_type TEXT,           -- Σύσταση
+            address TEXT,
+            postal_code TEXT,
+            city TEXT,
+            phone_landline TEXT,        -- σταθερό
+            phone_mobile TEXT,          -- κινητό
+            email TEXT,
+            afm TEXT,
+            dou TEXT,
+            taxis_username TEXT,
+            taxis_password TEXT,
+            job TEXT                    -- Επάγγελμα
+        )
+    """,
+
+    # ΠΡΟΜΗΘΕΥΤΕΣ (από φύλλο "Προμηθευτές")
+    """
+        CREATE TABLE IF NOT EXISTS suppliers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT,          -- Επωνυμία Εταιρίας
+            last_name TEXT,
+            first_name TEXT,
+            entity_type TEXT,           -- Σύσταση
+            job TEXT,                   -- Επάγγελμα
+            iban1 TEXT,
+            bank1 TEXT,
+            iban2 TEXT,
+            bank2 TEXT,
+            iban3 TEXT,
+            bank3 TEXT,
+            iban4 TEXT,
+            bank4 TEXT,
+            address TEXT,
+            postal_code TEXT,
+            city TEXT,
+            phone1 TEXT,
+            phone2 TEXT,
+            email TEXT,
+            afm TEXT,
+            dou TEXT
+        )
+    """,
+
+    # ΕΡΓΑ (από φύλλο "Έργα")
+    """
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            code TEXT,                      -- Κωδικός Έργου
+            reg_date TEXT,                  -- Ημ/νια Εγγραφής
+            protocol_no TEXT,               -- αρ. πρωτ
+            client_id INTEGER,              -- σχέση με clients
+            employer_name TEXT,             -- Εργοδότης (ελεύθερο κείμενο)
+            hf_flag TEXT,                   -- ΗΦ-Φ
+            project_type TEXT,              -- Είδος Έργου
+            priority TEXT,                  -- Προτεραιότητα
+            status TEXT,                    -- Κατάσταση
+            status2 TEXT,                   -- Κατάσταση2
+            description TEXT,               -- Περιγραφή
+            address TEXT,                   -- Διεύθυνση εργου
+            postal_code TEXT,               -- ΤΚ
+            city TEXT,                      -- Πόλη
+            agreed_amount REAL,             -- Συμφωνημένη Αξία
+            invoice_expenses REAL,          -- Έξοδα παραστατικα
+            engineer TEXT,                  -- Μηχανικός
+            apy TEXT,                       -- ΑΠΥ
+            manager TEXT,                   -- Μάνος-Θανάσης
+            FOREIGN KEY(client_id) REFERENCES clients(id)
+        )
+    """,
+
+    # ΠΑΡΑΣΤΑΤΙΚΑ (από φύλλο "Παραστατικά")
+    """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seq_no INTEGER,                 -- α/α
+            doc_date TEXT,                  -- Ημ/νία Παρ/τικού
+            project_id INTEGER,             -- Έργα (σχέση με projects)
+            billing_type TEXT,              -- Τιμολόγηση
+            supplier_id INTEGER,            -- Προμηθευτής - Συνεργείο
+            work_title TEXT,                -- Εργασία
+            description TEXT,               -- Περιγραφή
+            charge REAL,                    -- Χρέωση
+            vat REAL,                       -- ΦΠΑ
+            credit REAL,                    -- Πίστωση
+            payment_method TEXT,            -- Τρόπος Πληρωμής
+            payments REAL,                  -- Καταβολές
+            payment_target TEXT,            -- Που καταβληθηκαν
+            day TEXT,                       -- ΗΜΕΡΑ (κείμενο/αριθμός)
+            month TEXT,                     -- ΜΗΝΑ
+            year TEXT,                      -- ΕΤΟΣ
+            FOREIGN KEY(project_id) REFERENCES projects(id),
+            FOREIGN KEY(supplier_id) REFERENCES suppliers(id)
+        )
+    """,
+
+    # ΗΜΕΡΟΛΟΓΙΟ (από φύλλο "Ημερολόγιο")
+    """
+        CREATE TABLE IF NOT EXISTS worklog (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            log_date TEXT,                  -- Ημερομηνία
+            employee TEXT,                  -- Υπάλληλος
+            project_id INTEGER,             -- Έργο (σχέση με projects)
+            work_desc TEXT,                 -- Εργασία
+            hours REAL,                     -- Ώρες
+            FOREIGN KEY(project_id) REFERENCES projects(id)
+        )
+    """,
+
+    # ΤΑΜΕΙΟ (από φύλλο "Ταμείο" – Είδος Έργου / Ποσό)
+    """
+        CREATE TABLE IF NOT EXISTS fee_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_type TEXT,                 -- Είδος Έργου
+            amount REAL                     -- Ποσό (€)
+        )
+    """,
+)
+
+# Indexes για τα JOIN και τα ORDER BY των σελίδων
+SCHEMA_V2 = (
+    "CREATE INDEX IF NOT EXISTS idx_documents_project ON documents(project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_supplier ON documents(supplier_id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(doc_date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_project ON worklog(project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_date ON worklog(log_date, id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_reg_date ON projects(reg_date, id)",
+)
+
+# Συγκεντρωτικά υπόλοιπα προμηθευτών / κόστη έργων, ενημερωμένα από
+# triggers στα documents ώστε οι αναφορές να μη σαρώνουν όλα τα παραστατικά.
+SUPPLIER_BALANCE_EXPR = (
+    "COALESCE({d}.charge,0) + COALESCE({d}.vat,0)"
+    " - COALESCE({d}.credit,0) - COALESCE({d}.payments,0)"
+)
+PROJECT_COST_EXPR = "COALESCE({d}.charge,0) + COALESCE({d}.vat,0)"
+
+
+def _ledger_add(row):
+    return f"""
+        INSERT INTO supplier_balance (supplier_id, balance)
+        SELECT {row}.supplier_id, {SUPPLIER_BALANCE_EXPR.format(d=row)}
+        WHERE {row}.supplier_id IS NOT NULL
+        ON CONFLICT(supplier_id) DO UPDATE SET balance = balance + excluded.balance;
+
+        INSERT INTO project_cost (project_id, total_cost)
+        SELECT {row}.project_id, {PROJECT_COST_EXPR.format(d=row)}
+        WHERE {row}.project_id IS NOT NULL
+        ON CONFLICT(project_id) DO UPDATE SET total_cost = total_cost + excluded.total_cost;
+    """
+
+
+def _ledger_remove(row):
+    return f"""
+        UPDATE supplier_balance
+        SET balance = balance - ({SUPPLIER_BALANCE_EXPR.format(d=row)})
+        WHERE supplier_id = {row}.supplier_id;
+
+        UPDATE project_cost
+        SET total_cost = total_cost - ({PROJECT_COST_EXPR.format(d=row)})
+        WHERE project_id = {row}.project_id;
+    """
+
+
+LEDGER_TABLES = (
+    """
+        CREATE TABLE IF NOT EXISTS supplier_balance (
+            supplier_id INTEGER PRIMARY KEY,    -- σχέση με suppliers
+            balance REAL NOT NULL DEFAULT 0     -- χρέωση+ΦΠΑ-πίστωση-καταβολές
+        )
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS project_cost (
+            project_id INTEGER PRIMARY KEY,     -- σχέση με projects
+            total_cost REAL NOT NULL DEFAULT 0  -- χρέωση+ΦΠΑ
+        )
+    """,
+)
+
+LEDGER_TRIGGERS = (
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_documents_ledger_ai
+        AFTER INSERT ON documents
+        BEGIN
+            {_ledger_add("NEW")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_documents_ledger_ad
+        AFTER DELETE ON documents
+        BEGIN
+            {_ledger_remove("OLD")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_documents_ledger_au
+        AFTER UPDATE OF supplier_id, project_id, charge, vat, credit, payments ON documents
+        BEGIN
+            {_ledger_remove("OLD")}
+            {_ledger_add("NEW")}
+        END
+    """,
+)
+
+
+def _rebuild_ledgers(conn):
+    conn.execute("DELETE FROM supplier_balance")
+    conn.execute("DELETE FROM project_cost")
+    conn.execute(f"""
+        INSERT INTO supplier_balance (supplier_id, balance)
+        SELECT d.supplier_id, SUM({SUPPLIER_BALANCE_EXPR.format(d="d")})
+        FROM documents d
+        WHERE d.supplier_id IS NOT NULL
+        GROUP BY d.supplier_id
+    """)
+    conn.execute(f"""
+        INSERT INTO project_cost (project_id, total_cost)
+        SELECT d.project_id, SUM({PROJECT_COST_EXPR.format(d="d")})
+        FROM documents d
+        WHERE d.project_id IS NOT NULL
+        GROUP BY d.project_id
+    """)
+
+
+def _verify_ledgers(conn, tolerance=0):
+    # Επιστρέφει τις διαφορές ανάμεσα στα αποθηκευμένα υπόλοιπα και σε
+    # πλήρη επανυπολογισμό από τα documents.
+    mismatches = []
+    checks = (
+        ("supplier_balance", "supplier_id", "balance", SUPPLIER_BALANCE_EXPR),
+        ("project_cost", "project_id", "total_cost", PROJECT_COST_EXPR),
+    )
+    for table, key, column, expr in checks:
+        rows = conn.execute(f"""
+            WITH fresh AS (
+                SELECT d.{key} AS k, SUM({expr.format(d="d")}) AS v
+                FROM documents d
+                WHERE d.{key} IS NOT NULL
+                GROUP BY d.{key}
+            ),
+            stored AS (
+                SELECT {key} AS k, {column} AS v FROM {table}
+            )
+            SELECT f.k, IFNULL(s.v, 0), f.v
+            FROM fresh f LEFT JOIN stored s ON s.k = f.k
+            WHERE ABS(IFNULL(s.v, 0) - f.v) > ?
+            UNION ALL
+            SELECT s.k, s.v, 0
+            FROM stored s
+            WHERE s.k NOT IN (SELECT k FROM fresh) AND ABS(s.v) > ?
+        """, (tolerance, tolerance)).fetchall()
+        mismatches.extend((table, k, stored, fresh) for k, stored, fresh in rows)
+    return mismatches
+
+
+SCHEMA_V3 = LEDGER_TABLES + LEDGER_TRIGGERS + (_rebuild_ledgers,)
+
+# Indexes για τη σελιδοποίηση keyset των λιστών (listing.py): ίδιες
+# εκφράσεις με τα κλειδιά ταξινόμησης, και με τα πιο συχνά φίλτρα μπροστά.
+SCHEMA_V4 = (
+    """CREATE INDEX IF NOT EXISTS idx_clients_list
+       ON clients(IFNULL(company_name,''), IFNULL(last_name,''), IFNULL(first_name,''), id)""",
+    "CREATE INDEX IF NOT EXISTS idx_clients_city ON clients(city)",
+    "CREATE INDEX IF NOT EXISTS idx_suppliers_list ON suppliers(IFNULL(company_name,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_suppliers_city ON suppliers(city)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_list ON projects(IFNULL(reg_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status, IFNULL(reg_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_city ON projects(city)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_list ON documents(IFNULL(doc_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_project_list ON documents(project_id, IFNULL(doc_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_supplier_list ON documents(supplier_id, IFNULL(doc_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_list ON worklog(IFNULL(log_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_project_list ON worklog(project_id, IFNULL(log_date,''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_employee_list ON worklog(employee, IFNULL(log_date,''), id)",
+    # Τα idx_documents_project/supplier καλύπτονται πλέον από τα παραπάνω
+    "DROP INDEX IF EXISTS idx_documents_project",
+    "DROP INDEX IF EXISTS idx_documents_supplier",
+    "DROP INDEX IF EXISTS idx_worklog_project",
+)
+
+# Αναζήτηση πλήρους κειμένου (FTS5, contentless). Το κείμενο περνάει
+# από gr_fold() πριν το tokenization, ώστε ά = α και Σ/σ/ς = σ. Το
+# ευρετήριο δεν κρατά κείμενο (content=''): τα ερωτήματα γυρίζουν στον
+# πίνακα με το rowid, και τα triggers γράφουν και σβήνουν με τις ίδιες
+# διπλωμένες τιμές. Με external content το FTS5 θα διάβαζε τις αδίπλωτες
+# τιμές του πίνακα ('rebuild', 'integrity-check').
+FTS_INDEXES = {
+    "clients": ("company_name", "last_name", "first_name", "afm", "city", "email", "phone_mobile"),
+    "suppliers": ("company_name", "last_name", "first_name", "job", "afm", "city"),
+    "projects": ("code", "employer_name", "description", "project_type", "address", "city"),
+    "documents": ("work_title", "description", "billing_type", "payment_target"),
+}
+
+
+def _fts_values(row, columns):
+    return ", ".join(f"gr_fold({row}.{c})" for c in columns)
+
+
+def fts_ddl(table, columns, schema=None):
+    # schema: για τα ευρετήρια της βάσης αρχείου (ARCHIVE_SCHEMA). Μέσα στα
+    # triggers τα ονόματα μένουν χωρίς πρόθεμα και αναφέρονται στην ίδια βάση.
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    prefix = f"{schema}." if schema else ""
+    return (
+        f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {prefix}{fts} USING fts5(
+                {cols},
+                content='',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS {prefix}trg_{table}_fts_ai AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.id, {_fts_values("NEW", columns)});
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS {prefix}trg_{table}_fts_ad AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {_fts_values("OLD", columns)});
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS {prefix}trg_{table}_fts_au AFTER UPDATE OF {cols} ON {table}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {_fts_values("OLD", columns)});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.id, {_fts_values("NEW", columns)});
+            END
+        """,
+    )
+
+
+def fill_search(conn, table, schema=None):
+    # Ξαναγεμίζει ένα ευρετήριο από τον πίνακα του (το 'rebuild' του FTS5
+    # δεν υπάρχει σε contentless πίνακα)
+    prefix = f"{schema}." if schema else ""
+    fts = f"{table}_fts"
+    columns = FTS_INDEXES[table]
+    conn.execute(f"INSERT INTO {prefix}{fts} ({fts}) VALUES ('delete-all')")
+    conn.execute(f"""
+        INSERT INTO {prefix}{fts} (rowid, {", ".join(columns)})
+        SELECT id, {_fts_values(table, columns)} FROM {prefix}{table} AS {table}
+    """)
+
+
+def _rebuild_search(conn):
+    for table in FTS_INDEXES:
+        fill_search(conn, table)
+
+
+SCHEMA_V5 = tuple(
+    stmt for table, columns in FTS_INDEXES.items() for stmt in fts_ddl(table, columns)
+) + (_rebuild_search,)
+
+# Μετατροπή αποθήκευσης (ΤΥΠΟΙ ΑΠΟΘΗΚΕΥΣΗΣ): ημερομηνίες TEXT -> INTEGER
+# ΕΕΕΕΜΜΗΗ, ποσά REAL -> INTEGER λεπτά. Οι πίνακες ξαναχτίζονται (το
+# SQLite δεν αλλάζει τύπο στήλης) με τα ίδια id· τα indexes/triggers
+# τους ξαναδημιουργούνται. Οι στήλες ΗΜΕΡΑ/ΜΗΝΑ/ΕΤΟΣ των παραστατικών
+# καταργούνται (προκύπτουν από το doc_date).
+
+# Μορφές που δεχόταν η παλιά εφαρμογή στα πεδία ημερομηνίας (κείμενο)
+LEGACY_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d.%m.%Y")
+
+# Ημερομηνίες-κείμενο που η μετατροπή δεν αναγνώρισε: μένουν εδώ αυτούσιες
+# (πίνακας, id, στήλη) για διόρθωση με το χέρι, αντί να χαθούν.
+LEGACY_DATES_TABLE = """
+    CREATE TABLE IF NOT EXISTS legacy_dates (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        column_name TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (table_name, row_id, column_name)
+    )
+"""
+LEGACY_DATE_COLUMNS = (("projects", "reg_date"), ("documents", "doc_date"), ("worklog", "log_date"))
+
+
+def legacy_day_key(value):
+    # ΕΕΕΕΜΜΗΗ από ημερομηνία-κείμενο (συνάρτηση SQL στο migration 6)
+    if value is None:
+        return None
+    text = str(value).strip()
+    for candidate in (text, text[:10]):
+        for fmt in LEGACY_DATE_FORMATS:
+            try:
+                return to_day_key(datetime.strptime(candidate, fmt))
+            except ValueError:
+                continue
+    return None
+
+
+def legacy_cents(value):
+    # Ποσά του παλιού σχήματος με τον ίδιο κανόνα με το to_cents· κείμενο
+    # που δεν είναι αριθμός γίνεται 0, όπως στο CAST του SQLite.
+    if value is None:
+        return None
+    try:
+        return to_cents(value)
+    except (InvalidOperation, ValueError):
+        return 0
+
+
+def _real_to_cents(column):
+    return f"legacy_cents({column})"
+
+
+TYPED_TABLES = {
+    "projects": """
+        CREATE TABLE projects_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            code TEXT,                      -- Κωδικός Έργου
+            reg_date INTEGER,               -- Ημ/νια Εγγραφής (ΕΕΕΕΜΜΗΗ)
+            protocol_no TEXT,               -- αρ. πρωτ
+            client_id INTEGER,              -- σχέση με clients
+            employer_name TEXT,             -- Εργοδότης (ελεύθερο κείμενο)
+            hf_flag TEXT,                   -- ΗΦ-Φ
+            project_type TEXT,              -- Είδος Έργου
+            priority TEXT,                  -- Προτεραιότητα
+            status TEXT,                    -- Κατάσταση
+            status2 TEXT,                   -- Κατάσταση2
+            description TEXT,               -- Περιγραφή
+            address TEXT,                   -- Διεύθυνση εργου
+            postal_code TEXT,               -- ΤΚ
+            city TEXT,                      -- Πόλη
+            agreed_amount INTEGER,          -- Συμφωνημένη Αξία (λεπτά €)
+            invoice_expenses INTEGER,       -- Έξοδα παραστατικα (λεπτά €)
+            engineer TEXT,                  -- Μηχανικός
+            apy TEXT,                       -- ΑΠΥ
+            manager TEXT,                   -- Μάνος-Θανάσης
+            FOREIGN KEY(client_id) REFERENCES clients(id)
+        )
+    """,
+    "documents": """
+        CREATE TABLE documents_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seq_no INTEGER,                 -- α/α
+            doc_date INTEGER,               -- Ημ/νία Παρ/τικού (ΕΕΕΕΜΜΗΗ)
+            project_id INTEGER,             -- Έργα (σχέση με projects)
+            billing_type TEXT,              -- Τιμολόγηση
+            supplier_id INTEGER,            -- Προμηθευτής - Συνεργείο
+            work_title TEXT,                -- Εργασία
+            description TEXT,               -- Περιγραφή
+            charge INTEGER,                 -- Χρέωση (λεπτά €)
+            vat INTEGER,                    -- ΦΠΑ (λεπτά €)
+            credit INTEGER,                 -- Πίστωση (λεπτά €)
+            payment_method TEXT,            -- Τρόπος Πληρωμής
+            payments INTEGER,               -- Καταβολές (λεπτά €)
+            payment_target TEXT,            -- Που καταβληθηκαν
+            FOREIGN KEY(project_id) REFERENCES projects(id),
+            FOREIGN KEY(supplier_id) REFERENCES suppliers(id)
+        )
+    """,
+    "worklog": """
+        CREATE TABLE worklog_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            log_date INTEGER,               -- Ημερομηνία (ΕΕΕΕΜΜΗΗ)
+            employee TEXT,                  -- Υπάλληλος
+            project_id INTEGER,             -- Έργο (σχέση με projects)
+            work_desc TEXT,                 -- Εργασία
+            hours REAL,                     -- Ώρες
+            FOREIGN KEY(project_id) REFERENCES projects(id)
+        )
+    """,
+    "fee_templates": """
+        CREATE TABLE fee_templates_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_type TEXT,                 -- Είδος Έργου
+            amount INTEGER                  -- Ποσό (λεπτά €)
+        )
+    """,
+}
+
+TYPED_COPY = {
+    "projects": f"""
+        INSERT INTO projects_new
+        SELECT id, code, legacy_day_key(reg_date), protocol_no, client_id,
+               employer_name, hf_flag, project_type, priority, status, status2,
+               description, address, postal_code, city,
+               {_real_to_cents("agreed_amount")}, {_real_to_cents("invoice_expenses")},
+               engineer, apy, manager
+        FROM projects
+    """,
+    # Αν λείπει η ημερομηνία αλλά υπάρχουν ΗΜΕΡΑ/ΜΗΝΑ/ΕΤΟΣ, συντίθεται από αυτά
+    "documents": f"""
+        INSERT INTO documents_new
+        SELECT id, seq_no,
+               COALESCE(
+                   legacy_day_key(doc_date),
+                   CASE WHEN CAST(year AS INTEGER) > 0 AND CAST(month AS INTEGER) BETWEEN 1 AND 12
+                             AND CAST(day AS INTEGER) BETWEEN 1 AND 31
+                        THEN CAST(year AS INTEGER) * 10000 + CAST(month AS INTEGER) * 100
+                             + CAST(day AS INTEGER)
+                   END
+               ),
+               project_id, billing_type, supplier_id, work_title, description,
+               {_real_to_cents("charge")}, {_real_to_cents("vat")}, {_real_to_cents("credit")},
+               payment_method, {_real_to_cents("payments")}, payment_target
+        FROM documents
+    """,
+    "worklog": f"""
+        INSERT INTO worklog_new
+        SELECT id, legacy_day_key(log_date), employee, project_id, work_desc, hours
+        FROM worklog
+    """,
+    "fee_templates": f"""
+        INSERT INTO fee_templates_new
+        SELECT id, work_type, {_real_to_cents("amount")}
+        FROM fee_templates
+    """,
+}
+
+TYPED_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_projects_list ON projects(IFNULL(reg_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status, IFNULL(reg_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_city ON projects(city)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_list ON documents(IFNULL(doc_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_project_list ON documents(project_id, IFNULL(doc_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_supplier_list ON documents(supplier_id, IFNULL(doc_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_list ON worklog(IFNULL(log_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_project_list ON worklog(project_id, IFNULL(log_date,0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_worklog_employee_list ON worklog(employee, IFNULL(log_date,0), id)",
+)
+
+TYPED_LEDGER_TABLES = (
+    "DROP TABLE IF EXISTS supplier_balance",
+    "DROP TABLE IF EXISTS project_cost",
+    """
+        CREATE TABLE supplier_balance (
+            supplier_id INTEGER PRIMARY KEY,    -- σχέση με suppliers
+            balance INTEGER NOT NULL DEFAULT 0  -- χρέωση+ΦΠΑ-πίστωση-καταβολές (λεπτά €)
+        )
+    """,
+    """
+        CREATE TABLE project_cost (
+            project_id INTEGER PRIMARY KEY,     -- σχέση με projects
+            total_cost INTEGER NOT NULL DEFAULT 0  -- χρέωση+ΦΠΑ (λεπτά €)
+        )
+    """,
+)
+
+
+def _convert_storage_types(conn):
+    conn.create_function("legacy_day_key", 1, legacy_day_key, deterministic=True)
+    conn.create_function("legacy_cents", 1, legacy_cents, deterministic=True)
+    conn.execute(LEGACY_DATES_TABLE)
+    for table, column in LEGACY_DATE_COLUMNS:
+        conn.execute(f"""
+            INSERT OR REPLACE INTO legacy_dates (table_name, row_id, column_name, value)
+            SELECT ?, id, ?, {column} FROM {table}
+            WHERE TRIM(IFNULL({column}, '')) <> '' AND legacy_day_key({column}) IS NULL
+        """, (table, column))
+    unparsed = conn.execute("SELECT COUNT(*) FROM legacy_dates").fetchone()[0]
+    if unparsed:
+        logging.getLogger("erp_ergon.migrations").warning(
+            "%d ημερομηνίες δεν αναγνωρίστηκαν· το αρχικό κείμενο κρατήθηκε στον πίνακα legacy_dates",
+            unparsed
+        )
+    for table, ddl in TYPED_TABLES.items():
+        conn.execute(ddl)
+        conn.execute(TYPED_COPY[table])
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    for stmt in TYPED_INDEXES + TYPED_LEDGER_TABLES + LEDGER_TRIGGERS:
+        conn.execute(stmt)
+    for table in ("projects", "documents"):
+        for stmt in fts_ddl(table, FTS_INDEXES[table])[1:]:
+            conn.execute(stmt)
+    _rebuild_ledgers(conn)
+
+
+SCHEMA_V6 = (_convert_storage_types,)
+
+# Μηνιαία σύνολα παραστατικών για τις περιοδικές αναφορές (reports.py).
+# Κρατιούνται μόνο για κλειστούς μήνες (πριν τον τρέχοντα), στη μικρότερη
+# ανάλυση (μήνας, έργο, προμηθευτής, τιμολόγηση)· ο τρέχων μήνας
+# υπολογίζεται πάντα ζωντανά. Τα triggers απλώς σημειώνουν τον μήνα ως
+# stale, και ο μήνας ξαναϋπολογίζεται ολόκληρος στην επόμενη αναφορά.
+ROLLUP_TABLES = (
+    """
+        CREATE TABLE IF NOT EXISTS document_months (
+            month INTEGER NOT NULL,             -- ΕΕΕΕΜΜ
+            project_id INTEGER NOT NULL,        -- 0 = χωρίς έργο
+            supplier_id INTEGER NOT NULL,       -- 0 = χωρίς προμηθευτή
+            billing_type TEXT NOT NULL,         -- '' = χωρίς τιμολόγηση
+            charge INTEGER NOT NULL,            -- λεπτά €
+            vat INTEGER NOT NULL,
+            credit INTEGER NOT NULL,
+            payments INTEGER NOT NULL,
+            docs INTEGER NOT NULL,
+            PRIMARY KEY (month, project_id, supplier_id, billing_type)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS stale_months (
+            month INTEGER PRIMARY KEY           -- ΕΕΕΕΜΜ προς επανυπολογισμό
+        )
+    """,
+)
+
+ROLLUP_TRIGGERS = (
+    """
+        CREATE TRIGGER IF NOT EXISTS trg_documents_months_ai
+        AFTER INSERT ON documents WHEN NEW.doc_date IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO stale_months (month) VALUES (NEW.doc_date / 100);
+        END
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS trg_documents_months_ad
+        AFTER DELETE ON documents WHEN OLD.doc_date IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO stale_months (month) VALUES (OLD.doc_date / 100);
+        END
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS trg_documents_months_au
+        AFTER UPDATE OF doc_date, project_id, supplier_id, billing_type,
+                        charge, vat, credit, payments ON documents
+        BEGIN
+            INSERT OR IGNORE INTO stale_months (month)
+            SELECT OLD.doc_date / 100 WHERE OLD.doc_date IS NOT NULL;
+            INSERT OR IGNORE INTO stale_months (month)
+            SELECT NEW.doc_date / 100 WHERE NEW.doc_date IS NOT NULL;
+        END
+    """,
+)
+
+# Ίδια ομαδοποίηση με το document_months· χρησιμοποιείται και για τον
+# ζωντανό υπολογισμό του ανοιχτού μήνα (και των αρχειοθετημένων
+# παραστατικών, με {documents} = archive.documents).
+ROLLUP_SELECT_FROM = """
+    SELECT d.doc_date / 100 AS month,
+           IFNULL(d.project_id, 0) AS project_id,
+           IFNULL(d.supplier_id, 0) AS supplier_id,
+           IFNULL(d.billing_type, '') AS billing_type,
+           SUM(IFNULL(d.charge, 0)) AS charge,
+           SUM(IFNULL(d.vat, 0)) AS vat,
+           SUM(IFNULL(d.credit, 0)) AS credit,
+           SUM(IFNULL(d.payments, 0)) AS payments,
+           COUNT(*) AS docs
+    FROM {documents} d
+    WHERE IFNULL(d.doc_date,0) BETWEEN ? AND ?
+    GROUP BY 1, 2, 3, 4
+"""
+ROLLUP_SELECT = ROLLUP_SELECT_FROM.format(documents="documents")
+
+
+def month_key(value):
+    return value.year * 100 + value.month
+
+
+def _refresh_rollups(conn, open_month):
+    # Ξαναϋπολογίζει τους stale κλειστούς μήνες· οι ανοιχτοί μένουν
+    # σημειωμένοι μέχρι να κλείσουν.
+    months = [r[0] for r in conn.execute(
+        "SELECT month FROM stale_months WHERE month < ? ORDER BY month", (open_month,)
+    )]
+    for month in months:
+        conn.execute("DELETE FROM document_months WHERE month = ?", (month,))
+        conn.execute(
+            f"INSERT INTO document_months {ROLLUP_SELECT}",
+            (month * 100 + 1, month * 100 + 31)
+        )
+        conn.execute("DELETE FROM stale_months WHERE month = ?", (month,))
+    return len(months)
+
+
+def _rebuild_rollups(conn):
+    conn.execute("DELETE FROM document_months")
+    conn.execute("DELETE FROM stale_months")
+    conn.execute("""
+        INSERT INTO stale_months (month)
+        SELECT DISTINCT doc_date / 100 FROM documents WHERE doc_date IS NOT NULL
+    """)
+    _refresh_rollups(conn, month_key(date.today()))
+
+
+SCHEMA_V7 = ROLLUP_TABLES + ROLLUP_TRIGGERS + (_rebuild_rollups,)
+
+# Κόστος εργασίας: ώρες ανά (έργο, υπάλληλο) ενημερωμένες από triggers
+# στο worklog, και ωριαίο κόστος ανά υπάλληλο. Το κόστος (ώρες × τιμή)
+# υπολογίζεται στο ερώτημα, ώστε μια αλλαγή τιμής να ισχύει αμέσως.
+LABOUR_TABLES = (
+    """
+        CREATE TABLE IF NOT EXISTS project_hours (
+            project_id INTEGER NOT NULL,        -- σχέση με projects
+            employee TEXT NOT NULL,             -- '' = χωρίς υπάλληλο
+            hours REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, employee)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS employee_rates (
+            employee TEXT PRIMARY KEY,          -- όπως γράφεται στο worklog
+            hourly_rate INTEGER NOT NULL        -- λεπτά € ανά ώρα
+        )
+    """,
+)
+
+
+def _hours_add(row):
+    return f"""
+        INSERT INTO project_hours (project_id, employee, hours)
+        SELECT {row}.project_id, IFNULL({row}.employee, ''), IFNULL({row}.hours, 0)
+        WHERE {row}.project_id IS NOT NULL
+        ON CONFLICT(project_id, employee) DO UPDATE SET hours = hours + excluded.hours;
+    """
+
+
+def _hours_remove(row):
+    return f"""
+        UPDATE project_hours
+        SET hours = hours - IFNULL({row}.hours, 0)
+        WHERE project_id = {row}.project_id AND employee = IFNULL({row}.employee, '');
+    """
+
+
+LABOUR_TRIGGERS = (
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_hours_ai
+        AFTER INSERT ON worklog
+        BEGIN
+            {_hours_add("NEW")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_hours_ad
+        AFTER DELETE ON worklog
+        BEGIN
+            {_hours_remove("OLD")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_hours_au
+        AFTER UPDATE OF project_id, employee, hours ON worklog
+        BEGIN
+            {_hours_remove("OLD")}
+            {_hours_add("NEW")}
+        END
+    """,
+)
+
+
+def _rebuild_hours(conn):
+    conn.execute("DELETE FROM project_hours")
+    conn.execute("""
+        INSERT INTO project_hours (project_id, employee, hours)
+        SELECT project_id, IFNULL(employee, ''), SUM(IFNULL(hours, 0))
+        FROM worklog
+        WHERE project_id IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+SCHEMA_V8 = LABOUR_TABLES + LABOUR_TRIGGERS + (_rebuild_hours,)
+
+# Καρτέλα προμηθευτή (reports.supplier_statement): ίδια σειρά με το
+# idx_documents_supplier_list, που αντικαθιστά, και με τα ποσά στο index
+# ώστε το υπόλοιπο έναρξης να αθροίζεται χωρίς πρόσβαση στον πίνακα.
+SCHEMA_V9 = (
+    """CREATE INDEX IF NOT EXISTS idx_documents_supplier_statement
+       ON documents(supplier_id, IFNULL(doc_date,0), id, charge, vat, credit, payments)""",
+    "DROP INDEX IF EXISTS idx_documents_supplier_list",
+)
+
+# Ώρες προσωπικού (reports.py, ΩΡΕΣ ΠΡΟΣΩΠΙΚΟΥ): ανά εβδομάδα / υπάλληλο
+# και ανά μήνα / υπάλληλο / έργο, ενημερωμένες από triggers στο worklog
+# όπως το project_hours. Οι εγγραφές χωρίς (έγκυρη) ημερομηνία μένουν εκτός.
+TIMESHEET_TABLES = (
+    """
+        CREATE TABLE IF NOT EXISTS worklog_weeks (
+            week INTEGER NOT NULL,              -- Δευτέρα της εβδομάδας (ΕΕΕΕΜΜΗΗ)
+            employee TEXT NOT NULL,             -- '' = χωρίς υπάλληλο
+            hours REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (week, employee)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS worklog_months (
+            month INTEGER NOT NULL,             -- ΕΕΕΕΜΜ
+            employee TEXT NOT NULL,             -- '' = χωρίς υπάλληλο
+            project_id INTEGER NOT NULL,        -- 0 = χωρίς έργο
+            hours REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, employee, project_id)
+        ) WITHOUT ROWID
+    """,
+)
+
+
+def week_key_expr(day):
+    # Δευτέρα της εβδομάδας μιας ημερομηνίας ΕΕΕΕΜΜΗΗ (NULL αν δεν είναι έγκυρη)
+    return (
+        f"CAST(strftime('%Y%m%d', printf('%04d-%02d-%02d', {day} / 10000, {day} / 100 % 100, {day} % 100),"
+        f" 'weekday 0', '-6 days') AS INTEGER)"
+    )
+
+
+def _timesheet_add(row):
+    return f"""
+        INSERT INTO worklog_weeks (week, employee, hours)
+        SELECT {week_key_expr(f"{row}.log_date")}, IFNULL({row}.employee, ''), IFNULL({row}.hours, 0)
+        WHERE {week_key_expr(f"{row}.log_date")} IS NOT NULL
+        ON CONFLICT(week, employee) DO UPDATE SET hours = hours + excluded.hours;
+
+        INSERT INTO worklog_months (month, employee, project_id, hours)
+        SELECT {row}.log_date / 100, IFNULL({row}.employee, ''), IFNULL({row}.project_id, 0),
+               IFNULL({row}.hours, 0)
+        WHERE {week_key_expr(f"{row}.log_date")} IS NOT NULL
+        ON CONFLICT(month, employee, project_id) DO UPDATE SET hours = hours + excluded.hours;
+    """
+
+
+def _timesheet_remove(row):
+    return f"""
+        UPDATE worklog_weeks
+        SET hours = hours - IFNULL({row}.hours, 0)
+        WHERE week = {week_key_expr(f"{row}.log_date")} AND employee = IFNULL({row}.employee, '');
+
+        UPDATE worklog_months
+        SET hours = hours - IFNULL({row}.hours, 0)
+        WHERE month = {row}.log_date / 100 AND employee = IFNULL({row}.employee, '')
+          AND project_id = IFNULL({row}.project_id, 0);
+    """
+
+
+TIMESHEET_TRIGGERS = (
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_timesheet_ai
+        AFTER INSERT ON worklog WHEN NEW.log_date IS NOT NULL
+        BEGIN
+            {_timesheet_add("NEW")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_timesheet_ad
+        AFTER DELETE ON worklog WHEN OLD.log_date IS NOT NULL
+        BEGIN
+            {_timesheet_remove("OLD")}
+        END
+    """,
+    f"""
+        CREATE TRIGGER IF NOT EXISTS trg_worklog_timesheet_au
+        AFTER UPDATE OF log_date, employee, project_id, hours ON worklog
+        BEGIN
+            {_timesheet_remove("OLD")}
+            {_timesheet_add("NEW")}
+        END
+    """,
+)
+
+
+def _rebuild_timesheets(conn):
+    # Στην PostgreSQL η Δευτέρα υπολογίζεται από τη συνάρτηση week_key (postgres.py)
+    week = "week_key(log_date)" if is_postgres() else week_key_expr("log_date")
+    conn.execute("DELETE FROM worklog_weeks")
+    conn.execute("DELETE FROM worklog_months")
+    conn.execute(f"""
+        INSERT INTO worklog_weeks (week, employee, hours)
+        SELECT {week}, IFNULL(employee, ''), SUM(IFNULL(hours, 0))
+        FROM worklog
+        WHERE {week} IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    conn.execute(f"""
+        INSERT INTO worklog_months (month, employee, project_id, hours)
+        SELECT log_date / 100, IFNULL(employee, ''), IFNULL(project_id, 0), SUM(IFNULL(hours, 0))
+        FROM worklog
+        WHERE {week} IS NOT NULL
+        GROUP BY 1, 2, 3
+    """)
+
+
+SCHEMA_V10 = TIMESHEET_TABLES + TIMESHEET_TRIGGERS + (_rebuild_timesheets,)
+
+# Εργασίες παρασκηνίου (jobs.py): κατάσταση και πρόοδος γράφονται από τις
+# διεργασίες του pool και διαβάζονται από τις σελίδες (πάντα χωρίς cache).
+SCHEMA_V11 = (
+    """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,                 -- κλειδί του jobs.JOB_KINDS
+            params TEXT NOT NULL DEFAULT '{}',  -- JSON
+            status TEXT NOT NULL DEFAULT 'queued',  -- queued / running / done / failed / cancelled
+            progress REAL,                      -- 0..1, NULL = άγνωστη
+            message TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            result_path TEXT,
+            error TEXT,
+            pid INTEGER,
+            created_at REAL NOT NULL,           -- unix time
+            started_at REAL,
+            finished_at REAL
+        )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_kind ON jobs(kind, id)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)",
+)
+
+# Με κοινή βάση PostgreSQL πολλοί servers έχουν δικό τους pool εργασιών:
+# κάθε εργασία θυμάται ποιος την εκτελεί (jobs.NODE).
+SCHEMA_V12 = (
+    "ALTER TABLE jobs ADD COLUMN node TEXT",
+)
+
+# Σημειώσεις αλλαγών για το cache των άλλων διεργασιών
+# (ConnectionManager.sync_cache)· στην PostgreSQL το ίδιο γίνεται με NOTIFY.
+SCHEMA_V13 = (
+    """
+    CREATE TABLE IF NOT EXISTS db_changes (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        tables TEXT NOT NULL
+    )
+    """,
+)
+
+# Η διεργασία που υπέβαλε την εργασία (jobs.OWNER): στην επανεκκίνηση
+# κλείνουν μόνο οι εργασίες διεργασιών που δεν ζουν πια.
+SCHEMA_V14 = (
+    "ALTER TABLE jobs ADD COLUMN owner TEXT",
+)
+
+# Τα indexes ημερομηνίας του SCHEMA_V2 καλύπτονται από τα *_list
+# (IFNULL(ημερομηνία,0), id), που χρησιμοποιούν και τα εύρη.
+SCHEMA_V15 = (
+    "DROP INDEX IF EXISTS idx_projects_reg_date",
+    "DROP INDEX IF EXISTS idx_documents_date",
+    "DROP INDEX IF EXISTS idx_worklog_date",
+)
+
+# Τα ευρετήρια αναζήτησης ξαναχτίζονται ως contentless (βλ. FTS_INDEXES)·
+# τα triggers μένουν ίδια.
+SCHEMA_V16 = (
+    tuple(f"DROP TABLE IF EXISTS {table}_fts" for table in FTS_INDEXES)
+    + tuple(fts_ddl(table, columns)[0] for table, columns in FTS_INDEXES.items())
+    + (_rebuild_search,)
+)
+
+MIGRATIONS = (
+    (1, SCHEMA_V1),
+    (2, SCHEMA_V2),
+    (3, SCHEMA_V3),
+    (4, SCHEMA_V4),
+    (5, SCHEMA_V5),
+    (6, SCHEMA_V6),
+    (7, SCHEMA_V7),
+    (8, SCHEMA_V8),
+    (9, SCHEMA_V9),
+    (10, SCHEMA_V10),
+    (11, SCHEMA_V11),
+    (12, SCHEMA_V12),
+    (13, SCHEMA_V13),
+    (14, SCHEMA_V14),
+    (15, SCHEMA_V15),
+    (16, SCHEMA_V16),
+)
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    applied = []
+    for version, steps in MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Ξαναδιαβάζουμε μέσα στη συναλλαγή, μήπως άλλη διεργασία
+            # εφάρμοσε ήδη το migration.
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def ensure_schema():
+    # Τρέχει μία φορά ανά διεργασία· τα επόμενα reruns επιστρέφουν αμέσως.
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        if get_manager().migrate():
+            query_cache.clear()
+        _schema_ready = True
+
+
+def unparsed_legacy_dates():
+    # Ημερομηνίες που το migration 6 δεν αναγνώρισε (πίνακας legacy_dates)
+    if is_postgres() or not fetch_all(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'legacy_dates'", cache=False
+    ):
+        return 0
+    return fetch_all("SELECT COUNT(*) FROM legacy_dates", cache=False)[0][0]
+
+
+# ------------------------------------------------------------
+# CACHE ΑΠΟΤΕΛΕΣΜΑΤΩΝ
+# ------------------------------------------------------------
+
+# Κοινή για όλα τα sessions της διεργασίας. Κάθε αποτέλεσμα θυμάται την
+# έκδοση των πινάκων που διάβασε· κάθε εγγραφή μέσω execute() ανεβάζει
+# την έκδοση του πίνακα, οπότε ακυρώνονται μόνο τα σχετικά αποτελέσματα.
+# Τα archive.<πίνακας> μετράνε όλα ως ένας πίνακας "archive", που
+# ακυρώνεται σε κάθε αρχειοθέτηση / επαναφορά.
+
+_READ_TABLES_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+([A-Za-z_][A-Za-z0-9_]*)",
+    re.IGNORECASE,
+)
+
+# Πίνακες που αλλάζουν έμμεσα (π.χ. από triggers) όταν γράφεται ένας πίνακας
+TABLE_DEPENDENTS = {
+    "clients": ("clients_fts",),
+    "suppliers": ("suppliers_fts",),
+    "projects": ("projects_fts",),
+    "documents": ("supplier_balance", "project_cost", "documents_fts", "stale_months"),
+    "worklog": ("project_hours", "worklog_weeks", "worklog_months"),
+}
+
+
+def read_tables(query):
+    return frozenset(t.lower() for t in _READ_TABLES_RE.findall(query))
+
+
+def written_tables(query):
+    m = _WRITE_TABLE_RE.match(query)
+    if not m:
+        return frozenset()
+    table = m.group(1).lower()
+    return frozenset((table,) + tuple(TABLE_DEPENDENTS.get(table, ())))
+
+
+def _estimate_size(rows):
+    if hasattr(rows, "nbytes"):
+        return 64 + rows.nbytes
+    if not rows:
+        return 64
+    sample = rows[0]
+    row_size = sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in sample)
+    return 64 + row_size * len(rows)
+
+
+class QueryCache:
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def versions(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in sorted(tables))
+
+    def get(self, key, tables):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                versions, rows, size = entry
+                current = tuple(self._versions.get(t, 0) for t in sorted(tables))
+                if versions == current:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return rows
+                del self._entries[key]
+                self._bytes -= size
+            self.misses += 1
+            return None
+
+    def put(self, key, versions, rows):
+        size = _estimate_size(rows)
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (versions, rows, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def bump(self, tables):
+        with self._lock:
+            for t in tables:
+                self._versions[t] = self._versions.get(t, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+query_cache = QueryCache()
+
+
+def dependent_tables(tables):
+    # Οι πίνακες μαζί με όσους ενημερώνονται από τα triggers τους
+    expanded = set()
+    for t in tables:
+        expanded.add(t.lower())
+        expanded.update(TABLE_DEPENDENTS.get(t.lower(), ()))
+    return expanded
+
+
+def invalidate(*tables):
+    query_cache.bump(dependent_tables(tables))
+
+
+# ------------------------------------------------------------
+# ΜΕΤΡΗΣΗ ΕΡΩΤΗΜΑΤΩΝ
+# ------------------------------------------------------------
+
+# Κάθε ερώτημα που περνά από fetch_all / iter_rows / execute /
+# executemany καταγράφεται: χρόνος (ms), γραμμές, σελίδα και σημείο
+# κλήσης. Τα αθροίσματα ανά ερώτημα ζουν στη μνήμη της διεργασίας (σελίδα
+# Διαγνωστικά)· όσα ξεπερνούν το SLOW_QUERY_MS γράφονται στο
+# SLOW_LOG_PATH (μία γραμμή JSON, με το EXPLAIN QUERY PLAN τους).
+
+SLOW_QUERY_MS = 200
+SLOW_LOG_PATH = "slow_queries.log"
+SLOW_LOG_BYTES = 5 * 1024 * 1024
+SLOW_LOG_BACKUPS = 3
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_query_context = threading.local()
+_slow_logger = None
+_slow_logger_lock = threading.Lock()
+
+
+def set_query_page(page):
+    # Η σελίδα του τρέχοντος rerun (ένα thread ανά rerun στο Streamlit)
+    _query_context.page = page
+
+
+def query_page():
+    return getattr(_query_context, "page", None)
+
+
+def track_query_time():
+    # Αθροιστής [ερωτήματα, ms] για ό,τι εκτελεί στο εξής αυτό το thread
+    totals = [0, 0.0]
+    _query_context.totals = totals
+    return totals
+
+
+def normalize_query(query):
+    return _WHITESPACE_RE.sub(" ", query).strip()
+
+
+def _call_site():
+    # Το πρώτο frame έξω από αυτό το αρχείο: module:γραμμή συνάρτηση
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    module = os.path.basename(frame.f_code.co_filename)
+    return f"{module}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _get_slow_logger():
+    global _slow_logger
+    if _slow_logger is None:
+        with _slow_logger_lock:
+            if _slow_logger is None:
+                logger = logging.getLogger("erp_ergon.slow_queries")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                handler = logging.handlers.RotatingFileHandler(
+                    SLOW_LOG_PATH, maxBytes=SLOW_LOG_BYTES,
+                    backupCount=SLOW_LOG_BACKUPS, encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                _slow_logger = logger
+    return _slow_logger
+
+
+def explain_query(query, params=()):
+    # Το EXPLAIN δεν εκτελεί το ερώτημα, οπότε είναι ασφαλές και για
+    # INSERT/UPDATE· τρέχει σε σύνδεση ανάγνωσης.
+    manager = get_manager()
+    try:
+        return manager.plan(query, params)
+    except manager.errors as e:
+        return [f"(χωρίς πλάνο: {e})"]
+
+
+def read_slow_log(limit=100):
+    # Οι τελευταίες εγγραφές του αρχείου (όχι των παλιών, περιστραμμένων)
+    if not os.path.exists(SLOW_LOG_PATH):
+        return []
+    with open(SLOW_LOG_PATH, encoding="utf-8") as f:
+        lines = f.readlines()[-limit:]
+    entries = []
+    for line in reversed(lines):
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+class QueryStats:
+
+    max_queries = 500
+
+    def __init__(self):
+        self.enabled = True
+        self._queries = {}
+        self._lock = threading.Lock()
+        self.since = datetime.now()
+
+    def record(self, query, params, elapsed_ms, rows, call_site, kind="read"):
+        key = normalize_query(query)
+        page = query_page()
+        totals = getattr(_query_context, "totals", None)
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += elapsed_ms
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is None:
+                if len(self._queries) >= self.max_queries:
+                    # Πετάμε το ερώτημα με τον μικρότερο συνολικό χρόνο
+                    victim = min(self._queries, key=lambda k: self._queries[k]["total_ms"])
+                    del self._queries[victim]
+                entry = {
+                    "kind": kind, "calls": 0, "cache_hits": 0, "total_ms": 0.0,
+                    "max_ms": 0.0, "rows": 0, "pages": {}, "call_site": None, "params": (),
+                }
+                self._queries[key] = entry
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += rows
+            entry["call_site"] = call_site
+            entry["params"] = params
+            calls, total = entry["pages"].get(page or "-", (0, 0.0))
+            entry["pages"][page or "-"] = (calls + 1, total + elapsed_ms)
+
+        if elapsed_ms >= SLOW_QUERY_MS:
+            _get_slow_logger().info(json.dumps({
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "ms": round(elapsed_ms, 1),
+                "rows": rows,
+                "kind": kind,
+                "page": page,
+                "call_site": call_site,
+                "query": key,
+                "params": [repr(p)[:80] for p in params][:20],
+                "plan": explain_query(query, params),
+            }, ensure_ascii=False))
+
+    def record_hit(self, query):
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is not None:
+                entry["cache_hits"] += 1
+
+    def top(self, limit=50, order="total_ms"):
+        with self._lock:
+            items = [(q, dict(e, pages=dict(e["pages"]))) for q, e in self._queries.items()]
+        items.sort(key=lambda item: item[1][order], reverse=True)
+        return items[:limit]
+
+    def by_page(self):
+        totals = {}
+        with self._lock:
+            for entry in self._queries.values():
+                for page, (calls, ms) in entry["pages"].items():
+                    c, t = totals.get(page, (0, 0.0))
+                    totals[page] = (c + calls, t + ms)
+        return sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self.since = datetime.now()
+
+
+query_stats = QueryStats()
+
+
+# ------------------------------------------------------------
+# ΕΡΩΤΗΜΑΤΑ
+# ------------------------------------------------------------
+
+def fold_text(value):
+    # Κανονικοποίηση για συγκρίσεις: χωρίς τόνους/διαλυτικά, πεζά,
+    # ς -> σ, σημεία στίξης -> κενό.
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFD", str(value))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("ς", "σ")
+    return " ".join(re.split(r"[^0-9a-zα-ω]+", text)).strip()
+
+
+def _timed_read(query, params):
+    if not query_stats.enabled:
+        with get_manager().reading(query) as conn:
+            return conn.execute(query, params).fetchall()
+    start = time.perf_counter()
+    with get_manager().reading(query) as conn:
+        rows = conn.execute(query, params).fetchall()
+    elapsed = (time.perf_counter() - start) * 1000
+    query_stats.record(query, params, elapsed, len(rows), _call_site())
+    return rows
+
+
+def fetch_all(query, params=(), cache=True):
+    tables = read_tables(query) if cache else None
+    if not tables:
+        return _timed_read(query, params)
+
+    get_manager().sync_cache()
+    key = (query, tuple(params))
+    rows = query_cache.get(key, tables)
+    if rows is None:
+        # Η έκδοση κρατιέται πριν το ερώτημα: αν μεσολαβήσει εγγραφή,
+        # το αποτέλεσμα θα βγει stale στην επόμενη ανάγνωση.
+        versions = query_cache.versions(tables)
+        rows = _timed_read(query, params)
+        query_cache.put(key, versions, rows)
+    elif query_stats.enabled:
+        query_stats.record_hit(query)
+    return list(rows)
+
+
+def iter_rows(query, params=(), batch_size=2000):
+    # Σειριακή ανάγνωση χωρίς cache και χωρίς να φορτωθεί όλο το
+    # αποτέλεσμα στη μνήμη (για εξαγωγές μεγάλων πινάκων). Ο χρόνος που
+    # καταγράφεται περιλαμβάνει και την επεξεργασία του καλούντα. Στην
+    # PostgreSQL ο cursor είναι στον server (postgres.Connection.cursor).
+    call_site = _call_site()
+    start = time.perf_counter()
+    count = 0
+    try:
+        with get_manager().reading(query) as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    count += len(batch)
+                    yield from batch
+            finally:
+                cursor.close()
+    finally:
+        if query_stats.enabled:
+            elapsed = (time.perf_counter() - start) * 1000
+            query_stats.record(query, params, elapsed, count, call_site)
+
+
+# ------------------------------------------------------------
+# ΣΤΗΛΕΣ (pyarrow)
+# ------------------------------------------------------------
+
+# Οι πίνακες προβολής διαβάζονται κατευθείαν σε στήλες Arrow: ο cursor
+# δίνει απλά tuples (χωρίς sqlite3.Row) σε παρτίδες, κάθε παρτίδα
+# γίνεται στήλες με zip(*παρτίδα) και οι ημερομηνίες / τα λεπτά
+# μετατρέπονται διανυσματικά. Το st.dataframe σειριοποιεί το pyarrow.Table
+# χωρίς pandas. Οι ελληνικές επικεφαλίδες μπαίνουν ως metadata στα πεδία
+# ("label") και δίνονται στο st.dataframe με column_labels().
+
+LABEL_KEY = b"label"
+
+
+def _day_keys_to_dates(array):
+    import numpy as np
+    import pyarrow as pa
+
+    keys = array.fill_null(0).to_numpy()
+    valid = keys > 0
+    keys = np.where(valid, keys, 19700101)
+    months = (keys // 10000 - 1970) * 12 + (keys // 100 % 100 - 1)
+    days = months.astype("datetime64[M]").astype("datetime64[D]") + (keys % 100 - 1)
+    return pa.array(days, type=pa.date32(), mask=~valid)
+
+
+def _column_array(name, values):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if name in CENT_COLUMNS:
+        return pc.divide(pa.array(values, type=pa.int64()).cast(pa.float64()), 100.0)
+    if name in DAY_COLUMNS:
+        return _day_keys_to_dates(pa.array(values, type=pa.int64()))
+    if not values:
+        # Κενό αποτέλεσμα: κείμενο αντί για null, ώστε να είναι επεξεργάσιμη
+        return pa.array([], type=pa.string())
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        # Στήλη χωρίς affinity με ανάμεικτους τύπους: εμφανίζεται ως κείμενο
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _batch_table(names, batch):
+    import pyarrow as pa
+
+    columns = zip(*batch) if batch else [()] * len(names)
+    return pa.table([_column_array(n, list(c)) for n, c in zip(names, columns)], names=names)
+
+
+def table_from_rows(rows, names=None):
+    # Για αποτελέσματα που έχουν ήδη διαβαστεί (π.χ. από το fetch_all)
+    names = names or (list(rows[0].keys()) if rows else [])
+    return _batch_table(names, [tuple(r) for r in rows])
+
+
+def _read_table(query, params, batch_size):
+    import pyarrow as pa
+
+    with get_manager().reading(query) as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(query, params)
+            names = [d[0] for d in cursor.description]
+            chunks = []
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch and chunks:
+                    break
+                chunks.append(_batch_table(names, batch))
+                if len(batch) < batch_size:
+                    break
+        finally:
+            cursor.close()
+    if len(chunks) == 1:
+        return chunks[0]
+    # Μια στήλη που είναι όλο NULL σε μία παρτίδα παίρνει τύπο null·
+    # το permissive ενοποιεί τους τύπους των παρτίδων.
+    return pa.concat_tables(chunks, promote_options="permissive")
+
+
+def with_labels(table, labels):
+    import pyarrow as pa
+
+    if not labels:
+        return table
+    fields = [
+        f.with_metadata({LABEL_KEY: labels[f.name].encode("utf-8")}) if f.name in labels else f
+        for f in table.schema
+    ]
+    return pa.Table.from_arrays(table.columns, schema=pa.schema(fields))
+
+
+def column_labels(table):
+    # column_config για το st.dataframe: {στήλη: ελληνική ετικέτα}
+    labels = {}
+    for field in table.schema:
+        if field.metadata and LABEL_KEY in field.metadata:
+            labels[field.name] = field.metadata[LABEL_KEY].decode("utf-8")
+    return labels
+
+
+def fetch_columns(query, params=(), labels=None, cache=True, batch_size=5000):
+    # Όπως το fetch_all, αλλά επιστρέφει pyarrow.Table με αποκωδικοποιημένες
+    # ημερομηνίες / ποσά. Ο πίνακας είναι αμετάβλητος, οπότε το cache τον
+    # μοιράζεται χωρίς αντίγραφο.
+    tables = read_tables(query) if cache else None
+    if tables:
+        get_manager().sync_cache()
+    key = ("columns", query, tuple(params))
+    table = query_cache.get(key, tables) if tables else None
+    if table is None:
+        versions = query_cache.versions(tables) if tables else None
+        start = time.perf_counter()
+        table = _read_table(query, params, batch_size)
+        if query_stats.enabled:
+            elapsed = (time.perf_counter() - start) * 1000
+            query_stats.record(query, params, elapsed, table.num_rows, _call_site())
+        if tables:
+            query_cache.put(key, versions, table)
+    elif query_stats.enabled:
+        query_stats.record_hit(query)
+    return with_labels(table, labels)
+
+
+def write(func, *tables, replayable=False):
+    # Εκτελεί func(conn) στο thread εγγραφής και επιστρέφει το αποτέλεσμά
+    # της· οι πίνακες που δηλώνονται ακυρώνονται στο cache μετά το commit.
+    # replayable=True: η func αγγίζει μόνο τη σύνδεση, οπότε μπορεί να
+    # μοιραστεί συναλλαγή με άλλες εργασίες και να ξανατρέξει.
+    return get_manager().write(func, tables, replayable=replayable)
+
+
+def execute(query, params=()):
+    # Ο χρόνος μετριέται από τον καλούντα: περιλαμβάνει την αναμονή στην
+    # ουρά και το commit, δηλαδή ό,τι περιμένει πραγματικά η σελίδα.
+    def run(conn):
+        cursor = conn.execute(query, params)
+        return cursor.lastrowid, cursor.rowcount
+
+    start = time.perf_counter()
+    lastrowid, rowcount = write(run, *written_tables(query), replayable=True)
+    if query_stats.enabled:
+        elapsed = (time.perf_counter() - start) * 1000
+        query_stats.record(query, params, elapsed, max(rowcount, 0), _call_site(), "write")
+    return lastrowid
+
+
+def executemany(query, seq_of_params):
+    seq_of_params = list(seq_of_params)
+    start = time.perf_counter()
+    write(lambda conn: conn.executemany(query, seq_of_params), *written_tables(query), replayable=True)
+    if query_stats.enabled:
+        elapsed = (time.perf_counter() - start) * 1000
+        first = seq_of_params[0] if seq_of_params else ()
+        query_stats.record(query, first, elapsed, len(seq_of_params), _call_site(), "write")
+
+
+def rebuild_ledgers():
+    def rebuild(conn):
+        _rebuild_ledgers(conn)
+        _rebuild_hours(conn)
+        _rebuild_timesheets(conn)
+    write(rebuild, "supplier_balance", "project_cost", "project_hours", "worklog_weeks", "worklog_months")
+
+
+def verify_ledgers():
+    with get_manager().reading() as conn:
+        return _verify_ledgers(conn)
+
+
+def refresh_rollups(open_month=None):
+    # Φθηνό όταν δεν υπάρχει stale κλειστός μήνας: ένας έλεγχος στο index
+    open_month = open_month or month_key(date.today())
+    stale = fetch_all(
+        "SELECT 1 FROM stale_months WHERE month < ? LIMIT 1", (open_month,), cache=False
+    )
+    if not stale:
+        return 0
+    return write(
+        lambda conn: _refresh_rollups(conn, open_month), "document_months", "stale_months"
+    )
+
+
+def rebuild_rollups():
+    write(_rebuild_rollups, "document_months", "stale_months")
+
+
+def rebuild_search():
+    if not has_full_text_search():
+        return
+    write(_rebuild_search, *(f"{table}_fts" for table in FTS_INDEXES))
@@ -0,0 +1,349 @@
+from ergon import db, reports
+
+
+# ------------------------------------------------------------
+# ΟΡΙΣΜΟΙ ΦΥΛΛΩΝ ΕΞΑΓΩΓΗΣ
+# ------------------------------------------------------------
+
+# Κάθε στήλη: (στήλη ερωτήματος, επικεφαλίδα, τύπος, πλάτος).
+# Τύποι: text, int, number, money (λεπτά), euro (ήδη σε €), date.
+
+EXPORTS = (
+    {
+        "sheet": "Εργοδότες",
+        "query": """
+            SELECT id, company_name, last_name, first_name, entity_type,
+                   address, postal_code, city, phone_landline, phone_mobile,
+                   email, afm, dou, job
+            FROM clients
+            ORDER BY id
+        """,
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("company_name", "Επωνυμία", "text", 30),
+            ("last_name", "Επίθετο", "text", 18),
+            ("first_name", "Όνομα", "text", 14),
+            ("entity_type", "Σύσταση", "text", 10),
+            ("address", "Διεύθυνση", "text", 25),
+            ("postal_code", "ΤΚ", "text", 8),
+            ("city", "Πόλη", "text", 14),
+            ("phone_landline", "Σταθερό", "text", 13),
+            ("phone_mobile", "Κινητό", "text", 13),
+            ("email", "Email", "text", 24),
+            ("afm", "ΑΦΜ", "text", 11),
+            ("dou", "ΔΟΥ", "text", 14),
+            ("job", "Επάγγελμα", "text", 18),
+        ),
+    },
+    {
+        "sheet": "Προμηθευτές",
+        "query": """
+            SELECT id, company_name, last_name, first_name, entity_type, job,
+                   iban1, bank1, iban2, bank2, iban3, bank3, iban4, bank4,
+                   address, postal_code, city, phone1, phone2, email, afm, dou
+            FROM suppliers
+            ORDER BY id
+        """,
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("company_name", "Επωνυμία Εταιρίας", "text", 30),
+            ("last_name", "Επίθετο", "text", 18),
+            ("first_name", "Όνομα", "text", 14),
+            ("entity_type", "Σύσταση", "text", 10),
+            ("job", "Επάγγελμα", "text", 18),
+            ("iban1", "ΙΒΑΝ 1", "text", 30),
+            ("bank1", "Τράπεζα 1", "text", 14),
+            ("iban2", "ΙΒΑΝ 2", "text", 30),
+            ("bank2", "Τράπεζα 2", "text", 14),
+            ("iban3", "ΙΒΑΝ 3", "text", 30),
+            ("bank3", "Τράπεζα 3", "text", 14),
+            ("iban4", "ΙΒΑΝ 4", "text", 30),
+            ("bank4", "Τράπεζα 4", "text", 14),
+            ("address", "Διεύθυνση", "text", 25),
+            ("postal_code", "ΤΚ", "text", 8),
+            ("city", "Πόλη", "text", 14),
+            ("phone1", "Τηλ. 1", "text", 13),
+            ("phone2", "Τηλ. 2", "text", 13),
+            ("email", "Email", "text", 24),
+            ("afm", "ΑΦΜ", "text", 11),
+            ("dou", "ΔΟΥ", "text", 14),
+        ),
+    },
+    {
+        "sheet": "Έργα",
+        "query": """
+            SELECT id, code, reg_date, protocol_no, employer_name, hf_flag,
+                   project_type, priority, status, status2, description,
+                   address, postal_code, city, agreed_amount, invoice_expenses,
+                   engineer, apy, manager
+            FROM projects
+            ORDER BY IFNULL(reg_date,0), id
+        """,
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("code", "Κωδικός Έργου", "text", 14),
+            ("reg_date", "Ημ/νια Εγγραφής", "date", 12),
+            ("protocol_no", "Αρ. πρωτ", "text", 10),
+            ("employer_name", "Εργοδότης", "text", 28),
+            ("hf_flag", "ΗΦ-Φ", "text", 8),
+            ("project_type", "Είδος Έργου", "text", 18),
+            ("priority", "Προτεραιότητα", "text", 12),
+            ("status", "Κατάσταση", "text", 14),
+            ("status2", "Κατάσταση2", "text", 14),
+            ("description", "Περιγραφή", "text", 35),
+            ("address", "Διεύθυνση έργου", "text", 25),
+            ("postal_code", "ΤΚ", "text", 8),
+            ("city", "Πόλη", "text", 14),
+            ("agreed_amount", "Συμφωνημένη Αξία (€)", "money", 14),
+            ("invoice_expenses", "Έξοδα παραστατικών (€)", "money", 14),
+            ("engineer", "Μηχανικός", "text", 16),
+            ("apy", "ΑΠΥ", "text", 10),
+            ("manager", "Μάνος-Θανάσης", "text", 14),
+        ),
+    },
+    {
+        "sheet": "Παραστατικά",
+        "query": """
+            SELECT d.id, d.seq_no, d.doc_date,
+                   p.code AS project_code, p.employer_name,
+                   d.billing_type, s.company_name AS supplier_name,
+                   d.work_title, d.description,
+                   d.charge, d.vat, d.credit,
+                   d.payment_method, d.payments, d.payment_target
+            FROM documents d
+            LEFT JOIN projects p ON d.project_id = p.id
+            LEFT JOIN suppliers s ON d.supplier_id = s.id
+            ORDER BY IFNULL(d.doc_date,0), d.id
+        """,
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("seq_no", "α/α", "int", 7),
+            ("doc_date", "Ημ/νία Παρ/τικού", "date", 12),
+            ("project_code", "Κωδ. έργου", "text", 12),
+            ("employer_name", "Εργοδότης", "text", 26),
+            ("billing_type", "Τιμολόγηση", "text", 12),
+            ("supplier_name", "Προμηθευτής - Συνεργείο", "text", 26),
+            ("work_title", "Εργασία", "text", 24),
+            ("description", "Περιγραφή", "text", 30),
+            ("charge", "Χρέωση (€)", "money", 12),
+            ("vat", "ΦΠΑ (€)", "money", 11),
+            ("credit", "Πίστωση (€)", "money", 12),
+            ("payment_method", "Τρόπος Πληρωμής", "text", 14),
+            ("payments", "Καταβολές (€)", "money", 12),
+            ("payment_target", "Πού καταβλήθηκαν", "text", 16),
+        ),
+    },
+    {
+        "sheet": "Ημερολόγιο",
+        "query": """
+            SELECT w.id, w.log_date, w.employee, p.code AS project_code,
+                   p.employer_name, w.work_desc, w.hours
+            FROM worklog w
+            LEFT JOIN projects p ON w.project_id = p.id
+            ORDER BY IFNULL(w.log_date,0), w.id
+        """,
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("log_date", "Ημερομηνία", "date", 12),
+            ("employee", "Υπάλληλος", "text", 18),
+            ("project_code", "Κωδ. έργου", "text", 12),
+            ("employer_name", "Εργοδότης", "text", 26),
+            ("work_desc", "Εργασία", "text", 35),
+            ("hours", "Ώρες", "number", 8),
+        ),
+    },
+    {
+        "sheet": "Ταμείο",
+        "query": "SELECT id, work_type, amount FROM fee_templates ORDER BY work_type",
+        "columns": (
+            ("id", "ID", "int", 8),
+            ("work_type", "Είδος Έργου", "text", 30),
+            ("amount", "Ποσό (€)", "money", 12),
+        ),
+    },
+    {
+        "sheet": "Υπόλοιπα προμηθευτών",
+        "query": """
+            SELECT s.company_name, IFNULL(b.balance, 0) AS balance
+            FROM suppliers s
+            LEFT JOIN supplier_balance b ON b.supplier_id = s.id
+            ORDER BY s.company_name
+        """,
+        "columns": (
+            ("company_name", "Προμηθευτής", "text", 30),
+            ("balance", "Υπόλοιπο (€)", "money", 14),
+        ),
+    },
+    {
+        "sheet": "Dashboard έργων",
+        "query": f"SELECT * FROM ({reports.PROFITABILITY_SQL}) p ORDER BY reg_date DESC, id DESC",
+        "columns": (
+            ("code", "Κωδ. έργου", "text", 12),
+            ("employer_name", "Εργοδότης", "text", 28),
+            ("status", "Κατάσταση", "text", 14),
+            ("agreed_amount", "Συμφωνημένη Αξία (€)", "money", 14),
+            ("doc_cost", "Χρεώσεις+ΦΠΑ (€)", "money", 14),
+            ("hours", "Ώρες", "number", 8),
+            ("labour_cost", "Κόστος εργασίας (€)", "money", 14),
+            ("total_cost", "Συνολικό κόστος (€)", "money", 14),
+            ("margin", "Περιθώριο (€)", "money", 14),
+            ("margin_pct", "Περιθώριο %", "number", 10),
+        ),
+    },
+)
+
+
+# ------------------------------------------------------------
+# ΕΞΑΓΩΓΗ (xlsxwriter, constant_memory)
+# ------------------------------------------------------------
+
+def _cell_writer(worksheet, kind, fmt):
+    # Επιστρέφει συνάρτηση (γραμμή, στήλη, τιμή) για τον τύπο της στήλης
+    # Ημερομηνίες ΕΕΕΕΜΜΗΗ και ποσά σε λεπτά (βλ. db.py, ΤΥΠΟΙ ΑΠΟΘΗΚΕΥΣΗΣ)
+    if kind == "date":
+        def write(row, col, value):
+            if not value:
+                worksheet.write_blank(row, col, None, fmt)
+                return
+            try:
+                worksheet.write_datetime(row, col, db.from_day_key(value), fmt)
+            except (TypeError, ValueError):
+                worksheet.write_string(row, col, str(value))
+        return write
+    if kind in ("money", "euro"):
+        scale = 100 if kind == "money" else 1
+
+        def write(row, col, value):
+            if value is None:
+                worksheet.write_blank(row, col, None, fmt)
+            else:
+                worksheet.write_number(row, col, value / scale, fmt)
+        return write
+    if kind in ("int", "number"):
+        def write(row, col, value):
+            if value is None or value == "":
+                worksheet.write_blank(row, col, None, fmt)
+            elif isinstance(value, (int, float)):
+                worksheet.write_number(row, col, value, fmt)
+            else:
+                worksheet.write_string(row, col, str(value))
+        return write
+
+    def write(row, col, value):
+        if value is None:
+            return
+        worksheet.write_string(row, col, str(value))
+    return write
+
+
+def export_sheet(workbook, spec, formats, progress=None):
+    worksheet = workbook.add_worksheet(spec["sheet"][:31])
+    columns = spec["columns"]
+
+    for col, (_, header, kind, width) in enumerate(columns):
+        worksheet.set_column(col, col, width)
+        worksheet.write_string(0, col, header, formats["header"])
+    worksheet.freeze_panes(1, 0)
+
+    writers = [_cell_writer(worksheet, kind, formats.get(kind)) for _, _, kind, _ in columns]
+    keys = [key for key, _, _, _ in columns]
+
+    # Στο constant_memory κάθε γραμμή γράφεται στον δίσκο μόλις ξεκινήσει
+    # η επόμενη, οπότε η μνήμη μένει σταθερή όσο μεγάλος κι αν είναι ο πίνακας.
+    row_no = 0
+    # "rows": έτοιμες γραμμές (dict) αντί για ερώτημα, π.χ. μιας αναφοράς
+    rows = spec["rows"] if "rows" in spec else db.iter_rows(spec["query"], spec.get("params", ()))
+    for row in rows:
+        row_no += 1
+        for col, key in enumerate(keys):
+            writers[col](row_no, col, row[key])
+        if progress and row_no % 10000 == 0:
+            progress(spec["sheet"], row_no)
+
+    if row_no:
+        worksheet.autofilter(0, 0, row_no, len(columns) - 1)
+    if progress:
+        progress(spec["sheet"], row_no)
+    return row_no
+
+
+def export_workbook(path, sheets=None, progress=None):
+    specs = [spec for spec in EXPORTS if not sheets or spec["sheet"] in sheets]
+    return write_workbook(path, specs, progress)
+
+
+def write_workbook(path, specs, progress=None):
+    # Γράφει σε αρχείο (όχι BytesIO): με in-memory έξοδο το xlsxwriter
+    # αγνοεί το constant_memory.
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        formats = {
+            "header": workbook.add_format({"bold": True, "bg_color": "#0f4c81", "font_color": "#ffffff"}),
+            "date": workbook.add_format({"num_format": "dd/mm/yyyy"}),
+            "money": workbook.add_format({"num_format": "#,##0.00 €"}),
+            "euro": workbook.add_format({"num_format": "#,##0.00 €"}),
+            "number": workbook.add_format({"num_format": "0.00"}),
+            "int": workbook.add_format({"num_format": "0"}),
+        }
+        counts = {}
+        for spec in specs:
+            counts[spec["sheet"]] = export_sheet(workbook, spec, formats, progress)
+    finally:
+        workbook.close()
+    return counts
+
+
+# ------------------------------------------------------------
+# ΚΑΡΤΕΛΑ ΠΡΟΜΗΘΕΥΤΗ
+# ------------------------------------------------------------
+
+STATEMENT_COLUMNS = (
+    ("doc_date", "Ημ/νία", "date", 12),
+    ("project_code", "Κωδ. έργου", "text", 12),
+    ("work_title", "Εργασία", "text", 30),
+    ("billing_type", "Τιμολόγηση", "text", 14),
+    ("charge", "Χρέωση (€)", "money", 14),
+    ("vat", "ΦΠΑ (€)", "money", 12),
+    ("credit", "Πίστωση (€)", "money", 12),
+    ("payments", "Καταβολές (€)", "money", 14),
+    ("balance", "Υπόλοιπο (€)", "money", 14),
+)
+
+
+def export_statement(path, supplier_id, start=None, end=None, archived=False, progress=None):
+    query, params = reports.statement_export_query(supplier_id, start, end, archived)
+    spec = {
+        "sheet": "Καρτέλα προμηθευτή",
+        "query": query,
+        "params": params,
+        "columns": STATEMENT_COLUMNS,
+    }
+    return write_workbook(path, [spec], progress)[spec["sheet"]]
+
+
+# ------------------------------------------------------------
+# ΠΙΝΑΚΕΣ ΑΝΑΦΟΡΩΝ (pyarrow)
+# ------------------------------------------------------------
+
+def table_columns(table):
+    # Στήλες εξαγωγής από τον τύπο και την ετικέτα (db.column_labels) κάθε στήλης
+    import pyarrow.types as pt
+
+    labels = db.column_labels(table)
+    columns = []
+    for field in table.schema:
+        if pt.is_integer(field.type):
+            kind = "int"
+        elif pt.is_floating(field.type):
+            kind = "euro" if field.name in db.CENT_COLUMNS else "number"
+        else:
+            kind = "text"
+        columns.append((field.name, labels.get(field.name, field.name), kind, 14 if kind != "text" else 30))
+    return tuple(columns)
+
+
+def export_table(path, sheet, table, progress=None):
+    spec = {"sheet": sheet, "rows": table.to_pylist(), "columns": table_columns(table)}
+    return write_workbook(path, [spec], progress)[sheet]
@@ -0,0 +1,379 @@
+from datetime import date, datetime, timedelta
+
+from ergon import db
+
+BATCH_SIZE = 5000
+HEADER_SCAN_ROWS = 10
+
+
+# ------------------------------------------------------------
+# ΜΕΤΑΤΡΟΠΕΣ ΤΙΜΩΝ ΚΕΛΙΩΝ
+# ------------------------------------------------------------
+
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y")
+EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def to_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def to_number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).replace("€", "").replace(" ", "").strip()
+    if not text:
+        return None
+    # Ελληνική μορφή 1.234,56
+    if "," in text:
+        text = text.replace(".", "").replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def to_integer(value):
+    number = to_number(value)
+    return int(number) if number is not None else None
+
+
+def to_money(value):
+    return db.to_cents(to_number(value))
+
+
+def to_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)):
+        return EXCEL_EPOCH + timedelta(days=int(value))
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def to_day_key(value):
+    return db.to_day_key(to_date(value))
+
+
+# ------------------------------------------------------------
+# ΑΝΤΙΣΤΟΙΧΙΣΗ ΦΥΛΛΩΝ -> ΠΙΝΑΚΩΝ
+# ------------------------------------------------------------
+
+# Κάθε στήλη: (στήλη πίνακα, μετατροπή, πιθανές επικεφαλίδες στο φύλλο).
+# Οι αναφορές (refs) λύνονται σε id μέσω των ήδη εισαγμένων πινάκων.
+# Η σειρά έχει σημασία: τα έργα χρειάζονται εργοδότες, τα παραστατικά
+# έργα και προμηθευτές.
+
+SHEETS = (
+    {
+        "sheet": "Εργοδότες",
+        "table": "clients",
+        "columns": (
+            ("company_name", to_text, ("Επωνυμία",)),
+            ("last_name", to_text, ("Επίθετο",)),
+            ("first_name", to_text, ("Όνομα",)),
+            ("entity_type", to_text, ("Σύσταση",)),
+            ("address", to_text, ("Διεύθυνση",)),
+            ("postal_code", to_text, ("ΤΚ", "Τ.Κ.")),
+            ("city", to_text, ("Πόλη",)),
+            ("phone_landline", to_text, ("Σταθερό", "Τηλ. σταθερό")),
+            ("phone_mobile", to_text, ("Κινητό",)),
+            ("email", to_text, ("Email", "e-mail")),
+            ("afm", to_text, ("ΑΦΜ", "Α.Φ.Μ.")),
+            ("dou", to_text, ("ΔΟΥ", "Δ.Ο.Υ.")),
+            ("taxis_username", to_text, ("TaxisNet Username", "Username", "Κωδικός Taxis")),
+            ("taxis_password", to_text, ("TaxisNet Password", "Password", "Συνθηματικό Taxis")),
+            ("job", to_text, ("Επάγγελμα",)),
+        ),
+        "refs": (),
+    },
+    {
+        "sheet": "Προμηθευτές",
+        "table": "suppliers",
+        "columns": (
+            ("company_name", to_text, ("Επωνυμία Εταιρίας", "Επωνυμία")),
+            ("last_name", to_text, ("Επίθετο",)),
+            ("first_name", to_text, ("Όνομα",)),
+            ("entity_type", to_text, ("Σύσταση",)),
+            ("job", to_text, ("Επάγγελμα",)),
+            ("iban1", to_text, ("ΙΒΑΝ 1", "IBAN 1", "IBAN")),
+            ("bank1", to_text, ("Τράπεζα 1", "Τράπεζα")),
+            ("iban2", to_text, ("ΙΒΑΝ 2", "IBAN 2")),
+            ("bank2", to_text, ("Τράπεζα 2",)),
+            ("iban3", to_text, ("ΙΒΑΝ 3", "IBAN 3")),
+            ("bank3", to_text, ("Τράπεζα 3",)),
+            ("iban4", to_text, ("ΙΒΑΝ 4", "IBAN 4")),
+            ("bank4", to_text, ("Τράπεζα 4",)),
+            ("address", to_text, ("Διεύθυνση",)),
+            ("postal_code", to_text, ("ΤΚ", "Τ.Κ.")),
+            ("city", to_text, ("Πόλη",)),
+            ("phone1", to_text, ("Τηλ. 1", "Τηλέφωνο 1", "Τηλέφωνο")),
+            ("phone2", to_text, ("Τηλ. 2", "Τηλέφωνο 2")),
+            ("email", to_text, ("Email", "e-mail")),
+            ("afm", to_text, ("ΑΦΜ", "Α.Φ.Μ.")),
+            ("dou", to_text, ("ΔΟΥ", "Δ.Ο.Υ.")),
+        ),
+        "refs": (),
+    },
+    {
+        "sheet": "Έργα",
+        "table": "projects",
+        "columns": (
+            ("code", to_text, ("Κωδικός Έργου", "Κωδικός")),
+            ("reg_date", to_day_key, ("Ημ/νια Εγγραφής", "Ημερομηνία Εγγραφής")),
+            ("protocol_no", to_text, ("αρ. πρωτ", "Αρ. Πρωτοκόλλου")),
+            ("employer_name", to_text, ("Εργοδότης",)),
+            ("hf_flag", to_text, ("ΗΦ-Φ",)),
+            ("project_type", to_text, ("Είδος Έργου",)),
+            ("priority", to_text, ("Προτεραιότητα",)),
+            ("status", to_text, ("Κατάσταση",)),
+            ("status2", to_text, ("Κατάσταση2", "Κατάσταση 2")),
+            ("description", to_text, ("Περιγραφή",)),
+            ("address", to_text, ("Διεύθυνση", "Διεύθυνση έργου")),
+            ("postal_code", to_text, ("ΤΚ", "Τ.Κ.")),
+            ("city", to_text, ("Πόλη",)),
+            ("agreed_amount", to_money, ("Συμφωνημένη Αξία",)),
+            ("invoice_expenses", to_money, ("Έξοδα παραστατικα", "Έξοδα παραστατικών")),
+            ("engineer", to_text, ("Μηχανικός",)),
+            ("apy", to_text, ("ΑΠΥ",)),
+            ("manager", to_text, ("Μάνος-Θανάσης",)),
+        ),
+        "refs": (
+            ("client_id", "clients", ("Εργοδότης",)),
+        ),
+    },
+    {
+        "sheet": "Παραστατικά",
+        "table": "documents",
+        "columns": (
+            ("seq_no", to_integer, ("α/α", "Α/Α")),
+            ("doc_date", to_day_key, ("Ημ/νία Παρ/τικού", "Ημερομηνία")),
+            ("billing_type", to_text, ("Τιμολόγηση",)),
+            ("work_title", to_text, ("Εργασία",)),
+            ("description", to_text, ("Περιγραφή",)),
+            ("charge", to_money, ("Χρέωση",)),
+            ("vat", to_money, ("ΦΠΑ", "Φ.Π.Α.")),
+            ("credit", to_money, ("Πίστωση",)),
+            ("payment_method", to_text, ("Τρόπος Πληρωμής",)),
+            ("payments", to_money, ("Καταβολές",)),
+            ("payment_target", to_text, ("Που καταβληθηκαν", "Πού καταβλήθηκαν")),
+            ("day", to_integer, ("ΗΜΕΡΑ",)),
+            ("month", to_integer, ("ΜΗΝΑ", "ΜΗΝΑΣ")),
+            ("year", to_integer, ("ΕΤΟΣ",)),
+        ),
+        # Διαβάζονται μόνο για να συμπληρωθεί η ημερομηνία όπου λείπει
+        "transient": ("day", "month", "year"),
+        "refs": (
+            ("project_id", "projects", ("Έργα", "Έργο", "Κωδ. έργου")),
+            ("supplier_id", "suppliers", ("Προμηθευτής - Συνεργείο", "Προμηθευτής")),
+        ),
+    },
+    {
+        "sheet": "Ημερολόγιο",
+        "table": "worklog",
+        "columns": (
+            ("log_date", to_day_key, ("Ημερομηνία",)),
+            ("employee", to_text, ("Υπάλληλος",)),
+            ("work_desc", to_text, ("Εργασία",)),
+            ("hours", to_number, ("Ώρες",)),
+        ),
+        "refs": (
+            ("project_id", "projects", ("Έργο", "Έργα", "Κωδ. έργου")),
+        ),
+    },
+    {
+        "sheet": "Ταμείο",
+        "table": "fee_templates",
+        "columns": (
+            ("work_type", to_text, ("Είδος Έργου",)),
+            ("amount", to_money, ("Ποσό", "Ποσό (€)")),
+        ),
+        "refs": (),
+    },
+)
+
+
+def fill_document_date(record):
+    # Φύλλα χωρίς ημερομηνία αλλά με ΗΜΕΡΑ/ΜΗΝΑ/ΕΤΟΣ
+    if record.get("doc_date") is None:
+        try:
+            record["doc_date"] = db.to_day_key(date(record["year"], record["month"], record["day"]))
+        except (KeyError, TypeError, ValueError):
+            pass
+    return record
+
+
+ROW_HOOKS = {
+    "documents": fill_document_date,
+}
+
+
+# ------------------------------------------------------------
+# ΕΠΙΛΥΣΗ ΑΝΑΦΟΡΩΝ (κείμενο -> id)
+# ------------------------------------------------------------
+
+def load_resolver(kind):
+    lookup = {}
+    if kind == "clients":
+        rows = db.fetch_all("SELECT id, company_name, last_name, first_name FROM clients", cache=False)
+        for r in rows:
+            for label in (r["company_name"], f"{r['last_name'] or ''} {r['first_name'] or ''}"):
+                key = db.fold_text(label)
+                if key:
+                    lookup.setdefault(key, r["id"])
+    elif kind == "projects":
+        rows = db.fetch_all("SELECT id, code, employer_name FROM projects", cache=False)
+        for r in rows:
+            # Δεκτό είτε σκέτος κωδικός είτε "κωδικός : εργοδότης"
+            for label in (r["code"], f"{r['code'] or ''} : {r['employer_name'] or ''}"):
+                key = db.fold_text(label)
+                if key:
+                    lookup.setdefault(key, r["id"])
+    elif kind == "suppliers":
+        rows = db.fetch_all("SELECT id, company_name, last_name, first_name FROM suppliers", cache=False)
+        for r in rows:
+            for label in (r["company_name"], f"{r['last_name'] or ''} {r['first_name'] or ''}"):
+                key = db.fold_text(label)
+                if key:
+                    lookup.setdefault(key, r["id"])
+    else:
+        raise ValueError(f"Άγνωστος τύπος αναφοράς: {kind}")
+    return lookup
+
+
+# ------------------------------------------------------------
+# ΕΙΣΑΓΩΓΗ
+# ------------------------------------------------------------
+
+def match_header(cells, spec):
+    positions = {}
+    folded = [db.fold_text(c) for c in cells]
+    for column, _, aliases in spec["columns"]:
+        for alias in aliases:
+            key = db.fold_text(alias)
+            if key in folded:
+                positions[column] = folded.index(key)
+                break
+    refs = {}
+    for column, _, aliases in spec["refs"]:
+        for alias in aliases:
+            key = db.fold_text(alias)
+            if key in folded:
+                refs[column] = folded.index(key)
+                break
+    return positions, refs
+
+
+def iter_records(rows, spec):
+    # Βρίσκει τη γραμμή επικεφαλίδων στις πρώτες γραμμές και μετά
+    # επιστρέφει μία εγγραφή (dict) ανά γραμμή, χωρίς να κρατά το φύλλο.
+    positions, refs = {}, {}
+    for _, cells in zip(range(HEADER_SCAN_ROWS), rows):
+        positions, refs = match_header(cells or (), spec)
+        if len(positions) + len(refs) >= 2:
+            break
+    else:
+        return
+
+    converters = {column: convert for column, convert, _ in spec["columns"]}
+    for cells in rows:
+        if not cells or all(v is None for v in cells):
+            continue
+        record = {}
+        for column, idx in positions.items():
+            record[column] = converters[column](cells[idx]) if idx < len(cells) else None
+        ref_labels = {}
+        for column, idx in refs.items():
+            ref_labels[column] = to_text(cells[idx]) if idx < len(cells) else None
+        if all(v is None for v in record.values()) and not any(ref_labels.values()):
+            continue
+        yield record, ref_labels
+
+
+def import_sheet(rows, spec, batch_size=BATCH_SIZE, progress=None):
+    table = spec["table"]
+    transient = spec.get("transient", ())
+    columns = [c for c, _, _ in spec["columns"] if c not in transient] + [c for c, _, _ in spec["refs"]]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({','.join('?' * len(columns))})"
+    resolvers = {column: load_resolver(kind) for column, kind, _ in spec["refs"]}
+    hook = ROW_HOOKS.get(table)
+
+    inserted = 0
+    unresolved = 0
+    batch = []
+
+    def flush():
+        nonlocal inserted
+        if not batch:
+            return
+        # Μία εργασία εγγραφής ανά batch ώστε να μην κρατάμε τον writer
+        # για ολόκληρο το αρχείο.
+        db.executemany(sql, batch)
+        inserted += len(batch)
+        batch.clear()
+        if progress:
+            progress(spec["sheet"], inserted)
+
+    # Οι ίδιες ετικέτες επαναλαμβάνονται χιλιάδες φορές σε ένα φύλλο
+    resolved = {column: {} for column in resolvers}
+
+    for record, ref_labels in iter_records(rows, spec):
+        for column, label in ref_labels.items():
+            if not label:
+                record[column] = None
+                continue
+            seen = resolved[column]
+            if label not in seen:
+                seen[label] = resolvers[column].get(db.fold_text(label))
+            ref_id = seen[label]
+            if ref_id is None:
+                unresolved += 1
+            record[column] = ref_id
+        if hook:
+            record = hook(record)
+        batch.append(tuple(record.get(c) for c in columns))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    return {"rows": inserted, "unresolved": unresolved}
+
+
+def import_workbook(source, sheets=None, batch_size=BATCH_SIZE, progress=None):
+    # source: διαδρομή αρχείου ή file-like (π.χ. από st.file_uploader).
+    # Το read_only του openpyxl διαβάζει τις γραμμές σειριακά από το zip.
+    from openpyxl import load_workbook
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        by_name = {db.fold_text(name): name for name in wb.sheetnames}
+        wanted = {db.fold_text(s) for s in sheets} if sheets else None
+        report = {}
+        for spec in SHEETS:
+            key = db.fold_text(spec["sheet"])
+            if wanted is not None and key not in wanted:
+                continue
+            name = by_name.get(key)
+            if name is None:
+                continue
+            rows = wb[name].iter_rows(values_only=True)
+            report[spec["sheet"]] = import_sheet(rows, spec, batch_size, progress)
+        return report
+    finally:
+        wb.close()
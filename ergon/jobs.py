@@ -0,0 +1,431 @@
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+from ergon import db
+
+# Διεργασίες του pool· κάθε μία έχει δικές της συνδέσεις και δικό της
+# thread εγγραφής (db.get_manager), οπότε οι εργασίες δεν μοιράζονται GIL
+# ούτε ουρά εγγραφής με τις σελίδες.
+JOB_WORKERS = 2
+# Ανά πόσα δευτερόλεπτα μια εργασία γράφει πρόοδο / ελέγχει για ακύρωση
+PROGRESS_INTERVAL = 0.5
+# Εργασίες (και αρχεία αποτελεσμάτων) παλαιότερες από αυτό σβήνονται
+JOB_RETENTION_DAYS = 7
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Με κοινή βάση PostgreSQL κάθε server εκτελεί και ανακτά μόνο τις δικές
+# του εργασίες· τα αρχεία αποτελεσμάτων μένουν στον δίσκο του.
+NODE = socket.gethostname()
+
+
+def _process_start(pid):
+    # Πότε ξεκίνησε η διεργασία (Linux: /proc/<pid>/stat, πεδίο starttime),
+    # ώστε ένα pid που ξαναδόθηκε σε άλλη διεργασία να μη μετράει ως ζωντανό.
+    # None αν η διεργασία δεν υπάρχει· "" αν δεν υπάρχει /proc.
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[19]
+    except FileNotFoundError:
+        if os.path.isdir("/proc"):
+            return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    return ""
+
+
+# Η διεργασία των σελίδων που υποβάλλει τις εργασίες (pid:starttime)
+OWNER = f"{os.getpid()}:{_process_start(os.getpid())}"
+
+
+def _owner_alive(owner):
+    if not owner:
+        return False
+    pid, _, start = owner.partition(":")
+    return _process_start(int(pid)) == start
+
+STATUS_LABELS = {
+    "queued": "Σε αναμονή",
+    "running": "Εκτελείται",
+    "done": "Ολοκληρώθηκε",
+    "failed": "Απέτυχε",
+    "cancelled": "Ακυρώθηκε",
+}
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# ------------------------------------------------------------
+# ΕΙΔΗ ΕΡΓΑΣΙΩΝ
+# ------------------------------------------------------------
+
+# Κάθε εργασία: run(params, path, progress) -> μήνυμα ολοκλήρωσης. Τρέχει
+# σε άλλη διεργασία, οπότε οι παράμετροι είναι JSON (ημερομηνίες ως
+# ΕΕΕΕ-ΜΜ-ΗΗ) και τα modules φορτώνονται μέσα στη συνάρτηση. Το path είναι
+# το αρχείο αποτελέσματος (None αν η εργασία δεν βγάζει αρχείο) και το
+# progress δέχεται (φύλλο, γραμμές) όπως στο exporter / importer.
+
+def _day(value):
+    return date.fromisoformat(value) if value else None
+
+
+def _run_export_workbook(params, path, progress):
+    from ergon import exporter
+
+    sheets = params.get("sheets") or [spec["sheet"] for spec in exporter.EXPORTS]
+    progress.steps = len(sheets)
+    counts = exporter.export_workbook(path, sheets=sheets, progress=progress)
+    return ", ".join(f"{sheet}: {n}" for sheet, n in counts.items())
+
+
+def _run_import_workbook(params, path, progress):
+    from ergon import importer
+
+    source = params["path"]
+    try:
+        report = importer.import_workbook(source, progress=progress)
+    finally:
+        os.remove(source)
+    if not report:
+        return "Δεν βρέθηκε κανένα γνωστό φύλλο στο αρχείο."
+    parts = []
+    for sheet, result in report.items():
+        part = f"{sheet}: {result['rows']} εγγραφές"
+        if result["unresolved"]:
+            part += f" ({result['unresolved']} αναφορές χωρίς αντιστοίχιση)"
+        parts.append(part)
+    return ", ".join(parts)
+
+
+def _run_export_statement(params, path, progress):
+    from ergon import exporter
+
+    progress.steps = 1
+    rows = exporter.export_statement(
+        path, params["supplier_id"], _day(params.get("start")), _day(params.get("end")),
+        params.get("archived", False), progress
+    )
+    return f"{rows} παραστατικά"
+
+
+def _run_period_report(params, path, progress):
+    from ergon import exporter, reports
+
+    progress.steps = 2
+    progress("Υπολογισμός", 0)
+    table = reports.period_report(
+        _day(params["start"]), _day(params["end"]), params.get("period", "month"),
+        params.get("group"), archived=params.get("archived", False)
+    )
+    rows = exporter.export_table(path, "Περιοδική ανάλυση", table, progress)
+    return f"{rows} γραμμές"
+
+
+IMPORT_TABLES = ("clients", "suppliers", "projects", "documents", "worklog", "fee_templates")
+
+# label: για τις λίστες, suffix / mime / file_name: αρχείο αποτελέσματος,
+# writes: πίνακες που αλλάζει η εργασία (ακύρωση cache όταν τελειώσει)
+JOB_KINDS = {
+    "export_workbook": {
+        "label": "Εξαγωγή σε Excel",
+        "run": _run_export_workbook,
+        "suffix": ".xlsx",
+        "mime": XLSX_MIME,
+        "file_name": "erp_ergon_{date}.xlsx",
+        "writes": (),
+    },
+    "import_workbook": {
+        "label": "Εισαγωγή από Excel",
+        "run": _run_import_workbook,
+        "suffix": None,
+        "writes": IMPORT_TABLES,
+    },
+    "export_statement": {
+        "label": "Καρτέλα προμηθευτή",
+        "run": _run_export_statement,
+        "suffix": ".xlsx",
+        "mime": XLSX_MIME,
+        "file_name": "kartela_{supplier_id}_{date}.xlsx",
+        "writes": (),
+    },
+    "period_report": {
+        "label": "Περιοδική ανάλυση",
+        "run": _run_period_report,
+        "suffix": ".xlsx",
+        "mime": XLSX_MIME,
+        "file_name": "periodiki_{start}_{end}.xlsx",
+        # refresh_rollups κλείνει μήνες που έμειναν stale
+        "writes": ("document_months", "stale_months"),
+    },
+}
+
+
+# ------------------------------------------------------------
+# ΕΚΤΕΛΕΣΗ (διεργασίες του pool)
+# ------------------------------------------------------------
+
+class Progress:
+    # Καλείται ως progress(φύλλο, γραμμές). Γράφει το πολύ μία φορά ανά
+    # PROGRESS_INTERVAL και, στην ίδια εγγραφή, διαβάζει αν ζητήθηκε
+    # ακύρωση· τότε η εργασία σταματά με JobCancelled.
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.steps = None
+        self.done = 0
+        self._sheet = None
+        self._last = 0.0
+
+    def __call__(self, sheet, rows):
+        if sheet != self._sheet:
+            if self._sheet is not None:
+                self.done += 1
+            self._sheet = sheet
+        now = time.monotonic()
+        if now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+        fraction = min(self.done / self.steps, 0.99) if self.steps else None
+        message = f"{sheet}: {rows} γραμμές…"
+
+        def update(conn):
+            rows = conn.execute(
+                "UPDATE jobs SET progress = ?, message = ? WHERE id = ? RETURNING cancel_requested",
+                (fraction, message, self.job_id)
+            ).fetchall()
+            return not rows or rows[0][0]
+
+        if db.write(update, "jobs", replayable=True):
+            raise JobCancelled()
+
+
+def _init_worker(db_path):
+    db.DB_PATH = db_path
+
+
+def _finish(job_id, status, message=None, error=None, result_path=None):
+    db.execute("""
+        UPDATE jobs
+        SET status = ?, message = IFNULL(?, message), error = ?, result_path = ?,
+            progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END, finished_at = ?
+        WHERE id = ?
+    """, (status, message, error, result_path, status, time.time(), job_id))
+
+
+def run_job(job_id):
+    # Στη διεργασία του pool. Οι σελίδες γράφουν στη βάση από άλλη
+    # διεργασία, οπότε το cache αυτής της διεργασίας δεν ισχύει πια.
+    db.query_cache.clear()
+
+    def start(conn):
+        return conn.execute("""
+            UPDATE jobs SET status = 'running', started_at = ?, pid = ?
+            WHERE id = ? AND status = 'queued' AND cancel_requested = 0
+            RETURNING kind, params
+        """, (time.time(), os.getpid(), job_id)).fetchall()
+
+    rows = db.write(start, "jobs", replayable=True)
+    if not rows:
+        return None
+    kind, params = rows[0][0], json.loads(rows[0][1])
+    spec = JOB_KINDS[kind]
+    path = result_path(job_id, spec) if spec["suffix"] else None
+    try:
+        message = spec["run"](params, path, Progress(job_id))
+    except JobCancelled:
+        _remove(path)
+        _finish(job_id, "cancelled", "Ακυρώθηκε από τον χρήστη.")
+    except Exception as exc:
+        logging.getLogger("erp_ergon.jobs").exception("job %s (%s) failed", job_id, kind)
+        _remove(path)
+        _finish(job_id, "failed", error=f"{type(exc).__name__}: {exc}")
+    else:
+        _finish(job_id, "done", message, result_path=path)
+    return kind
+
+
+# ------------------------------------------------------------
+# POOL (διεργασία των σελίδων)
+# ------------------------------------------------------------
+
+# Το pool ξεκινά με την πρώτη εργασία. spawn, όχι fork: η διεργασία των
+# σελίδων έχει threads (Streamlit, thread εγγραφής) και ανοιχτές συνδέσεις
+# SQLite, που δεν επιβιώνουν σωστά από fork. Οι διεργασίες εκτελούν το
+# run_job αυτού του module· το spawn φορτώνει και το __main__ (στο
+# Streamlit το app.py) ως __mp_main__, και το app.py τότε δεν ξεκινά.
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def jobs_dir():
+    path = f"{db.local_root()}_jobs"
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def result_path(job_id, spec):
+    return os.path.join(jobs_dir(), f"job_{job_id}{spec['suffix']}")
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def _recover():
+    # Εργασίες που έμειναν ανοιχτές από προηγούμενη εκκίνηση δεν θα
+    # τελειώσουν ποτέ· τις κλείνουμε και καθαρίζουμε τις παλιές. Στον
+    # ίδιο server μπορεί να τρέχουν κι άλλες διεργασίες της εφαρμογής
+    # (π.χ. δεύτερο streamlit σε άλλη θύρα), οπότε κλείνουν μόνο όσες η
+    # διεργασία τους δεν ζει πια.
+    rows = db.fetch_all("""
+        SELECT id, owner FROM jobs
+        WHERE status IN ('queued', 'running') AND (node = ? OR node IS NULL)
+    """, (NODE,), cache=False)
+    dead = [(time.time(), job_id) for job_id, owner in rows if not _owner_alive(owner)]
+    if dead:
+        db.executemany("""
+            UPDATE jobs SET status = 'failed', error = 'Διακόπηκε με την επανεκκίνηση της εφαρμογής.',
+                            finished_at = ?
+            WHERE id = ? AND status IN ('queued', 'running')
+        """, dead)
+    purge()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _recover()
+                executor = ProcessPoolExecutor(
+                    JOB_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(db.database_location(),),
+                )
+                atexit.register(executor.shutdown, wait=False, cancel_futures=True)
+                _executor = executor
+    return _executor
+
+
+def _done(job_id, kind, future):
+    # Στη διεργασία των σελίδων, μόλις τελειώσει η εργασία: οι πίνακες που
+    # άλλαξε η άλλη διεργασία ακυρώνονται στο cache αυτής.
+    global _executor
+    db.invalidate("jobs", *JOB_KINDS[kind]["writes"])
+    exc = future.exception() if not future.cancelled() else None
+    if exc is None:
+        return
+    if isinstance(exc, BrokenProcessPool):
+        # Μια διεργασία πέθανε (π.χ. έλλειψη μνήμης): νέο pool στην επόμενη εργασία
+        with _executor_lock:
+            _executor = None
+    db.execute("""
+        UPDATE jobs SET status = 'failed', error = ?, finished_at = ?
+        WHERE id = ? AND status IN ('queued', 'running')
+    """, (f"{type(exc).__name__}: {exc}", time.time(), job_id))
+
+
+def submit(kind, params=None):
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Άγνωστο είδος εργασίας: {kind}")
+    executor = get_executor()
+    job_id = db.execute(
+        "INSERT INTO jobs (kind, params, created_at, node, owner) VALUES (?, ?, ?, ?, ?)",
+        (kind, json.dumps(params or {}, default=str), time.time(), NODE, OWNER)
+    )
+    future = executor.submit(run_job, job_id)
+    future.add_done_callback(lambda f: _done(job_id, kind, f))
+    return job_id
+
+
+def save_upload(data, suffix=".xlsx"):
+    # Τα αρχεία που ανεβαίνουν περνούν στη διεργασία ως διαδρομή
+    path = os.path.join(jobs_dir(), f"upload_{uuid.uuid4().hex}{suffix}")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def cancel(job_id):
+    # Μια εργασία σε αναμονή δεν ξεκινά ποτέ· μια που τρέχει σταματά στον
+    # επόμενο έλεγχο προόδου. Μια εισαγωγή κρατά ό,τι έχει ήδη γράψει.
+    db.execute("""
+        UPDATE jobs
+        SET cancel_requested = 1,
+            status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+            finished_at = CASE WHEN status = 'queued' THEN ? ELSE finished_at END
+        WHERE id = ? AND status IN ('queued', 'running')
+    """, (time.time(), job_id))
+
+
+def purge(days=JOB_RETENTION_DAYS):
+    cutoff = time.time() - days * 86400
+    old = db.fetch_all("""
+        SELECT id, result_path, params, kind FROM jobs
+        WHERE status NOT IN ('queued', 'running') AND created_at < ?
+    """, (cutoff,), cache=False)
+    for row in old:
+        _remove(row["result_path"])
+        if row["kind"] == "import_workbook":
+            _remove(json.loads(row["params"]).get("path"))
+    if old:
+        db.executemany("DELETE FROM jobs WHERE id = ?", [(row["id"],) for row in old])
+    return len(old)
+
+
+# ------------------------------------------------------------
+# ΑΝΑΓΝΩΣΗ
+# ------------------------------------------------------------
+
+# Η κατάσταση αλλάζει από άλλες διεργασίες, οπότε πάντα χωρίς cache
+
+def get(job_id):
+    rows = db.fetch_all("SELECT * FROM jobs WHERE id = ?", (job_id,), cache=False)
+    return dict(rows[0]) if rows else None
+
+
+def recent(kinds=None, limit=10):
+    where = f"WHERE kind IN ({', '.join('?' * len(kinds))})" if kinds else ""
+    rows = db.fetch_all(
+        f"SELECT * FROM jobs {where} ORDER BY id DESC LIMIT ?",
+        tuple(kinds or ()) + (limit,), cache=False
+    )
+    return [dict(r) for r in rows]
+
+
+def result_file(job):
+    # (όνομα αρχείου, read) ή None. Το read() διαβάζει το αρχείο μόνο όταν
+    # ζητηθεί η λήψη (st.download_button με callable), όχι σε κάθε rerun.
+    path = job["result_path"]
+    if job["status"] != "done" or not path or not os.path.exists(path):
+        return None
+    params = json.loads(job["params"])
+    name = JOB_KINDS[job["kind"]]["file_name"].format(
+        date=date.fromtimestamp(job["created_at"]).isoformat(), **params
+    )
+
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+    return name, read
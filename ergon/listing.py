@@ -0,0 +1,322 @@
+import streamlit as st
+
+from ergon.db import column_labels, fetch_all, fetch_columns, to_day_key
+from ergon.pickers import entity_picker
+from ergon.profiler import section
+
+PAGE_SIZE = 100
+
+
+# ------------------------------------------------------------
+# ΟΡΙΣΜΟΙ ΛΙΣΤΩΝ
+# ------------------------------------------------------------
+
+# Σελιδοποίηση keyset: η επόμενη σελίδα ζητείται ως "(κλειδί, id) μετά
+# την τελευταία γραμμή", όχι με OFFSET, οπότε κάθε σελίδα κοστίζει το ίδιο
+# μέσω του index (κλειδί, id). Τα κλειδιά ταξινόμησης είναι εκφράσεις
+# χωρίς NULL ώστε η σύγκριση row values να καλύπτει όλες τις γραμμές.
+#
+# Φίλτρα: (όνομα, τύπος, έκφραση SQL, ετικέτα). Τύποι:
+#   date_range – από/έως ημερομηνία (στην έκφραση του κλειδιού ταξινόμησης)
+#   select     – id οντότητας από typeahead (FILTER_ENTITIES)
+#   distinct   – τιμή από τις διακριτές τιμές της έκφρασης
+
+LISTS = {
+    "clients": {
+        "from": "clients c",
+        "columns": """
+            c.id, c.company_name, c.last_name, c.first_name,
+            c.city, c.phone_mobile, c.afm, c.dou
+        """,
+        "sort": ("IFNULL(c.company_name,'')", "IFNULL(c.last_name,'')", "IFNULL(c.first_name,'')"),
+        "id": "c.id",
+        "descending": False,
+        "filters": (
+            ("city", "distinct", "c.city", "Πόλη"),
+        ),
+        "labels": {
+            "company_name": "Επωνυμία",
+            "last_name": "Επίθετο",
+            "first_name": "Όνομα",
+            "city": "Πόλη",
+            "phone_mobile": "Κινητό",
+            "afm": "ΑΦΜ",
+            "dou": "ΔΟΥ"
+        },
+        "empty": "Δεν υπάρχουν εργοδότες.",
+    },
+    "suppliers": {
+        "from": "suppliers s",
+        "columns": "s.id, s.company_name, s.job, s.city, s.phone1, s.afm, s.dou",
+        "sort": ("IFNULL(s.company_name,'')",),
+        "id": "s.id",
+        "descending": False,
+        "filters": (
+            ("city", "distinct", "s.city", "Πόλη"),
+        ),
+        "labels": {
+            "company_name": "Επωνυμία",
+            "job": "Επάγγελμα",
+            "city": "Πόλη",
+            "phone1": "Τηλ. 1",
+            "afm": "ΑΦΜ",
+            "dou": "ΔΟΥ"
+        },
+        "empty": "Δεν υπάρχουν προμηθευτές.",
+    },
+    "projects": {
+        "from": "projects p",
+        "columns": """
+            p.id, p.code, p.reg_date, p.employer_name,
+            p.project_type, p.status, p.city, p.agreed_amount
+        """,
+        "sort": ("IFNULL(p.reg_date,0)",),
+        "id": "p.id",
+        "descending": True,
+        "filters": (
+            ("reg_date", "date_range", "IFNULL(p.reg_date,0)", "Ημ/νια εγγραφής"),
+            ("status", "distinct", "p.status", "Κατάσταση"),
+            ("city", "distinct", "p.city", "Πόλη"),
+        ),
+        "labels": {
+            "code": "Κωδικός",
+            "reg_date": "Ημ/νια εγγραφής",
+            "employer_name": "Εργοδότης",
+            "project_type": "Είδος Έργου",
+            "status": "Κατάσταση",
+            "city": "Πόλη",
+            "agreed_amount": "Συμφωνημένη Αξία (€)"
+        },
+        "empty": "Δεν υπάρχουν έργα.",
+    },
+    "documents": {
+        "from": """
+            documents d
+            LEFT JOIN projects p ON d.project_id = p.id
+            LEFT JOIN suppliers s ON d.supplier_id = s.id
+        """,
+        # Τα φίλτρα αφορούν μόνο στήλες του documents, οπότε η καταμέτρηση
+        # γίνεται χωρίς τα JOIN.
+        "count_from": "documents d",
+        "columns": """
+            d.id, d.seq_no, d.doc_date,
+            p.code AS project_code,
+            p.employer_name,
+            s.company_name AS supplier_name,
+            d.work_title, d.charge, d.vat, d.credit
+        """,
+        "sort": ("IFNULL(d.doc_date,0)",),
+        "id": "d.id",
+        "descending": True,
+        "filters": (
+            ("doc_date", "date_range", "IFNULL(d.doc_date,0)", "Ημ/νία"),
+            ("project", "select", "d.project_id", "Έργο"),
+            ("supplier", "select", "d.supplier_id", "Προμηθευτής"),
+        ),
+        "labels": {
+            "seq_no": "α/α",
+            "doc_date": "Ημ/νία",
+            "project_code": "Κωδ. έργου",
+            "employer_name": "Εργοδότης",
+            "supplier_name": "Προμηθευτής",
+            "work_title": "Εργασία",
+            "charge": "Χρέωση (€)",
+            "vat": "ΦΠΑ (€)",
+            "credit": "Πίστωση (€)"
+        },
+        "empty": "Δεν υπάρχουν παραστατικά.",
+    },
+    "worklog": {
+        "from": "worklog w LEFT JOIN projects p ON w.project_id = p.id",
+        "count_from": "worklog w",
+        "columns": """
+            w.id, w.log_date, w.employee, p.code AS project_code,
+            p.employer_name, w.work_desc, w.hours
+        """,
+        "sort": ("IFNULL(w.log_date,0)",),
+        "id": "w.id",
+        "descending": True,
+        "filters": (
+            ("log_date", "date_range", "IFNULL(w.log_date,0)", "Ημερομηνία"),
+            ("project", "select", "w.project_id", "Έργο"),
+            ("employee", "distinct", "w.employee", "Υπάλληλος"),
+        ),
+        "labels": {
+            "log_date": "Ημερομηνία",
+            "employee": "Υπάλληλος",
+            "project_code": "Κωδ. έργου",
+            "employer_name": "Εργοδότης",
+            "work_desc": "Εργασία",
+            "hours": "Ώρες"
+        },
+        "empty": "Δεν υπάρχουν εγγραφές ημερολογίου.",
+    },
+}
+
+# Φίλτρα "select": επιλογή οντότητας μέσω typeahead (pickers.py)
+FILTER_ENTITIES = {
+    "project": "projects",
+    "supplier": "suppliers",
+}
+
+
+# ------------------------------------------------------------
+# ΚΑΤΑΣΚΕΥΗ ΕΡΩΤΗΜΑΤΩΝ
+# ------------------------------------------------------------
+
+def sort_terms(spec):
+    return list(spec["sort"]) + [spec["id"]]
+
+
+def build_where(spec, filters):
+    clauses = []
+    params = []
+    for name, kind, expr, _ in spec["filters"]:
+        value = filters.get(name)
+        if value is None:
+            continue
+        if kind == "date_range":
+            # Ίδια έκφραση με το κλειδί ταξινόμησης, ώστε το εύρος να γίνεται
+            # αναζήτηση στο index· οι γραμμές χωρίς ημερομηνία (0) μένουν εκτός.
+            start, end = value
+            clauses.append(f"{expr} BETWEEN ? AND ?")
+            params.append(to_day_key(start) if start else 10000101)
+            params.append(to_day_key(end) if end else 99991231)
+        else:
+            clauses.append(f"{expr} = ?")
+            params.append(value)
+    return clauses, params
+
+
+def fetch_page(spec, filters, after=None, page_size=PAGE_SIZE):
+    # Επιστρέφει (pyarrow.Table με τις ετικέτες της λίστας, κλειδί της
+    # τελευταίας γραμμής, υπάρχει επόμενη σελίδα)
+    terms = sort_terms(spec)
+    direction = "DESC" if spec["descending"] else "ASC"
+    clauses, params = build_where(spec, filters)
+    if after is not None:
+        # Το SQLite δεν κάνει αναζήτηση στο index με σύγκριση γραμμών
+        # (a, b) < (?, ?)· το όριο στην πρώτη στήλη την κάνει seek, ώστε κάθε
+        # σελίδα να κοστίζει όσο η πρώτη.
+        op = "<" if spec["descending"] else ">"
+        clauses.append(f"{terms[0]} {op}= ?")
+        params.append(after[0])
+        clauses.append(f"({', '.join(terms)}) {op} ({', '.join('?' * len(terms))})")
+        params.extend(after)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    keys = ", ".join(f"{t} AS _k{i}" for i, t in enumerate(terms))
+    order = ", ".join(f"{t} {direction}" for t in terms)
+    table = fetch_columns(f"""
+        SELECT {spec["columns"]}, {keys}
+        FROM {spec["from"]}
+        {where}
+        ORDER BY {order}
+        LIMIT ?
+    """, tuple(params) + (page_size + 1,), labels=spec["labels"])
+
+    has_next = table.num_rows > page_size
+    table = table.slice(0, page_size)
+    key_columns = [f"_k{i}" for i in range(len(terms))]
+    last_key = None
+    if table.num_rows:
+        last_key = tuple(table.column(k)[-1].as_py() for k in key_columns)
+    return table.drop_columns(key_columns), last_key, has_next
+
+
+def count_rows(spec, filters):
+    clauses, params = build_where(spec, filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return fetch_all(
+        f"SELECT COUNT(*) FROM {spec.get('count_from', spec['from'])} {where}",
+        tuple(params)
+    )[0][0]
+
+
+# ------------------------------------------------------------
+# ΦΙΛΤΡΑ / ΣΕΛΙΔΟΠΟΙΗΣΗ (UI)
+# ------------------------------------------------------------
+
+def render_filters(list_key, spec):
+    filters = {}
+    if not spec["filters"]:
+        return filters
+    with st.expander("Φίλτρα"):
+        simple = [f for f in spec["filters"] if f[1] != "select"]
+        cols = st.columns(len(simple)) if simple else []
+        for col, (name, kind, expr, label) in zip(cols, simple):
+            widget_key = f"{list_key}_filter_{name}"
+            with col:
+                if kind == "date_range":
+                    value = st.date_input(label, value=(), key=widget_key, format="DD/MM/YYYY")
+                    if value:
+                        start = value[0]
+                        end = value[1] if len(value) > 1 else None
+                        filters[name] = (start, end)
+                else:
+                    table = spec.get("count_from", spec["from"])
+                    values = fetch_all(f"""
+                        SELECT DISTINCT {expr} AS v FROM {table}
+                        WHERE {expr} IS NOT NULL AND {expr} <> ''
+                        ORDER BY v
+                    """)
+                    choice = st.selectbox(
+                        label, [None] + [r["v"] for r in values],
+                        format_func=lambda v: "— Όλα —" if v is None else v,
+                        key=widget_key
+                    )
+                    if choice is not None:
+                        filters[name] = choice
+
+        for name, kind, expr, label in spec["filters"]:
+            if kind != "select":
+                continue
+            choice = entity_picker(
+                label, FILTER_ENTITIES[name], f"{list_key}_filter_{name}", "— Όλα —"
+            )
+            if choice is not None:
+                filters[name] = choice
+    return filters
+
+
+def render_list(list_key, page_size=PAGE_SIZE):
+    spec = LISTS[list_key]
+    with section("filters"):
+        filters = render_filters(list_key, spec)
+
+    # Στοίβα με το κλειδί έναρξης κάθε σελίδας· μηδενίζεται όταν
+    # αλλάξουν τα φίλτρα.
+    state_key = f"{list_key}_pages"
+    signature = repr(sorted(filters.items()))
+    state = st.session_state.get(state_key)
+    if state is None or state["filters"] != signature:
+        state = {"filters": signature, "stack": [None]}
+        st.session_state[state_key] = state
+
+    with section("query"):
+        rows, last_key, has_next = fetch_page(spec, filters, state["stack"][-1], page_size)
+        total = count_rows(spec, filters)
+
+    if not rows.num_rows:
+        st.info(spec["empty"])
+        return
+
+    with section("st.dataframe"):
+        st.dataframe(rows, column_config=column_labels(rows), use_container_width=True, hide_index=True)
+
+    def go_next():
+        state["stack"].append(last_key)
+
+    def go_prev():
+        if len(state["stack"]) > 1:
+            state["stack"].pop()
+
+    page_no = len(state["stack"])
+    first = (page_no - 1) * page_size + 1
+    col1, col2, col3 = st.columns([1, 4, 1])
+    with col1:
+        st.button("◀ Προηγούμενη", key=f"{list_key}_prev", on_click=go_prev, disabled=page_no == 1)
+    with col2:
+        st.caption(f"Σελίδα {page_no} · εγγραφές {first}–{first + rows.num_rows - 1} από {total}")
+    with col3:
+        st.button("Επόμενη ▶", key=f"{list_key}_next", on_click=go_next, disabled=not has_next)
@@ -0,0 +1,83 @@
+import importlib
+import os
+
+import streamlit as st
+
+from ergon import db
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΕΣ
+# ------------------------------------------------------------
+
+# Μόνο η επιλεγμένη σελίδα εκτελείται σε κάθε rerun (τα st.tabs εκτελούν
+# όλες τις σελίδες, ακόμη και τις κρυφές), και το module της φορτώνεται
+# μόνο όταν ανοίξει πρώτη φορά: η εκκίνηση δεν πληρώνει pandas, εξαγωγές
+# κ.λπ. για σελίδες που δεν έχουν ζητηθεί.
+#
+# (ετικέτα, module, συνάρτηση)
+PAGES = {
+    "clients": ("Εργοδότες", "ergon.pages.masters", "page_clients"),
+    "suppliers": ("Προμηθευτές", "ergon.pages.masters", "page_suppliers"),
+    "projects": ("Έργα", "ergon.pages.masters", "page_projects"),
+    "documents": ("Παραστατικά", "ergon.pages.documents", "page_documents"),
+    "worklog": ("Ημερολόγιο", "ergon.pages.documents", "page_worklog"),
+    "fees": ("Ταμείο", "ergon.pages.fees", "page_fee_templates"),
+    "reports": ("Αναφορές", "ergon.pages.analysis", "page_reports"),
+    "statement": ("Καρτέλα προμηθευτή", "ergon.pages.analysis", "page_supplier_statement"),
+    "dashboard": ("Dashboard", "ergon.pages.analysis", "page_dashboard"),
+    "timesheets": ("Ώρες προσωπικού", "ergon.pages.analysis", "page_timesheets"),
+    "data": ("Εισαγωγή / Εξαγωγή", "ergon.pages.transfer", "page_data_transfer"),
+    "archive": ("Αρχείο έργων", "ergon.pages.archive", "page_archive"),
+    "jobs": ("Εργασίες", "ergon.pages.jobs", "page_jobs"),
+    "search": ("Αναζήτηση", "ergon.pages.search", "page_search"),
+}
+# Εμφανίζονται μόνο όταν η διεργασία ξεκινά με ERP_ERGON_ADMIN=1· η
+# απόφαση παίρνεται στον server, όχι από το URL.
+ADMIN_PAGES = {
+    "diagnostics": ("Διαγνωστικά", "ergon.pages.diagnostics", "render_diagnostics"),
+}
+ADMIN_ENV = "ERP_ERGON_ADMIN"
+# Χρειάζονται βάση SQLite (archive.py: ATTACH δεύτερου αρχείου)
+SQLITE_PAGES = ("archive",)
+DEFAULT_PAGE = "clients"
+
+
+def is_admin():
+    return os.environ.get(ADMIN_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def available_pages():
+    pages = {**PAGES, **ADMIN_PAGES} if is_admin() else PAGES
+    if db.is_postgres():
+        pages = {k: v for k, v in pages.items() if k not in SQLITE_PAGES}
+    return pages
+
+
+def load_page(pages, page_key):
+    _, module, function = pages[page_key]
+    return getattr(importlib.import_module(module), function)
+
+
+def select_page(pages):
+    # Η επιλογή ζει στο session_state· το ?page=... στο URL επιτρέπει
+    # απευθείας σύνδεσμο σε σελίδα.
+    if st.session_state.get("page") not in pages:
+        requested = st.query_params.get("page")
+        st.session_state["page"] = requested if requested in pages else DEFAULT_PAGE
+    if "search_q" not in st.session_state:
+        st.session_state["search_q"] = st.query_params.get("q", "")
+
+    def open_search():
+        st.session_state["page"] = "search"
+
+    st.sidebar.text_input("🔍 Αναζήτηση", key="search_q", on_change=open_search)
+
+    page_key = st.sidebar.radio(
+        "Ενότητα",
+        list(pages),
+        format_func=lambda k: pages[k][0],
+        key="page"
+    )
+    if st.query_params.get("page") != page_key:
+        st.query_params["page"] = page_key
+    return page_key
@@ -0,0 +1,302 @@
+from datetime import date
+
+import pyarrow.compute as pc
+import streamlit as st
+
+from ergon import jobs, reports
+from ergon.db import archive_exists, column_labels, from_cents
+from ergon.pages.jobs import job_panel
+from ergon.pickers import entity_picker
+from ergon.profiler import section
+
+
+def include_archived(key):
+    # Τα αρχειοθετημένα έργα (archive.py) μπαίνουν μόνο όταν ζητηθούν
+    if not archive_exists():
+        return False
+    return st.checkbox("Μαζί με τα αρχειοθετημένα έργα", key=key)
+
+
+# ------------------------------------------------------------
+# ΑΠΛΕΣ ΑΝΑΦΟΡΕΣ
+# ------------------------------------------------------------
+
+def page_reports():
+    st.subheader("Αναφορές")
+    archived = include_archived("reports_archived")
+
+    st.markdown("### Περιοδική ανάλυση παραστατικών")
+
+    today = date.today()
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        period_range = st.date_input(
+            "Περίοδος",
+            value=(date(today.year - 4, 1, 1), today),
+            format="DD/MM/YYYY",
+            key="report_range"
+        )
+    with col2:
+        period = st.selectbox(
+            "Ανά", list(reports.PERIODS),
+            format_func=lambda k: reports.PERIODS[k]["label"],
+            key="report_period"
+        )
+    with col3:
+        group = st.selectbox(
+            "Ανάλυση", list(reports.GROUPS),
+            format_func=lambda k: reports.GROUPS[k]["label"],
+            key="report_group"
+        )
+
+    if len(period_range) == 2:
+        with section("period/query"):
+            table = reports.period_report(
+                period_range[0], period_range[1], period, group, archived=archived
+            )
+        if not table.num_rows:
+            st.info("Δεν υπάρχουν παραστατικά στην περίοδο.")
+        else:
+            with section("period/st.dataframe"):
+                st.dataframe(table, column_config=column_labels(table), use_container_width=True, hide_index=True)
+            if st.button("Εξαγωγή σε Excel", key="report_export"):
+                jobs.submit("period_report", {
+                    "start": period_range[0], "end": period_range[1],
+                    "period": period, "group": group, "archived": archived
+                })
+        job_panel(["period_report"], "report_jobs")
+    else:
+        st.info("Επιλέξτε αρχική και τελική ημερομηνία.")
+
+    st.markdown("---")
+    st.markdown("### Υπόλοιπα προμηθευτών (χειροκίνητα πεδία)")
+
+    with section("balances/query"):
+        balances = reports.supplier_balances(archived)
+
+    if balances.num_rows:
+        with section("balances/st.dataframe"):
+            st.dataframe(balances, column_config=column_labels(balances), use_container_width=True)
+    else:
+        st.info("Δεν υπάρχουν ακόμη παραστατικά για υπολογισμό υπολοίπων.")
+
+    st.markdown("---")
+    st.markdown("### Σύνολο χρεώσεων ανά έργο")
+
+    with section("project_costs/query"):
+        costs = reports.project_costs(archived)
+
+    if costs.num_rows:
+        with section("project_costs/st.dataframe"):
+            st.dataframe(costs, column_config=column_labels(costs), use_container_width=True)
+    else:
+        st.info("Δεν υπάρχουν ακόμη παραστατικά ανά έργο.")
+
+
+# ------------------------------------------------------------
+# ΩΡΕΣ ΠΡΟΣΩΠΙΚΟΥ
+# ------------------------------------------------------------
+
+def page_timesheets():
+    st.subheader("Ώρες προσωπικού")
+
+    today = date.today()
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        period_range = st.date_input(
+            "Περίοδος",
+            value=(date(today.year, 1, 1), today),
+            format="DD/MM/YYYY",
+            key="timesheet_range"
+        )
+    with col2:
+        period = st.selectbox(
+            "Ανά", list(reports.TIMESHEET_PERIODS),
+            format_func=lambda k: reports.TIMESHEET_PERIODS[k]["label"],
+            key="timesheet_period"
+        )
+    with col3:
+        weekly = st.number_input(
+            "Στόχος ωρών / εβδομάδα", min_value=0.0, max_value=168.0,
+            value=float(reports.WEEKLY_TARGET_HOURS), step=1.0, key="timesheet_target"
+        )
+
+    if len(period_range) != 2:
+        st.info("Επιλέξτε αρχική και τελική ημερομηνία.")
+        return
+    start, end = period_range
+    first, last = reports.timesheet_range(start, end, period)
+    st.caption(f"Ολόκληρες περίοδοι: {first:%d/%m/%Y} – {last:%d/%m/%Y}")
+
+    st.markdown("### Ώρες ανά υπάλληλο")
+    with section("employees/query"):
+        table = reports.employee_hours(start, end, period, weekly)
+    if table.num_rows:
+        with section("employees/st.dataframe"):
+            st.dataframe(table, column_config=column_labels(table), use_container_width=True, hide_index=True)
+    else:
+        st.info("Δεν υπάρχουν ώρες στην περίοδο.")
+        return
+
+    st.markdown("---")
+    st.markdown("### Υπάλληλοι × έργα")
+    with section("pivot/query"):
+        pivot, target = reports.employee_project_pivot(start, end, weekly)
+    st.caption(
+        f"Στόχος περιόδου: {target:g} ώρες ανά υπάλληλο (ολόκληροι μήνες). "
+        f"Στήλες: τα {reports.PIVOT_PROJECTS} έργα με τις περισσότερες ώρες."
+    )
+    with section("pivot/st.dataframe"):
+        st.dataframe(pivot, column_config=column_labels(pivot), use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.markdown("### Ώρες ανά έργο")
+    with section("projects/query"):
+        projects = reports.project_hours_by_range(start, end)
+    view = projects.select(list(reports.PROJECT_HOURS_LABELS))
+    with section("projects/st.dataframe"):
+        st.dataframe(view, column_config=column_labels(view), use_container_width=True, hide_index=True)
+
+
+# ------------------------------------------------------------
+# ΚΑΡΤΕΛΑ ΠΡΟΜΗΘΕΥΤΗ
+# ------------------------------------------------------------
+
+def page_supplier_statement():
+    st.subheader("Καρτέλα προμηθευτή")
+
+    supplier_id = entity_picker("Προμηθευτής", "suppliers", "statement_supplier", "— Επιλέξτε —")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        period = st.date_input("Περίοδος (προαιρετικά)", value=(), format="DD/MM/YYYY", key="statement_range")
+    with col2:
+        archived = include_archived("statement_archived")
+    if supplier_id is None:
+        st.info("Επιλέξτε προμηθευτή.")
+        return
+    start = period[0] if period else None
+    end = period[1] if len(period) > 1 else None
+
+    with section("totals"):
+        opening, closing, docs = reports.statement_totals(supplier_id, start, end, archived)
+    totals = st.columns(3)
+    totals[0].metric("Υπόλοιπο έναρξης (€)", f"{from_cents(opening):,.2f}")
+    totals[1].metric("Υπόλοιπο τέλους (€)", f"{from_cents(closing):,.2f}")
+    totals[2].metric("Παραστατικά", docs)
+    if not docs:
+        st.info("Δεν υπάρχουν παραστατικά στην περίοδο.")
+        return
+
+    # Στοίβα με (κλειδί έναρξης, υπόλοιπο έναρξης) κάθε σελίδας· μηδενίζεται
+    # όταν αλλάξει προμηθευτής, περίοδος ή αρχείο.
+    signature = repr((supplier_id, start, end, archived))
+    state = st.session_state.get("statement_pages")
+    if state is None or state["filters"] != signature:
+        state = {"filters": signature, "stack": [(None, opening)]}
+        st.session_state["statement_pages"] = state
+
+    after, page_opening = state["stack"][-1]
+    with section("query"):
+        rows, last_key, page_closing, has_next = reports.supplier_statement(
+            supplier_id, start, end, after, page_opening, archived=archived
+        )
+    with section("st.dataframe"):
+        st.dataframe(rows, column_config=column_labels(rows), use_container_width=True, hide_index=True)
+
+    def go_next():
+        state["stack"].append((last_key, page_closing))
+
+    def go_prev():
+        if len(state["stack"]) > 1:
+            state["stack"].pop()
+
+    page_no = len(state["stack"])
+    first = (page_no - 1) * reports.STATEMENT_PAGE_SIZE + 1
+    col1, col2, col3 = st.columns([1, 4, 1])
+    with col1:
+        st.button("◀ Προηγούμενη", key="statement_prev", on_click=go_prev, disabled=page_no == 1)
+    with col2:
+        st.caption(f"Σελίδα {page_no} · εγγραφές {first}–{first + rows.num_rows - 1} από {docs}")
+    with col3:
+        st.button("Επόμενη ▶", key="statement_next", on_click=go_next, disabled=not has_next)
+
+    if st.button("Εξαγωγή σε Excel", key="statement_export"):
+        jobs.submit("export_statement", {
+            "supplier_id": supplier_id, "start": start, "end": end, "archived": archived
+        })
+    job_panel(["export_statement"], "statement_jobs")
+
+
+# ------------------------------------------------------------
+# DASHBOARD
+# ------------------------------------------------------------
+
+def page_dashboard():
+    st.subheader("Dashboard έργων")
+    archived = include_archived("dashboard_archived")
+
+    filters = {}
+    with section("filters"):
+        cols = st.columns(len(reports.PROFITABILITY_FILTERS) + 1)
+        for col, (column, label) in zip(cols, reports.PROFITABILITY_FILTERS.items()):
+            with col:
+                filters[column] = st.selectbox(
+                    label, [None] + reports.profitability_options(column, archived),
+                    format_func=lambda v: "— Όλα —" if v is None else v,
+                    key=f"dashboard_{column}"
+                )
+        with cols[-1]:
+            sort = st.selectbox(
+                "Ταξινόμηση", list(reports.PROFITABILITY_SORTS),
+                format_func=lambda k: reports.PROFITABILITY_SORTS[k],
+                key="dashboard_sort"
+            )
+            descending = st.checkbox("Φθίνουσα", value=True, key="dashboard_desc")
+
+    with section("profitability/query"):
+        table = reports.project_profitability(filters, sort, descending, archived)
+
+    if table.num_rows:
+        def total(column):
+            return pc.sum(table.column(column)).as_py() or 0
+
+        totals = st.columns(4)
+        totals[0].metric("Έργα", table.num_rows)
+        totals[1].metric("Συμφωνημένη Αξία (€)", f"{total('agreed_amount'):,.2f}")
+        totals[2].metric("Συνολικό κόστος (€)", f"{total('total_cost'):,.2f}")
+        totals[3].metric("Περιθώριο (€)", f"{total('margin'):,.2f}")
+
+        view = table.select(list(reports.PROFITABILITY_LABELS))
+        with section("profitability/st.dataframe"):
+            st.dataframe(view, column_config=column_labels(view), use_container_width=True, hide_index=True)
+    else:
+        st.info("Δεν υπάρχουν έργα με αυτά τα κριτήρια.")
+
+    unrated = reports.unrated_employees()
+    if unrated:
+        names = ", ".join(f"{e or '(χωρίς όνομα)'} ({h:g} ώρες)" for e, h in unrated)
+        st.warning(f"Χωρίς ωριαίο κόστος (μετράνε 0 €): {names}")
+
+    with st.expander("Ωριαίο κόστος υπαλλήλων"), section("rates"):
+        rates = reports.employee_rates()
+        edited = st.data_editor(
+            rates,
+            column_config={
+                "employee": st.column_config.TextColumn("Υπάλληλος"),
+                "hourly_rate": st.column_config.NumberColumn("€ / ώρα", min_value=0.0, step=0.5, format="%.2f"),
+            },
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key="employee_rates_editor"
+        )
+        if st.button("Αποθήκευση τιμών", key="employee_rates_save"):
+            new_rates = {
+                r["employee"]: None if r["hourly_rate"] is None else float(r["hourly_rate"])
+                for r in edited.to_pylist() if r["employee"]
+            }
+            removed = set(rates.column("employee").to_pylist()) - set(new_rates)
+            new_rates.update({e: None for e in removed})
+            reports.save_employee_rates(new_rates)
+            st.success("Οι τιμές αποθηκεύτηκαν.")
+            st.rerun()
@@ -0,0 +1,77 @@
+import streamlit as st
+
+from ergon import archive
+from ergon.db import column_labels
+from ergon.profiler import section
+
+
+# ------------------------------------------------------------
+# ΑΡΧΕΙΟ ΕΡΓΩΝ
+# ------------------------------------------------------------
+
+def page_archive():
+    st.subheader("Αρχείο έργων")
+    st.caption(
+        "Τα κλειστά έργα μεταφέρονται με τα παραστατικά και το ημερολόγιό τους "
+        "σε ξεχωριστή βάση. Οι λίστες δεν τα δείχνουν· οι αναφορές, το dashboard "
+        "και η αναζήτηση τα περιλαμβάνουν μόνο όταν επιλεγεί."
+    )
+
+    st.markdown("### Κλειστά έργα χωρίς πρόσφατη κίνηση")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        before = st.date_input(
+            "Χωρίς κίνηση από", value=archive.default_cutoff(), format="DD/MM/YYYY", key="archive_before"
+        )
+    with col2:
+        # Η κατάσταση γράφεται ελεύθερα· ο χρήστης διαλέγει ποιες τιμές
+        # σημαίνουν κλειστό έργο (προεπιλογή: archive.CLOSED_STATUSES)
+        options = archive.status_options()
+        if "archive_statuses" not in st.session_state:
+            st.session_state["archive_statuses"] = archive.default_statuses(options)
+        statuses = st.multiselect(
+            "Κλειστές καταστάσεις",
+            sorted(set(options) | set(st.session_state["archive_statuses"])),
+            key="archive_statuses"
+        )
+    with section("candidates/query"):
+        candidates = archive.candidates(before, statuses)
+
+    if candidates.num_rows:
+        view = candidates.select(list(archive.CANDIDATE_LABELS))
+        with section("candidates/st.dataframe"):
+            st.dataframe(view, column_config=column_labels(view), use_container_width=True, hide_index=True)
+        if st.button(f"Αρχειοθέτηση {candidates.num_rows} έργων", key="archive_run"):
+            with st.spinner("Αρχειοθέτηση…"):
+                moved = archive.archive_projects(candidates.column("id").to_pylist(), statuses)
+            st.success(f"Αρχειοθετήθηκαν {moved} έργα.")
+            st.rerun()
+    else:
+        st.info("Δεν υπάρχουν κλειστά έργα για αρχειοθέτηση.")
+
+    st.markdown("---")
+    st.markdown("### Αρχειοθετημένα έργα")
+
+    with section("archived/query"):
+        archived = archive.archived_projects()
+    if archived is None or not archived.num_rows:
+        st.info("Το αρχείο είναι άδειο.")
+        return
+
+    view = archived.select(list(archive.CANDIDATE_LABELS))
+    with section("archived/st.dataframe"):
+        st.dataframe(view, column_config=column_labels(view), use_container_width=True, hide_index=True)
+
+    names = {
+        r["id"]: f"{r['code'] or ''} : {r['employer_name'] or ''}"
+        for r in archived.select(["id", "code", "employer_name"]).to_pylist()
+    }
+    selected = st.multiselect(
+        "Επαναφορά στην κύρια βάση", list(names), format_func=names.get, key="unarchive_ids"
+    )
+    if st.button("Επαναφορά", key="unarchive_run", disabled=not selected):
+        with st.spinner("Επαναφορά…"):
+            moved = archive.unarchive_projects(selected)
+        st.session_state.pop("unarchive_ids", None)
+        st.success(f"Επανήλθαν {moved} έργα.")
+        st.rerun()
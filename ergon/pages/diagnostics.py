@@ -0,0 +1,124 @@
+import pandas as pd
+import streamlit as st
+
+from ergon import db, profiler
+
+ORDERS = {
+    "total_ms": "Συνολικός χρόνος",
+    "max_ms": "Μέγιστος χρόνος",
+    "calls": "Κλήσεις",
+    "rows": "Γραμμές",
+}
+
+
+# ------------------------------------------------------------
+# ΠΙΝΑΚΕΣ
+# ------------------------------------------------------------
+
+def _pages_label(pages):
+    ordered = sorted(pages.items(), key=lambda item: item[1][1], reverse=True)
+    return ", ".join(f"{page} ×{calls}" for page, (calls, _) in ordered)
+
+
+def top_queries_frame(order="total_ms", limit=50):
+    records = []
+    for query, e in db.query_stats.top(limit, order):
+        records.append({
+            "Ερώτημα": query,
+            "Είδος": e["kind"],
+            "Κλήσεις": e["calls"],
+            "Από cache": e["cache_hits"],
+            "Σύνολο (ms)": round(e["total_ms"], 1),
+            "Μέσος (ms)": round(e["total_ms"] / e["calls"], 2),
+            "Μέγιστος (ms)": round(e["max_ms"], 1),
+            "Γραμμές": e["rows"],
+            "Σελίδες": _pages_label(e["pages"]),
+            "Σημείο κλήσης": e["call_site"],
+        })
+    return pd.DataFrame(records)
+
+
+def pages_frame():
+    return pd.DataFrame(
+        [(page, calls, round(ms, 1)) for page, (calls, ms) in db.query_stats.by_page()],
+        columns=["Σελίδα", "Ερωτήματα", "Σύνολο (ms)"]
+    )
+
+
+def slow_log_frame(limit=100):
+    entries = db.read_slow_log(limit)
+    return pd.DataFrame([{
+        "Ώρα": e.get("ts"),
+        "ms": e.get("ms"),
+        "Γραμμές": e.get("rows"),
+        "Σελίδα": e.get("page"),
+        "Σημείο κλήσης": e.get("call_site"),
+        "Ερώτημα": e.get("query"),
+        "Πλάνο": " | ".join(e.get("plan") or []),
+    } for e in entries])
+
+
+# ------------------------------------------------------------
+# UI
+# ------------------------------------------------------------
+
+def render_diagnostics():
+    st.subheader("Διαγνωστικά βάσης")
+    stats = db.query_stats
+    st.caption(
+        f"Μετρήσεις από {stats.since:%d/%m/%Y %H:%M} σε αυτή τη διεργασία· "
+        f"αργά ερωτήματα (≥ {db.SLOW_QUERY_MS} ms) στο {db.SLOW_LOG_PATH}."
+    )
+
+    top = stats.top(limit=stats.max_queries)
+    cache = db.query_cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Διαφορετικά ερωτήματα", len(top))
+    col2.metric("Εκτελέσεις", sum(e["calls"] for _, e in top))
+    col3.metric("Χρόνος στη βάση", f"{sum(e['total_ms'] for _, e in top) / 1000:.1f} s")
+    col4.metric("Επιτυχία cache", f"{100 * cache['hits'] / lookups:.0f}%" if lookups else "–")
+
+    if st.button("Μηδενισμός μετρήσεων"):
+        stats.reset()
+        st.rerun()
+
+    st.markdown("### Ερωτήματα με το μεγαλύτερο κόστος")
+    order = st.selectbox("Ταξινόμηση", list(ORDERS), format_func=ORDERS.get, key="diag_order")
+    df = top_queries_frame(order)
+    if df.empty:
+        st.info("Δεν έχουν καταγραφεί ακόμη ερωτήματα.")
+    else:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+        # Πλάνο εκτέλεσης με τις παραμέτρους της τελευταίας κλήσης
+        items = stats.top(50, order)
+        selected = st.selectbox(
+            "Πλάνο εκτέλεσης για", range(len(items)),
+            format_func=lambda i: items[i][0][:120], key="diag_plan"
+        )
+        if selected is not None and selected < len(items):
+            query, entry = items[selected]
+            st.code(query, language="sql")
+            st.code("\n".join(db.explain_query(query, entry["params"])), language="text")
+
+    st.markdown("### Χρόνος ανά σελίδα")
+    st.dataframe(pages_frame(), use_container_width=True, hide_index=True)
+
+    st.markdown("### Χρόνος rerun ανά ενότητα")
+    st.caption(f"Ανά rerun στο {profiler.RERUN_LOG_PATH}, μετρητές Prometheus στο {profiler.METRICS_PATH}.")
+    render = pd.DataFrame(
+        [(page, path, count, round(ms, 1)) for page, path, count, ms in profiler.summary()],
+        columns=["Σελίδα", "Ενότητα", "Reruns", "Μέσος (ms)"]
+    )
+    if render.empty:
+        st.info("Δεν έχουν καταγραφεί ακόμη reruns.")
+    else:
+        st.dataframe(render, use_container_width=True, hide_index=True)
+
+    st.markdown("### Αργά ερωτήματα")
+    slow = slow_log_frame()
+    if slow.empty:
+        st.info("Δεν υπάρχουν αργά ερωτήματα.")
+    else:
+        st.dataframe(slow, use_container_width=True, hide_index=True)
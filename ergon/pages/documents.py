@@ -0,0 +1,131 @@
+from datetime import date
+
+import streamlit as st
+
+from ergon.db import execute, to_cents, to_day_key
+from ergon.listing import render_list
+from ergon.pickers import entity_picker
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΠΑΡΑΣΤΑΤΙΚΩΝ (από φύλλο "Παραστατικά")
+# ------------------------------------------------------------
+
+def entry_mode(page_key):
+    return st.radio(
+        "Καταχώρηση", ("single", "bulk"),
+        format_func=lambda m: "Μία εγγραφή" if m == "single" else "Πολλές (πίνακας)",
+        horizontal=True,
+        key=f"{page_key}_entry_mode"
+    )
+
+
+def page_documents():
+    st.subheader("Παραστατικά / Κινήσεις")
+
+    if entry_mode("documents") == "bulk":
+        st.markdown("### Μαζική καταχώρηση παραστατικών")
+        from ergon.bulk import render_bulk_entry
+        render_bulk_entry("documents")
+    else:
+        st.markdown("### Νέο παραστατικό")
+        project_id = entity_picker("Έργο", "projects", "doc_project", "— Χωρίς έργο —")
+        supplier_id = entity_picker("Προμηθευτής - Συνεργείο", "suppliers", "doc_supplier", "— Χωρίς προμηθευτή —")
+
+        with st.form("doc_form"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                seq_no = st.number_input("α/α", min_value=0, step=1)
+                doc_date = st.date_input("Ημ/νία Παρ/τικού", value=date.today())
+            with col2:
+                billing_type = st.text_input("Τιμολόγηση")
+                work_title = st.text_input("Εργασία")
+            with col3:
+                description = st.text_input("Περιγραφή")
+                charge = st.number_input("Χρέωση (€)", min_value=0.0, step=10.0, format="%.2f")
+                vat = st.number_input("ΦΠΑ (€)", min_value=0.0, step=10.0, format="%.2f")
+                credit = st.number_input("Πίστωση (€)", min_value=0.0, step=10.0, format="%.2f")
+
+            col4, col5, col6 = st.columns(3)
+            with col4:
+                payment_method = st.text_input("Τρόπος Πληρωμής")
+            with col5:
+                payments = st.number_input("Καταβολές (€)", min_value=0.0, step=10.0, format="%.2f")
+            with col6:
+                payment_target = st.text_input("Πού καταβλήθηκαν")
+
+            submitted = st.form_submit_button("Αποθήκευση παραστατικού")
+
+            if submitted:
+                execute("""
+                    INSERT INTO documents (
+                        seq_no, doc_date, project_id, billing_type,
+                        supplier_id, work_title, description,
+                        charge, vat, credit,
+                        payment_method, payments, payment_target
+                    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """, (
+                    int(seq_no) if seq_no else None,
+                    to_day_key(doc_date),
+                    project_id,
+                    billing_type,
+                    supplier_id,
+                    work_title,
+                    description,
+                    to_cents(charge),
+                    to_cents(vat),
+                    to_cents(credit),
+                    payment_method,
+                    to_cents(payments),
+                    payment_target
+                ))
+                st.success("Το παραστατικό αποθηκεύτηκε.")
+
+    st.markdown("---")
+    st.markdown("### Λίστα παραστατικών")
+    render_list("documents")
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΗΜΕΡΟΛΟΓΙΟΥ
+# ------------------------------------------------------------
+
+def page_worklog():
+    st.subheader("Ημερολόγιο εργασιών")
+
+    if entry_mode("worklog") == "bulk":
+        st.markdown("### Μαζική καταχώρηση ημερολογίου")
+        from ergon.bulk import render_bulk_entry
+        render_bulk_entry("worklog")
+    else:
+        st.markdown("### Νέα εγγραφή ημερολογίου")
+        project_id = entity_picker("Έργο", "projects", "worklog_project", "— Χωρίς έργο —")
+
+        with st.form("worklog_form"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                log_date = st.date_input("Ημερομηνία", value=date.today())
+            with col2:
+                employee = st.text_input("Υπάλληλος")
+            with col3:
+                work_desc = st.text_input("Εργασία")
+                hours = st.number_input("Ώρες", min_value=0.0, step=0.5)
+
+            submitted = st.form_submit_button("Αποθήκευση")
+
+            if submitted:
+                execute("""
+                    INSERT INTO worklog (log_date, employee, project_id, work_desc, hours)
+                    VALUES (?,?,?,?,?)
+                """, (
+                    to_day_key(log_date),
+                    employee,
+                    project_id,
+                    work_desc,
+                    hours
+                ))
+                st.success("Η εγγραφή ημερολογίου αποθηκεύτηκε.")
+
+    st.markdown("---")
+    st.markdown("### Εγγραφές ημερολογίου")
+    render_list("worklog")
@@ -0,0 +1,46 @@
+import streamlit as st
+
+from ergon.db import column_labels, execute, fetch_columns, to_cents
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΤΑΜΕΙΟΥ (template Είδος Έργου / Ποσό)
+# ------------------------------------------------------------
+
+def page_fee_templates():
+    st.subheader("Ταμείο – Πρότυπα ποσά ανά είδος έργου")
+
+    with st.form("fee_form"):
+        st.markdown("### Νέο είδος έργου")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            work_type = st.text_input("Είδος έργου")
+        with col2:
+            amount = st.number_input("Ποσό (€)", min_value=0.0, step=100.0, format="%.2f")
+
+        submitted = st.form_submit_button("Αποθήκευση")
+
+        if submitted:
+            execute("""
+                INSERT INTO fee_templates (work_type, amount)
+                VALUES (?,?)
+            """, (work_type, to_cents(amount)))
+            st.success("Το είδος έργου αποθηκεύτηκε στο Ταμείο.")
+
+    st.markdown("---")
+    st.markdown("### Λίστα ειδών έργου & ποσών")
+
+    fees = fetch_columns("""
+        SELECT id, work_type, amount
+        FROM fee_templates
+        ORDER BY work_type
+    """, labels={
+        "work_type": "Είδος έργου",
+        "amount": "Ποσό (€)"
+    })
+
+    if fees.num_rows:
+        st.dataframe(fees, column_config=column_labels(fees), use_container_width=True)
+    else:
+        st.info("Δεν υπάρχουν καταχωρημένα είδη έργου.")
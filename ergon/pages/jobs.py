@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import streamlit as st
+
+from ergon import jobs
+
+# Όσο κάποια εργασία είναι ανοιχτή, η λίστα ξαναδιαβάζεται κάθε
+# POLL_SECONDS μέσα σε st.fragment (όχι όλη η σελίδα)· όταν τελειώσουν
+# όλες, ένα πλήρες rerun τη δείχνει στατικά, με τα κουμπιά λήψης.
+POLL_SECONDS = 1.0
+
+
+# ------------------------------------------------------------
+# ΛΙΣΤΑ ΕΡΓΑΣΙΩΝ
+# ------------------------------------------------------------
+
+def _job_row(job, key):
+    spec = jobs.JOB_KINDS[job["kind"]]
+    active = job["status"] in jobs.ACTIVE_STATUSES
+    created = datetime.fromtimestamp(job["created_at"]).strftime("%d/%m/%Y %H:%M")
+    status = jobs.STATUS_LABELS.get(job["status"], job["status"])
+
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.markdown(f"**{spec['label']}** · #{job['id']} · {created} · {status}")
+        if active and job["progress"] is not None:
+            st.progress(job["progress"], text=job["message"] or "")
+        elif job["status"] == "failed":
+            st.error(job["error"] or "Άγνωστο σφάλμα")
+        elif job["message"]:
+            st.caption(job["message"])
+    with col2:
+        if active:
+            st.button(
+                "Ακύρωση", key=f"{key}_cancel_{job['id']}",
+                on_click=jobs.cancel, args=(job["id"],),
+                disabled=bool(job["cancel_requested"])
+            )
+            return
+        result = jobs.result_file(job)
+        if result:
+            name, read = result
+            st.download_button("Λήψη", read, file_name=name, mime=spec["mime"], key=f"{key}_download_{job['id']}")
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(kinds, key, limit):
+    recent = jobs.recent(kinds, limit)
+    for job in recent:
+        _job_row(job, key)
+    if not any(job["status"] in jobs.ACTIVE_STATUSES for job in recent):
+        st.rerun()
+
+
+def job_panel(kinds=None, key="jobs", limit=3):
+    # Οι πιο πρόσφατες εργασίες των συγκεκριμένων ειδών (jobs.JOB_KINDS)
+    recent = jobs.recent(kinds, limit)
+    if any(job["status"] in jobs.ACTIVE_STATUSES for job in recent):
+        _poll(kinds, key, limit)
+        return
+    for job in recent:
+        _job_row(job, key)
+
+
+def page_jobs():
+    st.subheader("Εργασίες παρασκηνίου")
+    st.caption(
+        "Εξαγωγές, εισαγωγές και μεγάλες αναφορές τρέχουν σε ξεχωριστές διεργασίες. "
+        f"Τα αποτελέσματα κρατούνται {jobs.JOB_RETENTION_DAYS} ημέρες."
+    )
+    if not jobs.recent(limit=1):
+        st.info("Δεν υπάρχουν εργασίες.")
+        return
+    job_panel(key="jobs_page", limit=20)
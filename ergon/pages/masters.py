@@ -0,0 +1,207 @@
+from datetime import date
+
+import streamlit as st
+
+from ergon.db import execute, to_cents, to_day_key
+from ergon.listing import render_list
+from ergon.pickers import entity_picker
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΠΕΛΑΤΩΝ / ΕΡΓΟΔΟΤΩΝ
+# ------------------------------------------------------------
+
+def page_clients():
+    st.subheader("Εργοδότες / Πελάτες")
+
+    with st.form("client_form"):
+        st.markdown("### Νέος εργοδότης")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            company_name = st.text_input("Επωνυμία")
+            last_name = st.text_input("Επίθετο")
+            first_name = st.text_input("Όνομα")
+            entity_type = st.text_input("Σύσταση (π.χ. ΦΠ/ΕΠΕ/ΙΚΕ)")
+        with col2:
+            address = st.text_input("Διεύθυνση")
+            postal_code = st.text_input("ΤΚ")
+            city = st.text_input("Πόλη")
+        with col3:
+            phone_landline = st.text_input("Σταθερό")
+            phone_mobile = st.text_input("Κινητό")
+            email = st.text_input("Email")
+
+        col4, col5, col6 = st.columns(3)
+        with col4:
+            afm = st.text_input("ΑΦΜ")
+            dou = st.text_input("ΔΟΥ")
+        with col5:
+            job = st.text_input("Επάγγελμα")
+        with col6:
+            taxis_username = st.text_input("TaxisNet Username")
+            taxis_password = st.text_input("TaxisNet Password", type="password")
+
+        submitted = st.form_submit_button("Αποθήκευση εργοδότη")
+
+        if submitted:
+            execute("""
+                INSERT INTO clients (
+                    company_name, last_name, first_name, entity_type,
+                    address, postal_code, city,
+                    phone_landline, phone_mobile, email,
+                    afm, dou, taxis_username, taxis_password, job
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """, (
+                company_name, last_name, first_name, entity_type,
+                address, postal_code, city,
+                phone_landline, phone_mobile, email,
+                afm, dou, taxis_username, taxis_password, job
+            ))
+            st.success("Ο εργοδότης αποθηκεύτηκε.")
+
+    st.markdown("---")
+    st.markdown("### Λίστα εργοδοτών")
+    render_list("clients")
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΠΡΟΜΗΘΕΥΤΩΝ
+# ------------------------------------------------------------
+
+def page_suppliers():
+    st.subheader("Προμηθευτές")
+
+    with st.form("supplier_form"):
+        st.markdown("### Νέος προμηθευτής / συνεργείο")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            company_name = st.text_input("Επωνυμία Εταιρίας")
+            last_name = st.text_input("Επίθετο")
+            first_name = st.text_input("Όνομα")
+            entity_type = st.text_input("Σύσταση")
+            job = st.text_input("Επάγγελμα")
+        with col2:
+            iban1 = st.text_input("ΙΒΑΝ 1")
+            bank1 = st.text_input("Τράπεζα 1")
+            iban2 = st.text_input("ΙΒΑΝ 2")
+            bank2 = st.text_input("Τράπεζα 2")
+        with col3:
+            iban3 = st.text_input("ΙΒΑΝ 3")
+            bank3 = st.text_input("Τράπεζα 3")
+            iban4 = st.text_input("ΙΒΑΝ 4")
+            bank4 = st.text_input("Τράπεζα 4")
+
+        col4, col5, col6 = st.columns(3)
+        with col4:
+            address = st.text_input("Διεύθυνση")
+            postal_code = st.text_input("ΤΚ")
+            city = st.text_input("Πόλη")
+        with col5:
+            phone1 = st.text_input("Τηλ. 1")
+            phone2 = st.text_input("Τηλ. 2")
+        with col6:
+            email = st.text_input("Email")
+            afm = st.text_input("ΑΦΜ")
+            dou = st.text_input("ΔΟΥ")
+
+        submitted = st.form_submit_button("Αποθήκευση προμηθευτή")
+
+        if submitted:
+            execute("""
+                INSERT INTO suppliers (
+                    company_name, last_name, first_name, entity_type, job,
+                    iban1, bank1, iban2, bank2, iban3, bank3, iban4, bank4,
+                    address, postal_code, city,
+                    phone1, phone2, email, afm, dou
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """, (
+                company_name, last_name, first_name, entity_type, job,
+                iban1, bank1, iban2, bank2, iban3, bank3, iban4, bank4,
+                address, postal_code, city,
+                phone1, phone2, email, afm, dou
+            ))
+            st.success("Ο προμηθευτής αποθηκεύτηκε.")
+
+    st.markdown("---")
+    st.markdown("### Λίστα προμηθευτών")
+    render_list("suppliers")
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΑ ΕΡΓΩΝ
+# ------------------------------------------------------------
+
+def page_projects():
+    st.subheader("Έργα")
+
+    st.markdown("### Νέο έργο")
+    client_id = entity_picker("Εργοδότης (από λίστα)", "clients", "project_client", "— Χωρίς εργοδότη —")
+
+    with st.form("project_form"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            code = st.text_input("Κωδικός Έργου")
+            reg_date = st.date_input("Ημ/νια Εγγραφής", value=date.today())
+            protocol_no = st.text_input("Αρ. πρωτ")
+        with col2:
+            employer_name = st.text_input("Εργοδότης (ελεύθερο κείμενο)")
+            hf_flag = st.text_input("ΗΦ-Φ")
+        with col3:
+            project_type = st.text_input("Είδος Έργου")
+            priority = st.text_input("Προτεραιότητα")
+            status = st.text_input("Κατάσταση")
+            status2 = st.text_input("Κατάσταση2")
+
+        col4, col5, col6 = st.columns(3)
+        with col4:
+            description = st.text_area("Περιγραφή", height=80)
+        with col5:
+            address = st.text_input("Διεύθυνση έργου")
+            postal_code = st.text_input("ΤΚ")
+            city = st.text_input("Πόλη")
+        with col6:
+            agreed_amount = st.number_input("Συμφωνημένη Αξία (€)", min_value=0.0, step=100.0, format="%.2f")
+            invoice_expenses = st.number_input("Έξοδα παραστατικών (€)", min_value=0.0, step=10.0, format="%.2f")
+            engineer = st.text_input("Μηχανικός")
+            apy = st.text_input("ΑΠΥ")
+            manager = st.text_input("Μάνος-Θανάσης")
+
+        submitted = st.form_submit_button("Αποθήκευση έργου")
+
+        if submitted:
+            execute("""
+                INSERT INTO projects (
+                    code, reg_date, protocol_no, client_id, employer_name,
+                    hf_flag, project_type, priority, status, status2,
+                    description, address, postal_code, city,
+                    agreed_amount, invoice_expenses,
+                    engineer, apy, manager
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """, (
+                code,
+                to_day_key(reg_date),
+                protocol_no,
+                client_id,
+                employer_name,
+                hf_flag,
+                project_type,
+                priority,
+                status,
+                status2,
+                description,
+                address,
+                postal_code,
+                city,
+                to_cents(agreed_amount),
+                to_cents(invoice_expenses),
+                engineer,
+                apy,
+                manager
+            ))
+            st.success("Το έργο αποθηκεύτηκε.")
+
+    st.markdown("---")
+    st.markdown("### Λίστα έργων")
+    render_list("projects")
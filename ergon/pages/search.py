@@ -0,0 +1,40 @@
+import streamlit as st
+
+from ergon import search
+from ergon.db import archive_exists, column_labels, has_full_text_search, table_from_rows, with_labels
+from ergon.profiler import section
+
+
+# ------------------------------------------------------------
+# ΑΝΑΖΗΤΗΣΗ
+# ------------------------------------------------------------
+
+def page_search():
+    st.subheader("Αναζήτηση")
+    if not has_full_text_search():
+        st.info("Η αναζήτηση πλήρους κειμένου υπάρχει μόνο με βάση SQLite· "
+                "τα πεδία επιλογής (εργοδότης, έργο, προμηθευτής) αναζητούν κανονικά.")
+        return
+
+    # Το πεδίο αναζήτησης βρίσκεται στο sidebar (select_page)
+    query = st.session_state.get("search_q", "")
+    if st.query_params.get("q", "") != query:
+        st.query_params["q"] = query
+    if not query.strip():
+        st.info("Πληκτρολογήστε στο πεδίο αναζήτησης (επωνυμία, ΑΦΜ, κωδικό έργου, εργασία…).")
+        return
+
+    archived = archive_exists() and st.checkbox("Αναζήτηση και στο αρχείο έργων", key="search_archived")
+    with section("query"):
+        results = search.search(query, archived=archived)
+    if not results:
+        st.info("Δεν βρέθηκαν αποτελέσματα.")
+        return
+
+    for key, rows in results.items():
+        spec = search.entity(key)
+        st.markdown(f"### {spec['title']} ({len(rows)})")
+        with section(f"{key}/frame"):
+            table = with_labels(table_from_rows(rows), spec["labels"])
+        with section(f"{key}/st.dataframe"):
+            st.dataframe(table, column_config=column_labels(table), use_container_width=True, hide_index=True)
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from ergon import exporter, importer, jobs
+from ergon.pages.jobs import job_panel
+
+
+# ------------------------------------------------------------
+# ΕΙΣΑΓΩΓΗ / ΕΞΑΓΩΓΗ ΔΕΔΟΜΕΝΩΝ
+# ------------------------------------------------------------
+
+# Και οι δύο τρέχουν ως εργασίες παρασκηνίου (jobs.py): η σελίδα μένει
+# ελεύθερη και η πρόοδος / το αρχείο εμφανίζονται στη λίστα από κάτω.
+
+def page_data_transfer():
+    st.subheader("Εισαγωγή / Εξαγωγή δεδομένων")
+
+    st.markdown("### Εισαγωγή από το βιβλίο Excel")
+    st.caption("Φύλλα: " + ", ".join(spec["sheet"] for spec in importer.SHEETS))
+
+    uploaded = st.file_uploader("Αρχείο .xlsx", type=["xlsx"])
+    if uploaded is not None and st.button("Εισαγωγή"):
+        jobs.submit("import_workbook", {"path": jobs.save_upload(uploaded.getvalue()), "name": uploaded.name})
+    job_panel(["import_workbook"], "import_jobs")
+
+    st.markdown("---")
+    st.markdown("### Εξαγωγή σε Excel")
+
+    sheet_names = [spec["sheet"] for spec in exporter.EXPORTS]
+    selected = st.multiselect("Φύλλα", sheet_names, default=sheet_names)
+    if st.button("Δημιουργία αρχείου", disabled=not selected):
+        jobs.submit("export_workbook", {"sheets": selected})
+    job_panel(["export_workbook"], "export_jobs")
@@ -0,0 +1,126 @@
+import streamlit as st
+
+from ergon import search
+from ergon.db import FTS_INDEXES, fetch_all, fold_text, from_day_key, has_full_text_search
+
+PICKER_LIMIT = 25
+
+
+# ------------------------------------------------------------
+# ΕΠΙΛΟΓΕΙΣ ΟΝΤΟΤΗΤΩΝ ΜΕ ΑΝΑΖΗΤΗΣΗ (typeahead)
+# ------------------------------------------------------------
+
+# Αντί για selectbox με όλο τον πίνακα: πεδίο αναζήτησης πάνω από τα
+# ευρετήρια FTS και selectbox με τα N καλύτερα αποτελέσματα. Η επιλογή
+# κρατιέται ως id, οπότε ίδιες ετικέτες δεν μπερδεύονται. Χωρίς FTS
+# (PostgreSQL) κάθε λέξη αναζητείται με LIKE στις ίδιες στήλες, μετά από
+# gr_fold.
+
+def client_label(r):
+    label = (r["company_name"] or "").strip()
+    if not label:
+        label = f"{(r['last_name'] or '').strip()} {(r['first_name'] or '').strip()}".strip()
+    if not label:
+        label = f"ID {r['id']}"
+    if r["afm"]:
+        label += f" · ΑΦΜ {r['afm']}"
+    return label
+
+
+def supplier_label(r):
+    label = (r["company_name"] or "").strip() or f"Προμηθευτής {r['id']}"
+    if r["afm"]:
+        label += f" · ΑΦΜ {r['afm']}"
+    return label
+
+
+def project_label(r):
+    label = f"{r['code'] or ''} : {r['employer_name'] or ''}".strip(" :")
+    if not label:
+        label = f"Έργο {r['id']}"
+    if r["reg_date"]:
+        label += f" · {from_day_key(r['reg_date']):%d/%m/%Y}"
+    return label
+
+
+PICKERS = {
+    "clients": {
+        "columns": "x.id, x.company_name, x.last_name, x.first_name, x.afm",
+        "order": "IFNULL(x.company_name,''), IFNULL(x.last_name,''), IFNULL(x.first_name,''), x.id",
+        "label": client_label,
+    },
+    "suppliers": {
+        "columns": "x.id, x.company_name, x.afm",
+        "order": "IFNULL(x.company_name,''), x.id",
+        "label": supplier_label,
+    },
+    "projects": {
+        "columns": "x.id, x.code, x.employer_name, x.reg_date",
+        "order": "IFNULL(x.reg_date,0) DESC, x.id DESC",
+        "label": project_label,
+    },
+}
+
+
+def fold_filter(entity, text):
+    # (συνθήκη, παράμετροι): όλες οι λέξεις μέσα στις στήλες του FTS_INDEXES
+    tokens = fold_text(text).split()
+    columns = " || ' ' || ".join(f"IFNULL(x.{c},'')" for c in FTS_INDEXES[entity])
+    return " AND ".join(f"gr_fold({columns}) LIKE ?" for _ in tokens), tuple(f"%{t}%" for t in tokens)
+
+
+def fetch_options(entity, text, limit=PICKER_LIMIT):
+    spec = PICKERS[entity]
+    if text and not has_full_text_search():
+        where, params = fold_filter(entity, text)
+        expression = ""
+    else:
+        where, params = "", ()
+        expression = search.match_expression(text) if text else ""
+    if expression:
+        rows = fetch_all(f"""
+            SELECT {spec["columns"]}
+            FROM {entity}_fts
+            JOIN {entity} x ON x.id = {entity}_fts.rowid
+            WHERE {entity}_fts MATCH ?
+            ORDER BY {entity}_fts.rank
+            LIMIT ?
+        """, (expression, limit))
+    else:
+        # Χωρίς κείμενο (ή με το φίλτρο LIKE): οι πρώτες N κατά τη φυσική
+        # σειρά του πίνακα (index)
+        rows = fetch_all(f"""
+            SELECT {spec["columns"]}
+            FROM {entity} x
+            {f"WHERE {where}" if where else ""}
+            ORDER BY {spec["order"]}
+            LIMIT ?
+        """, params + (limit,))
+    return {r["id"]: spec["label"](r) for r in rows}
+
+
+def fetch_label(entity, entity_id):
+    spec = PICKERS[entity]
+    rows = fetch_all(f"SELECT {spec['columns']} FROM {entity} x WHERE x.id = ?", (entity_id,))
+    return spec["label"](rows[0]) if rows else f"ID {entity_id}"
+
+
+def entity_picker(label, entity, key, empty_label, limit=PICKER_LIMIT):
+    # Πρέπει να βρίσκεται έξω από st.form: τα widgets μέσα σε φόρμα δεν
+    # προκαλούν rerun όσο πληκτρολογεί ο χρήστης.
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        text = st.text_input(f"{label} – αναζήτηση", key=f"{key}_q")
+    labels = fetch_options(entity, text, limit)
+
+    selected = st.session_state.get(key)
+    if selected is not None and selected not in labels:
+        labels = {selected: fetch_label(entity, selected), **labels}
+
+    with col2:
+        return st.selectbox(
+            label,
+            [None] + list(labels),
+            format_func=lambda v: empty_label if v is None else labels[v],
+            key=key
+        )
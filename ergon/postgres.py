@@ -0,0 +1,618 @@
+import functools
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import psycopg
+import psycopg_pool
+from psycopg.adapt import Loader
+from psycopg.pq import TransactionStatus
+from psycopg.rows import tuple_row
+
+from ergon import db, schema
+
+# ------------------------------------------------------------
+# POSTGRESQL
+# ------------------------------------------------------------
+
+# Με DB_PATH (ή ERP_ERGON_DB) = postgresql://χρήστης@server/βάση το
+# db.get_manager() επιστρέφει PostgresManager αντί για το ConnectionManager
+# του SQLite. Το module φορτώνεται μόνο τότε· θέλει psycopg 3 και
+# psycopg_pool (pip install "psycopg[binary]" psycopg_pool) και
+# PostgreSQL 14 ή νεότερη.
+#
+# Τα ερωτήματα της εφαρμογής γράφονται για το SQLite (? παράμετροι,
+# IFNULL) και μεταφράζονται εδώ (translate). Οι συνδέσεις επιστρέφουν
+# γραμμές που συμπεριφέρονται όπως το sqlite3.Row.
+
+POOL_MIN = 2
+POOL_MAX = 10
+# Δευτερόλεπτα αναμονής για ελεύθερη σύνδεση πριν το σφάλμα
+POOL_TIMEOUT = 30
+# Επαναλήψεις μιας εγγραφής που ακυρώθηκε από deadlock / serialization
+WRITE_RETRIES = 3
+# Ειδοποιήσεις ακύρωσης cache ανάμεσα σε διεργασίες / servers
+NOTIFY_CHANNEL = "erp_ergon_tables"
+LISTEN_RETRY = 5.0
+# Κλειδί του pg_advisory_xact_lock των migrations
+MIGRATION_LOCK = 0x45524750
+
+
+# ------------------------------------------------------------
+# ΜΕΤΑΦΡΑΣΗ ΕΡΩΤΗΜΑΤΩΝ
+# ------------------------------------------------------------
+
+# ? -> %s, % -> %% (και μέσα σε κείμενο, αφού το psycopg τα διαβάζει όλα)
+# και IFNULL( -> COALESCE(. Τα ? μέσα σε κείμενο / σχόλια μένουν ως έχουν.
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"|--[^\n]*|\?|%|\bIFNULL\(", re.IGNORECASE)
+_INSERT_RE = re.compile(r"^\s*INSERT\s+INTO\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+_RETURNING_RE = re.compile(r"\bRETURNING\b", re.IGNORECASE)
+
+# Πίνακες με id ταυτότητας: τα INSERT τους επιστρέφουν το id (lastrowid)
+ID_TABLES = frozenset(
+    table for table, spec in schema.TABLES.items() if spec["columns"][0][1] == "id"
+)
+
+
+def _token(match):
+    token = match.group(0)
+    if token == "?":
+        return "%s"
+    if token == "%":
+        return "%%"
+    if token[0] in "'\"-":
+        return token.replace("%", "%%")
+    return "COALESCE("
+
+
+@functools.lru_cache(maxsize=2048)
+def translate(query):
+    return _TOKEN_RE.sub(_token, query)
+
+
+def coalesce(sql):
+    # Για DDL χωρίς παραμέτρους (indexes του schema.py)
+    return re.sub(r"\bIFNULL\(", "COALESCE(", sql, flags=re.IGNORECASE)
+
+
+# ------------------------------------------------------------
+# ΣΥΝΔΕΣΕΙΣ
+# ------------------------------------------------------------
+
+class Row(tuple):
+    # Όπως το sqlite3.Row: στήλη κατά θέση ή όνομα, keys() για dict(row)
+    __slots__ = ()
+    names = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self.names[key]
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self.names)
+
+
+def row_factory(cursor):
+    names = {d.name: i for i, d in enumerate(cursor.description or ())}
+    return type("Row", (Row,), {"__slots__": (), "names": names})
+
+
+class NumericLoader(Loader):
+    # Το SUM() ακεραίων (λεπτά €) δίνει numeric: ακέραιος όπως στο SQLite,
+    # αλλιώς float (όχι Decimal, που δεν αναμειγνύεται με τα float των ωρών).
+
+    def load(self, data):
+        text = bytes(data).decode("ascii")
+        return int(text) if text.lstrip("-").isdigit() else float(text)
+
+
+def configure(conn):
+    conn.adapters.register_loader("numeric", NumericLoader)
+
+
+class Cursor:
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.lastrowid = None
+
+    @property
+    def row_factory(self):
+        return self._cursor.row_factory
+
+    @row_factory.setter
+    def row_factory(self, factory):
+        # None = απλά tuples, όπως στο sqlite3
+        self._cursor.row_factory = tuple_row if factory is None else factory
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query, params=()):
+        self._cursor.execute(translate(query), tuple(params))
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(translate(query), [tuple(p) for p in seq_of_params])
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    # Ό,τι χρησιμοποιεί η εφαρμογή από το sqlite3.Connection, πάνω σε μια
+    # σύνδεση psycopg (χωρίς autocommit: συναλλαγή ως το commit/rollback)
+
+    def __init__(self, conn):
+        self.raw = conn
+        self._names = itertools.count()
+
+    def execute(self, query, params=()):
+        cursor = Cursor(self.raw.cursor(row_factory=row_factory))
+        m = _INSERT_RE.match(query)
+        if m and m.group(1).lower() in ID_TABLES and not _RETURNING_RE.search(query):
+            cursor.execute(f"{query} RETURNING id", params)
+            rows = cursor.fetchall()
+            cursor.lastrowid = rows[-1][0] if rows else None
+            return cursor
+        return cursor.execute(query, params)
+
+    def executemany(self, query, seq_of_params):
+        return Cursor(self.raw.cursor()).executemany(query, seq_of_params)
+
+    def cursor(self):
+        # Cursor στον server (DECLARE … CURSOR): το fetchmany φέρνει μία
+        # παρτίδα τη φορά, οπότε οι μεγάλες λίστες / εξαγωγές δεν
+        # φορτώνονται ολόκληρες ούτε στη μνήμη του client.
+        return Cursor(self.raw.cursor(name=f"erp_ergon_{next(self._names)}", row_factory=row_factory))
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    @property
+    def in_transaction(self):
+        return self.raw.info.transaction_status != TransactionStatus.IDLE
+
+    def close(self):
+        self.raw.close()
+
+
+def connect(url):
+    conn = psycopg.connect(url)
+    configure(conn)
+    return Connection(conn)
+
+
+# ------------------------------------------------------------
+# ΣΧΗΜΑ
+# ------------------------------------------------------------
+
+# Οι πίνακες και τα indexes από το schema.py· οι συναρτήσεις και τα
+# triggers κάνουν ό,τι τα αντίστοιχα του db.py (SQLite).
+
+FUNCTIONS = (
+    # db.fold_text: χωρίς τόνους, πεζά, ς -> σ, ό,τι δεν είναι γράμμα/ψηφίο -> κενό
+    """
+        CREATE OR REPLACE FUNCTION gr_fold(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT btrim(regexp_replace(
+                translate(lower(coalesce(value, '')),
+                          'άέήίόύώϊϋΐΰςàáâäãèéêëìíîïòóôöõùúûüçñ',
+                          'αεηιουωιυιυσaaaaaeeeeiiiiooooouuuucn'),
+                '[^0-9a-zα-ω]+', ' ', 'g'))
+        $$
+    """,
+    # Το ROUND(x, ψηφία) του SQLite δέχεται και double precision
+    """
+        CREATE OR REPLACE FUNCTION round(value double precision, digits integer)
+        RETURNS double precision
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT round(value::numeric, digits)::double precision
+        $$
+    """,
+    # db.week_key_expr: Δευτέρα της εβδομάδας μιας ΕΕΕΕΜΜΗΗ (NULL αν δεν είναι έγκυρη)
+    """
+        CREATE OR REPLACE FUNCTION week_key(day integer) RETURNS integer
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        DECLARE
+            d date;
+        BEGIN
+            IF day IS NULL OR day / 10000 < 1 OR day / 100 % 100 NOT BETWEEN 1 AND 12
+               OR day % 100 NOT BETWEEN 1 AND 31 THEN
+                RETURN NULL;
+            END IF;
+            d := make_date(day / 10000, day / 100 % 100, 1) + (day % 100 - 1);
+            d := d - (extract(isodow FROM d)::integer - 1);
+            RETURN extract(year FROM d)::integer * 10000
+                 + extract(month FROM d)::integer * 100 + extract(day FROM d)::integer;
+        END
+        $$
+    """,
+)
+
+
+def _trigger(table, name, body, events):
+    return (
+        f"""
+            CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                {body}
+                RETURN NULL;
+            END
+            $$
+        """,
+        f"""
+            CREATE OR REPLACE TRIGGER {name}
+            AFTER {events} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {name}()
+        """,
+    )
+
+
+def _ledger_add(row):
+    return f"""
+        IF {row}.supplier_id IS NOT NULL THEN
+            INSERT INTO supplier_balance AS b (supplier_id, balance)
+            VALUES ({row}.supplier_id, {db.SUPPLIER_BALANCE_EXPR.format(d=row)})
+            ON CONFLICT (supplier_id) DO UPDATE SET balance = b.balance + excluded.balance;
+        END IF;
+        IF {row}.project_id IS NOT NULL THEN
+            INSERT INTO project_cost AS c (project_id, total_cost)
+            VALUES ({row}.project_id, {db.PROJECT_COST_EXPR.format(d=row)})
+            ON CONFLICT (project_id) DO UPDATE SET total_cost = c.total_cost + excluded.total_cost;
+        END IF;
+    """
+
+
+def _ledger_remove(row):
+    return f"""
+        UPDATE supplier_balance
+        SET balance = balance - ({db.SUPPLIER_BALANCE_EXPR.format(d=row)})
+        WHERE supplier_id = {row}.supplier_id;
+        UPDATE project_cost
+        SET total_cost = total_cost - ({db.PROJECT_COST_EXPR.format(d=row)})
+        WHERE project_id = {row}.project_id;
+    """
+
+
+def _stale_month(row):
+    return f"""
+        IF {row}.doc_date IS NOT NULL THEN
+            INSERT INTO stale_months (month) VALUES ({row}.doc_date / 100) ON CONFLICT DO NOTHING;
+        END IF;
+    """
+
+
+def _hours_add(row):
+    return f"""
+        IF {row}.project_id IS NOT NULL THEN
+            INSERT INTO project_hours AS h (project_id, employee, hours)
+            VALUES ({row}.project_id, coalesce({row}.employee, ''), coalesce({row}.hours, 0))
+            ON CONFLICT (project_id, employee) DO UPDATE SET hours = h.hours + excluded.hours;
+        END IF;
+    """
+
+
+def _hours_remove(row):
+    return f"""
+        UPDATE project_hours
+        SET hours = hours - coalesce({row}.hours, 0)
+        WHERE project_id = {row}.project_id AND employee = coalesce({row}.employee, '');
+    """
+
+
+def _timesheet_add(row):
+    return f"""
+        IF week_key({row}.log_date) IS NOT NULL THEN
+            INSERT INTO worklog_weeks AS w (week, employee, hours)
+            VALUES (week_key({row}.log_date), coalesce({row}.employee, ''), coalesce({row}.hours, 0))
+            ON CONFLICT (week, employee) DO UPDATE SET hours = w.hours + excluded.hours;
+            INSERT INTO worklog_months AS m (month, employee, project_id, hours)
+            VALUES ({row}.log_date / 100, coalesce({row}.employee, ''), coalesce({row}.project_id, 0),
+                    coalesce({row}.hours, 0))
+            ON CONFLICT (month, employee, project_id) DO UPDATE SET hours = m.hours + excluded.hours;
+        END IF;
+    """
+
+
+def _timesheet_remove(row):
+    return f"""
+        UPDATE worklog_weeks
+        SET hours = hours - coalesce({row}.hours, 0)
+        WHERE week = week_key({row}.log_date) AND employee = coalesce({row}.employee, '');
+        UPDATE worklog_months
+        SET hours = hours - coalesce({row}.hours, 0)
+        WHERE month = {row}.log_date / 100 AND employee = coalesce({row}.employee, '')
+          AND project_id = coalesce({row}.project_id, 0);
+    """
+
+
+def _changes(remove, add):
+    # Σώμα trigger για INSERT / DELETE / UPDATE: πρώτα αφαιρείται το OLD
+    return f"""
+        IF TG_OP <> 'INSERT' THEN
+            {remove("OLD")}
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            {add("NEW")}
+        END IF;
+    """
+
+
+TRIGGERS = (
+    _trigger(
+        "documents", "trg_documents_ledger", _changes(_ledger_remove, _ledger_add),
+        "INSERT OR DELETE OR UPDATE OF supplier_id, project_id, charge, vat, credit, payments",
+    )
+    + _trigger(
+        "documents", "trg_documents_months", _changes(_stale_month, _stale_month),
+        "INSERT OR DELETE OR UPDATE OF doc_date, project_id, supplier_id, billing_type, "
+        "charge, vat, credit, payments",
+    )
+    + _trigger(
+        "worklog", "trg_worklog_hours", _changes(_hours_remove, _hours_add),
+        "INSERT OR DELETE OR UPDATE OF project_id, employee, hours",
+    )
+    + _trigger(
+        "worklog", "trg_worklog_timesheet", _changes(_timesheet_remove, _timesheet_add),
+        "INSERT OR DELETE OR UPDATE OF log_date, employee, project_id, hours",
+    )
+)
+
+SCHEMA_V1 = (
+    tuple(schema.table_ddl(table, "postgres") for table in schema.TABLES)
+    + tuple(coalesce(schema.index_ddl(index, "postgres")) for index in schema.INDEXES)
+    + FUNCTIONS
+    + TRIGGERS
+)
+
+# Όπως το db.SCHEMA_V14· σε νέα βάση η στήλη υπάρχει ήδη από το SCHEMA_V1
+SCHEMA_V2 = (
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner TEXT",
+)
+
+# Όπως το db.SCHEMA_V15
+SCHEMA_V3 = (
+    "DROP INDEX IF EXISTS idx_projects_reg_date",
+    "DROP INDEX IF EXISTS idx_documents_date",
+    "DROP INDEX IF EXISTS idx_worklog_date",
+)
+
+# Όπως τα db.MIGRATIONS, με δική τους αρίθμηση (πίνακας schema_version)
+MIGRATIONS = (
+    (1, SCHEMA_V1),
+    (2, SCHEMA_V2),
+    (3, SCHEMA_V3),
+)
+
+
+def schema_version(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    return conn.execute("SELECT coalesce(max(version), 0) FROM schema_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    # Μία συναλλαγή για όλα (η PostgreSQL έχει συναλλαγές και στο DDL)· το
+    # advisory lock σειριοποιεί servers που ξεκινούν ταυτόχρονα.
+    applied = []
+    with conn.transaction():
+        conn.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK,))
+        current = schema_version(conn)
+        for version, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(Connection(conn))
+                else:
+                    conn.execute(step)
+            conn.execute("INSERT INTO schema_version (version) VALUES (%s)", (version,))
+            applied.append(version)
+    return applied
+
+
+# ------------------------------------------------------------
+# POOL ΣΥΝΔΕΣΕΩΝ
+# ------------------------------------------------------------
+
+class PostgresManager:
+    # Ίδια διεπαφή με το db.ConnectionManager. Κάθε ανάγνωση δανείζεται
+    # μία σύνδεση του pool για όσο διαρκεί· κάθε εγγραφή τρέχει στη δική
+    # της συναλλαγή, χωρίς ουρά: πολλές διεργασίες και servers γράφουν
+    # ταυτόχρονα και η βάση κλειδώνει ανά γραμμή. Μετά από κάθε commit οι
+    # πίνακες που άλλαξαν ανακοινώνονται (NOTIFY), ώστε οι άλλες διεργασίες
+    # να ακυρώσουν το δικό τους cache.
+
+    dialect = "postgres"
+    errors = (psycopg.Error,)
+
+    def __init__(self, url):
+        self.url = url
+        self._pool = psycopg_pool.ConnectionPool(
+            url, min_size=POOL_MIN, max_size=POOL_MAX, timeout=POOL_TIMEOUT,
+            configure=configure, name="erp_ergon", open=True,
+        )
+        self._local = threading.local()
+        self._closed = threading.Event()
+        self._listener = threading.Thread(target=self._listen, name="db-listener", daemon=True)
+        self._listener.start()
+
+    @contextmanager
+    def reading(self, query=""):
+        with self._pool.connection() as conn:
+            yield Connection(conn)
+
+    def plan(self, query, params=()):
+        with self.reading(query) as conn:
+            return [r[0] for r in conn.execute("EXPLAIN " + query, params).fetchall()]
+
+    def version(self):
+        with self._pool.connection() as conn:
+            return schema_version(conn)
+
+    # --------------------------------------------------------
+    # Εγγραφές
+    # --------------------------------------------------------
+
+    def submit(self, func, tables=(), exclusive=False, replayable=False):
+        future = Future()
+        try:
+            future.set_result(self.write(func, tables, exclusive, replayable))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def write(self, func, tables=(), exclusive=False, replayable=False):
+        # exclusive: στο SQLite σημαίνει "μόνη της, με δικές της συναλλαγές"·
+        # εδώ κάθε εγγραφή έχει ήδη δική της συναλλαγή.
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            # Εγγραφή μέσα από εργασία: στην ίδια συναλλαγή, όπως στο SQLite
+            current[1].extend(tables)
+            return func(current[0])
+        for attempt in itertools.count(1):
+            changed = list(tables)
+            try:
+                with self._pool.connection() as raw:
+                    conn = Connection(raw)
+                    self._local.current = (conn, changed)
+                    try:
+                        result = func(conn)
+                        if changed:
+                            self._notify(raw, changed)
+                    finally:
+                        self._local.current = None
+            except (psycopg.errors.DeadlockDetected, psycopg.errors.SerializationFailure):
+                # Επανάληψη μόνο για συναρτήσεις μόνο της σύνδεσης (replayable)
+                if not replayable or attempt >= WRITE_RETRIES:
+                    raise
+                time.sleep(0.05 * attempt)
+                continue
+            db.invalidate(*changed)
+            return result
+
+    def copy_rows(self, table, columns, rows):
+        # COPY FROM STDIN: η γρηγορότερη μαζική εισαγωγή (τα triggers τρέχουν κανονικά)
+        with self._pool.connection() as raw:
+            with raw.cursor() as cursor:
+                with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            if table in ID_TABLES:
+                raw.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false)"
+                    f" FROM {table}"
+                )
+            self._notify(raw, [table])
+        db.invalidate(table)
+
+    def migrate(self):
+        with self._pool.connection() as conn:
+            return apply_migrations(conn)
+
+    def close_all(self):
+        self._closed.set()
+        self._pool.close()
+
+    # --------------------------------------------------------
+    # Ακύρωση cache ανάμεσα σε διεργασίες
+    # --------------------------------------------------------
+
+    def sync_cache(self):
+        # Οι αλλαγές άλλων διεργασιών έρχονται με NOTIFY στο _listen
+        pass
+
+    def _notify(self, conn, tables):
+        # Παραδίδεται μόνο αν γίνει commit
+        expanded = db.dependent_tables(tables)
+        conn.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, f"{db.CHANGE_SOURCE}:{','.join(sorted(expanded))}"))
+
+    def _listen(self):
+        while not self._closed.is_set():
+            try:
+                with psycopg.connect(self.url, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    # Ό,τι γράφτηκε όσο δεν ακούγαμε δεν είναι γνωστό
+                    db.query_cache.clear()
+                    while not self._closed.is_set():
+                        for note in conn.notifies(timeout=1.0):
+                            source, _, tables = note.payload.partition(":")
+                            if source != db.CHANGE_SOURCE:
+                                db.query_cache.bump(tables.split(","))
+            except psycopg.Error:
+                self._closed.wait(LISTEN_RETRY)
+
+
+# ------------------------------------------------------------
+# ΜΕΤΑΦΟΡΑ ΑΠΟ SQLite
+# ------------------------------------------------------------
+
+# Τα δεδομένα μιας βάσης SQLite (τα έξι κύρια + ωριαίο κόστος) σε άδεια
+# βάση PostgreSQL. Τα συγκεντρωτικά χτίζονται από τα triggers· οι
+# εργασίες, η βάση αρχείου και τα ευρετήρια FTS δεν μεταφέρονται.
+COPY_TABLES = (
+    "clients", "suppliers", "projects", "documents", "worklog", "fee_templates", "employee_rates",
+)
+
+
+def copy_from_sqlite(path, batch_size=5000, progress=None):
+    if not os.path.exists(path):
+        raise ValueError(f"Δεν υπάρχει το αρχείο {path}.")
+    manager = db.get_manager()
+    for table in COPY_TABLES:
+        if db.fetch_all(f"SELECT 1 FROM {table} LIMIT 1", cache=False):
+            raise ValueError(f"Η βάση δεν είναι άδεια (πίνακας {table}).")
+
+    source = sqlite3.connect(path)
+    counts = {}
+    try:
+        for table in COPY_TABLES:
+            columns = [name for name, _, _ in schema.TABLES[table]["columns"]]
+            cursor = source.execute(f"SELECT {', '.join(columns)} FROM {table}")
+
+            def rows():
+                done = 0
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    yield from batch
+                    done += len(batch)
+                    counts[table] = done
+                    if progress:
+                        progress(table, done)
+
+            counts[table] = 0
+            manager.copy_rows(table, columns, rows())
+    finally:
+        source.close()
+    db.refresh_rollups()
+    return counts
@@ -0,0 +1,223 @@
+import cProfile
+import json
+import logging
+import logging.handlers
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from ergon import db
+
+# ------------------------------------------------------------
+# ΠΡΟΦΙΛ RERUN
+# ------------------------------------------------------------
+
+# Κάθε rerun της εφαρμογής μετριέται ως σύνολο και ανά ενότητα
+# (section): δημιουργία DataFrame, st.dataframe (σειριοποίηση Arrow),
+# widgets. Ο χρόνος SQL του rerun έρχεται από το db.track_query_time.
+#
+# Έξοδοι:
+#   RERUN_LOG_PATH   – μία γραμμή JSON ανά rerun (με περιστροφή)
+#   METRICS_PATH     – αθροιστικοί μετρητές σε μορφή κειμένου Prometheus
+#                      (textfile collector), ξαναγράφεται το πολύ κάθε
+#                      METRICS_INTERVAL δευτερόλεπτα
+#
+# cProfile: με ERP_ERGON_CPROFILE=<ποσοστό 0..1> ένα τυχαίο δείγμα των
+# reruns εκτελείται με cProfile και αποθηκεύεται στο PROFILES_DIR.
+
+RERUN_LOG_PATH = "render_metrics.jsonl"
+RERUN_LOG_BYTES = 5 * 1024 * 1024
+RERUN_LOG_BACKUPS = 3
+METRICS_PATH = "render_metrics.prom"
+METRICS_INTERVAL = 5.0
+CPROFILE_ENV = "ERP_ERGON_CPROFILE"
+PROFILES_DIR = "profiles"
+
+_current = threading.local()
+_lock = threading.Lock()
+_cprofile_lock = threading.Lock()
+_rerun_logger = None
+
+# {(σελίδα, ενότητα): [πλήθος, δευτερόλεπτα]}· ενότητα "" = όλο το rerun
+_totals = {}
+_sessions = set()
+_last_export = 0.0
+
+
+def cprofile_rate():
+    try:
+        return min(max(float(os.environ.get(CPROFILE_ENV, "0")), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+
+@contextmanager
+def section(name):
+    # Οι ενότητες φωλιάζουν: "reports/period/frame". Έξω από rerun (π.χ.
+    # manage.py, bench) δεν καταγράφεται τίποτα.
+    record = getattr(_current, "record", None)
+    if record is None:
+        yield
+        return
+    stack = _current.stack
+    stack.append(name)
+    path = "/".join(stack)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        stack.pop()
+        record["sections"][path] = record["sections"].get(path, 0.0) + elapsed
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        return None
+    return ctx.session_id if ctx is not None else None
+
+
+@contextmanager
+def rerun(page):
+    reruns = st.session_state.get("rerun_count", 0) + 1
+    st.session_state["rerun_count"] = reruns
+    record = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "session": (_session_id() or "")[:8],
+        "rerun": reruns,
+        "page": page,
+        "sections": {},
+    }
+    _current.record = record
+    _current.stack = []
+    sql = db.track_query_time()
+
+    profile = None
+    rate = cprofile_rate()
+    # Ένας μόνο cProfile τη φορά σε όλη τη διεργασία
+    if rate and random.random() < rate and _cprofile_lock.acquire(blocking=False):
+        profile = cProfile.Profile()
+        profile.enable()
+
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if profile is not None:
+            profile.disable()
+            _cprofile_lock.release()
+            record["cprofile"] = _dump_profile(profile, record)
+        record["sql_queries"] = sql[0]
+        record["sql_ms"] = round(sql[1], 2)
+        record["sections"] = {k: round(v, 2) for k, v in record["sections"].items()}
+        _current.record = None
+        _finish(record)
+
+
+def _dump_profile(profile, record):
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    session = "".join(c for c in record["session"] if c.isalnum()) or "x"
+    path = os.path.join(PROFILES_DIR, f"{record['page']}-{stamp}-{session}.prof")
+    profile.dump_stats(path)
+    return path
+
+
+# ------------------------------------------------------------
+# ΕΞΑΓΩΓΗ ΜΕΤΡΗΣΕΩΝ
+# ------------------------------------------------------------
+
+def _get_rerun_logger():
+    global _rerun_logger
+    if _rerun_logger is None:
+        with _lock:
+            if _rerun_logger is None:
+                logger = logging.getLogger("erp_ergon.reruns")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                handler = logging.handlers.RotatingFileHandler(
+                    RERUN_LOG_PATH, maxBytes=RERUN_LOG_BYTES,
+                    backupCount=RERUN_LOG_BACKUPS, encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                _rerun_logger = logger
+    return _rerun_logger
+
+
+def _add(key, seconds):
+    entry = _totals.setdefault(key, [0, 0.0])
+    entry[0] += 1
+    entry[1] += seconds
+
+
+def _finish(record):
+    global _last_export
+    _get_rerun_logger().info(json.dumps(record, ensure_ascii=False))
+
+    page = record["page"]
+    with _lock:
+        if record["session"]:
+            _sessions.add(record["session"])
+        _add((page, ""), record["total_ms"] / 1000)
+        _add((page, "sql"), record["sql_ms"] / 1000)
+        for path, ms in record["sections"].items():
+            _add((page, path), ms / 1000)
+        now = time.monotonic()
+        if now - _last_export < METRICS_INTERVAL:
+            return
+        _last_export = now
+        text = prometheus_text()
+    _write_atomic(METRICS_PATH, text)
+
+
+def summary():
+    # [(σελίδα, ενότητα, πλήθος, μέσος ms)] για τη σελίδα Διαγνωστικά
+    with _lock:
+        items = sorted(_totals.items())
+    return [(page, path or "(όλο το rerun)", count, 1000 * seconds / count)
+            for (page, path), (count, seconds) in items]
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text():
+    # Καλείται με το _lock κρατημένο
+    lines = [
+        "# HELP erp_ergon_sessions Sessions που έχουν κάνει rerun από την εκκίνηση.",
+        "# TYPE erp_ergon_sessions gauge",
+        f"erp_ergon_sessions {len(_sessions)}",
+        "# HELP erp_ergon_rerun_seconds Χρόνος rerun ανά σελίδα.",
+        "# TYPE erp_ergon_rerun_seconds summary",
+    ]
+    for (page, path), (count, seconds) in sorted(_totals.items()):
+        if path == "":
+            lines.append(f'erp_ergon_rerun_seconds_sum{{page="{_label(page)}"}} {seconds:.6f}')
+            lines.append(f'erp_ergon_rerun_seconds_count{{page="{_label(page)}"}} {count}')
+    lines.append("# HELP erp_ergon_section_seconds Χρόνος ενότητας σελίδας (sql = ερωτήματα).")
+    lines.append("# TYPE erp_ergon_section_seconds summary")
+    for (page, path), (count, seconds) in sorted(_totals.items()):
+        if path:
+            labels = f'page="{_label(page)}",section="{_label(path)}"'
+            lines.append(f"erp_ergon_section_seconds_sum{{{labels}}} {seconds:.6f}")
+            lines.append(f"erp_ergon_section_seconds_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    # Ο scraper δεν πρέπει να δει ποτέ μισογραμμένο αρχείο
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
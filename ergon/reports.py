@@ -0,0 +1,677 @@
+from datetime import date, timedelta
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# ΠΕΡΙΟΔΙΚΕΣ ΑΝΑΦΟΡΕΣ (μήνας / τρίμηνο / έτος)
+# ------------------------------------------------------------
+
+# Οι κλειστοί μήνες διαβάζονται από το document_months (db.py)· μόνο ο
+# ανοιχτός μήνας και οι μισοί μήνες στις άκρες του εύρους υπολογίζονται
+# ζωντανά από τα documents, με εύρος στο idx_documents_list. Με
+# archived=True προστίθενται τα αρχειοθετημένα παραστατικά (archive.py),
+# πάντα ζωντανά από το archive.documents.
+
+PERIODS = {
+    "month": {
+        "label": "Μήνας",
+        "expr": "r.month",
+        "format": lambda k: f"{k % 100:02d}/{k // 100}",
+    },
+    "quarter": {
+        "label": "Τρίμηνο",
+        "expr": "(r.month / 100) * 10 + ((r.month % 100) + 2) / 3",
+        "format": lambda k: f"Τ{k % 10} {k // 10}",
+    },
+    "year": {
+        "label": "Έτος",
+        "expr": "r.month / 100",
+        "format": lambda k: str(k),
+    },
+}
+
+# Ανάλυση ανά διάσταση: (κλειδί, ετικέτα, JOIN για την ετικέτα)
+GROUPS = {
+    None: {
+        "label": "Χωρίς ανάλυση",
+        "key": "NULL",
+        "name": "NULL",
+        "join": "",
+    },
+    "project": {
+        "label": "Έργο",
+        "key": "r.project_id",
+        "name": "CASE WHEN r.project_id = 0 THEN '(χωρίς έργο)'"
+                " ELSE IFNULL(p.code, '') || ' : ' || IFNULL(p.employer_name, '') END",
+        "join": "LEFT JOIN projects p ON p.id = r.project_id",
+        # Δύο JOIN στα PRIMARY KEY (όχι UNION των έργων, που δεν έχει index)
+        "archive_name": "CASE WHEN r.project_id = 0 THEN '(χωρίς έργο)'"
+                        " ELSE IFNULL(IFNULL(p.code, ap.code), '') || ' : '"
+                        " || IFNULL(IFNULL(p.employer_name, ap.employer_name), '') END",
+        "archive_join": "LEFT JOIN projects p ON p.id = r.project_id"
+                        " LEFT JOIN archive.projects ap ON ap.id = r.project_id",
+    },
+    "supplier": {
+        "label": "Προμηθευτής",
+        "key": "r.supplier_id",
+        "name": "CASE WHEN r.supplier_id = 0 THEN '(χωρίς προμηθευτή)'"
+                " ELSE IFNULL(s.company_name, 'Προμηθευτής ' || s.id) END",
+        "join": "LEFT JOIN suppliers s ON s.id = r.supplier_id",
+    },
+    "billing_type": {
+        "label": "Τιμολόγηση",
+        "key": "r.billing_type",
+        "name": "CASE WHEN r.billing_type = '' THEN '(χωρίς)' ELSE r.billing_type END",
+        "join": "",
+    },
+}
+
+# Μεγέθη σε λεπτά €. balance = ό,τι έμεινε απλήρωτο μέσα στην περίοδο.
+MEASURES = {
+    "charge": ("Χρεώσεις (€)", "SUM(r.charge)"),
+    "vat": ("ΦΠΑ (€)", "SUM(r.vat)"),
+    "credit": ("Πιστώσεις (€)", "SUM(r.credit)"),
+    "payments": ("Καταβολές (€)", "SUM(r.payments)"),
+    "balance": ("Υπόλοιπο περιόδου (€)", "SUM(r.charge + r.vat - r.credit - r.payments)"),
+    "docs": ("Παραστατικά", "SUM(r.docs)"),
+}
+
+
+def next_month(month):
+    return month + 89 if month % 100 == 12 else month + 1
+
+
+def month_ranges(start, end, open_month):
+    # Χωρίζει το εύρος [start, end] (ΕΕΕΕΜΜΗΗ) σε πλήρεις κλειστούς μήνες
+    # [first, stop) από το rollup και εύρη ημερών για ζωντανό υπολογισμό.
+    first = start // 100 if start % 100 == 1 else next_month(start // 100)
+    last_day = db.from_day_key(end)
+    ends_month = (last_day + timedelta(days=1)).month != last_day.month
+    stop = next_month(end // 100) if ends_month else end // 100
+    stop = min(stop, open_month)
+    if first >= stop:
+        return None, [(start, end)]
+
+    live = []
+    if start < first * 100 + 1:
+        live.append((start, first * 100))
+    if stop * 100 + 1 <= end:
+        live.append((stop * 100 + 1, end))
+    return (first, stop), live
+
+
+def period_report(start, end, period="month", group=None, open_month=None, archived=False):
+    # start/end: date. Επιστρέφει pyarrow.Table με περίοδο, ανάλυση και
+    # μεγέθη (ετικέτες στα metadata, βλ. db.column_labels).
+    import pyarrow as pa
+
+    open_month = open_month or db.month_key(date.today())
+    db.refresh_rollups(open_month)
+
+    start_key, end_key = db.to_day_key(start), db.to_day_key(end)
+    closed, live = month_ranges(start_key, end_key, open_month)
+
+    branches = []
+    params = []
+    if closed:
+        branches.append("""
+            SELECT month, project_id, supplier_id, billing_type,
+                   charge, vat, credit, payments, docs
+            FROM document_months
+            WHERE month >= ? AND month < ?
+        """)
+        params.extend(closed)
+    for lo, hi in live:
+        branches.append(db.ROLLUP_SELECT)
+        params.extend((lo, hi))
+    archived = archived and db.archive_exists()
+    if archived:
+        branches.append(db.ROLLUP_SELECT_FROM.format(documents=f"{db.ARCHIVE_SCHEMA}.documents"))
+        params.extend((start_key, end_key))
+
+    p, g = PERIODS[period], GROUPS[group]
+    join = g.get("archive_join", g["join"]) if archived else g["join"]
+    name = g.get("archive_name", g["name"]) if archived else g["name"]
+    measures = ", ".join(f"{expr} AS {key}" for key, (_, expr) in MEASURES.items())
+    labels = {key: label for key, (label, _) in MEASURES.items()}
+    labels.update({"period": p["label"], "grp_name": g["label"]})
+    table = db.fetch_columns(f"""
+        WITH r AS ({" UNION ALL ".join(branches)})
+        SELECT {p["expr"]} AS period, {g["key"]} AS grp, {name} AS grp_name,
+               {measures}
+        FROM r
+        {join}
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 3
+    """, tuple(params))
+
+    periods = [None if k is None else p["format"](k) for k in table.column("period").to_pylist()]
+    table = table.set_column(0, "period", pa.array(periods, type=pa.string()))
+    table = table.drop_columns(["grp"] if group else ["grp", "grp_name"])
+    return db.with_labels(table, labels)
+
+
+# ------------------------------------------------------------
+# ΚΕΡΔΟΦΟΡΙΑ ΕΡΓΩΝ
+# ------------------------------------------------------------
+
+# Κόστος έργου = παραστατικά (χρέωση+ΦΠΑ, από το project_cost) + ώρες
+# × ωριαίο κόστος υπαλλήλου (project_hours × employee_rates). Όλα τα
+# μεγέθη υπολογίζονται στο SQL, σε λεπτά €. Τα αρχειοθετημένα έργα δεν
+# έχουν συγκεντρωτικά· τα κόστη τους αθροίζονται από το archive.documents /
+# archive.worklog, μόνο όταν ζητηθούν.
+
+PROFITABILITY_TEMPLATE = """
+    WITH labour AS (
+        SELECT h.project_id,
+               SUM(h.hours) AS hours,
+               CAST(ROUND(SUM(h.hours * IFNULL(er.hourly_rate, 0))) AS INTEGER) AS labour_cost,
+               SUM(CASE WHEN er.employee IS NULL THEN h.hours ELSE 0 END) AS unrated_hours
+        FROM project_hours h
+        LEFT JOIN employee_rates er ON er.employee = h.employee
+        GROUP BY h.project_id
+    ),
+    costs AS (
+        SELECT p.id, p.code, p.employer_name, p.status, p.engineer, p.manager, p.reg_date,
+               IFNULL(p.agreed_amount, 0) AS agreed_amount,
+               IFNULL(pc.total_cost, 0) AS doc_cost,
+               IFNULL(l.hours, 0) AS hours,
+               IFNULL(l.labour_cost, 0) AS labour_cost,
+               IFNULL(l.unrated_hours, 0) AS unrated_hours
+        FROM projects p
+        LEFT JOIN project_cost pc ON pc.project_id = p.id
+        LEFT JOIN labour l ON l.project_id = p.id
+        {archived}
+    )
+    SELECT id, code, employer_name, status, engineer, manager, reg_date,
+           agreed_amount, doc_cost, hours, labour_cost,
+           doc_cost + labour_cost AS total_cost,
+           agreed_amount - doc_cost - labour_cost AS margin,
+           CASE WHEN agreed_amount > 0
+                THEN ROUND(100.0 * (agreed_amount - doc_cost - labour_cost) / agreed_amount, 1)
+           END AS margin_pct,
+           unrated_hours
+    FROM costs
+"""
+
+ARCHIVED_COSTS_SQL = f"""
+        UNION ALL
+        SELECT p.id, p.code, p.employer_name, p.status, p.engineer, p.manager, p.reg_date,
+               IFNULL(p.agreed_amount, 0),
+               IFNULL(dc.doc_cost, 0),
+               IFNULL(l.hours, 0),
+               IFNULL(l.labour_cost, 0),
+               IFNULL(l.unrated_hours, 0)
+        FROM archive.projects p
+        LEFT JOIN (
+            SELECT d.project_id, SUM({db.PROJECT_COST_EXPR.format(d="d")}) AS doc_cost
+            FROM archive.documents d
+            GROUP BY d.project_id
+        ) dc ON dc.project_id = p.id
+        LEFT JOIN (
+            SELECT w.project_id,
+                   SUM(IFNULL(w.hours, 0)) AS hours,
+                   CAST(ROUND(SUM(IFNULL(w.hours, 0) * IFNULL(er.hourly_rate, 0))) AS INTEGER) AS labour_cost,
+                   SUM(CASE WHEN er.employee IS NULL THEN IFNULL(w.hours, 0) ELSE 0 END) AS unrated_hours
+            FROM archive.worklog w
+            LEFT JOIN employee_rates er ON er.employee = IFNULL(w.employee, '')
+            GROUP BY w.project_id
+        ) l ON l.project_id = p.id
+"""
+
+PROFITABILITY_SQL = PROFITABILITY_TEMPLATE.format(archived="")
+
+
+def profitability_sql(archived=False):
+    if archived and db.archive_exists():
+        return PROFITABILITY_TEMPLATE.format(archived=ARCHIVED_COSTS_SQL)
+    return PROFITABILITY_SQL
+
+PROFITABILITY_COLUMNS = (
+    "id", "code", "employer_name", "status", "engineer", "manager", "reg_date",
+    "agreed_amount", "doc_cost", "hours", "labour_cost", "total_cost",
+    "margin", "margin_pct", "unrated_hours",
+)
+
+PROFITABILITY_FILTERS = {
+    "status": "Κατάσταση",
+    "engineer": "Μηχανικός",
+    "manager": "Μάνος-Θανάσης",
+}
+
+PROFITABILITY_SORTS = {
+    "reg_date": "Ημ/νια εγγραφής",
+    "margin": "Περιθώριο",
+    "margin_pct": "Περιθώριο %",
+    "total_cost": "Συνολικό κόστος",
+    "agreed_amount": "Συμφωνημένη Αξία",
+    "hours": "Ώρες",
+}
+
+PROFITABILITY_LABELS = {
+    "code": "Κωδ. έργου",
+    "employer_name": "Εργοδότης",
+    "status": "Κατάσταση",
+    "engineer": "Μηχανικός",
+    "manager": "Μάνος-Θανάσης",
+    "reg_date": "Ημ/νια εγγραφής",
+    "agreed_amount": "Συμφωνημένη Αξία (€)",
+    "doc_cost": "Χρεώσεις+ΦΠΑ (€)",
+    "hours": "Ώρες",
+    "labour_cost": "Κόστος εργασίας (€)",
+    "total_cost": "Συνολικό κόστος (€)",
+    "margin": "Περιθώριο (€)",
+    "margin_pct": "Περιθώριο %",
+}
+
+
+def profitability_options(column, archived=False):
+    source = "projects"
+    if archived and db.archive_exists():
+        source = f"(SELECT {column} FROM projects UNION SELECT {column} FROM archive.projects) p"
+    rows = db.fetch_all(f"""
+        SELECT DISTINCT {column} AS v FROM {source}
+        WHERE {column} IS NOT NULL AND {column} <> ''
+        ORDER BY v
+    """)
+    return [r["v"] for r in rows]
+
+
+def project_profitability(filters=None, sort="reg_date", descending=True, archived=False):
+    clauses = []
+    params = []
+    for column, value in (filters or {}).items():
+        if column in PROFITABILITY_FILTERS and value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    direction = "DESC" if descending else "ASC"
+    if sort not in PROFITABILITY_SORTS:
+        sort = "reg_date"
+
+    return db.fetch_columns(f"""
+        SELECT {", ".join(PROFITABILITY_COLUMNS)} FROM ({profitability_sql(archived)}) p
+        {where}
+        ORDER BY {sort} IS NULL, {sort} {direction}, id {direction}
+    """, tuple(params), labels=PROFITABILITY_LABELS)
+
+
+def unrated_employees():
+    # Υπάλληλοι με ώρες σε έργα αλλά χωρίς ωριαίο κόστος
+    rows = db.fetch_all("""
+        SELECT h.employee, SUM(h.hours) AS hours
+        FROM project_hours h
+        LEFT JOIN employee_rates er ON er.employee = h.employee
+        WHERE er.employee IS NULL AND h.hours <> 0
+        GROUP BY h.employee
+        ORDER BY h.employee
+    """)
+    return [(r["employee"], r["hours"]) for r in rows]
+
+
+def employee_rates():
+    # Όλοι οι υπάλληλοι του ημερολογίου, με την τιμή τους αν υπάρχει
+    return db.fetch_columns("""
+        SELECT e.employee, er.hourly_rate
+        FROM (
+            SELECT DISTINCT employee FROM project_hours WHERE employee <> ''
+            UNION
+            SELECT employee FROM employee_rates
+        ) e
+        LEFT JOIN employee_rates er ON er.employee = e.employee
+        ORDER BY e.employee
+    """)
+
+
+def save_employee_rates(rates):
+    # rates: {υπάλληλος: € ανά ώρα ή None για διαγραφή}
+    def save(conn):
+        conn.executemany("""
+            INSERT INTO employee_rates (employee, hourly_rate) VALUES (?, ?)
+            ON CONFLICT(employee) DO UPDATE SET hourly_rate = excluded.hourly_rate
+        """, [(e, db.to_cents(r)) for e, r in rates.items() if r is not None])
+        conn.executemany(
+            "DELETE FROM employee_rates WHERE employee = ?",
+            [(e,) for e, r in rates.items() if r is None]
+        )
+    db.write(save, "employee_rates", replayable=True)
+
+
+# ------------------------------------------------------------
+# ΥΠΟΛΟΙΠΑ ΠΡΟΜΗΘΕΥΤΩΝ / ΚΟΣΤΗ ΕΡΓΩΝ
+# ------------------------------------------------------------
+
+def supplier_balances(archived=False):
+    # Το supplier_balance καλύπτει μόνο την κύρια βάση· με archived=True
+    # προστίθενται τα αρχειοθετημένα παραστατικά κάθε προμηθευτή.
+    archive_join, archive_balance = "", ""
+    if archived and db.archive_exists():
+        archive_join = f"""
+            LEFT JOIN (
+                SELECT d.supplier_id, SUM({db.SUPPLIER_BALANCE_EXPR.format(d="d")}) AS balance
+                FROM archive.documents d
+                WHERE d.supplier_id IS NOT NULL
+                GROUP BY d.supplier_id
+            ) a ON a.supplier_id = s.id
+        """
+        archive_balance = " + IFNULL(a.balance, 0)"
+    return db.fetch_columns(f"""
+        SELECT s.company_name,
+               IFNULL(b.balance, 0){archive_balance} AS balance
+        FROM suppliers s
+        LEFT JOIN supplier_balance b ON b.supplier_id = s.id
+        {archive_join}
+        ORDER BY s.company_name
+    """, labels={
+        "company_name": "Προμηθευτής",
+        "balance": "Υπόλοιπο (€)"
+    })
+
+
+def project_costs(archived=False):
+    archive_union = ""
+    if archived and db.archive_exists():
+        archive_union = f"""
+            UNION ALL
+            SELECT p.id, p.code, p.employer_name, p.reg_date,
+                   (SELECT IFNULL(SUM({db.PROJECT_COST_EXPR.format(d="d")}), 0)
+                    FROM archive.documents d WHERE d.project_id = p.id)
+            FROM archive.projects p
+        """
+    return db.fetch_columns(f"""
+        SELECT code, employer_name, total_cost FROM (
+            SELECT p.id, p.code, p.employer_name, p.reg_date,
+                   IFNULL(pc.total_cost, 0) AS total_cost
+            FROM projects p
+            LEFT JOIN project_cost pc ON pc.project_id = p.id
+            {archive_union}
+        ) c
+        ORDER BY IFNULL(reg_date,0) DESC, id DESC
+    """, labels={
+        "code": "Κωδ. έργου",
+        "employer_name": "Εργοδότης",
+        "total_cost": "Σύνολο Χρεώσεων+ΦΠΑ (€)"
+    })
+
+
+# ------------------------------------------------------------
+# ΚΑΡΤΕΛΑ ΠΡΟΜΗΘΕΥΤΗ
+# ------------------------------------------------------------
+
+# Κάθε παραστατικό του προμηθευτή με προοδευτικό υπόλοιπο (SUM ... OVER).
+# Σελιδοποίηση keyset στο idx_documents_supplier_statement: κάθε σελίδα
+# ξεκινά από το υπόλοιπο όπου τελείωσε η προηγούμενη, και η πρώτη από το
+# υπόλοιπο έναρξης, το άθροισμα όσων προηγούνται του εύρους (μόνο από το
+# index). Τα παραστατικά χωρίς ημερομηνία μετράνε ως 0, πριν από όλα.
+
+STATEMENT_PAGE_SIZE = 100
+
+STATEMENT_LABELS = {
+    "doc_date": "Ημ/νία",
+    "project_code": "Κωδ. έργου",
+    "work_title": "Εργασία",
+    "billing_type": "Τιμολόγηση",
+    "charge": "Χρέωση (€)",
+    "vat": "ΦΠΑ (€)",
+    "credit": "Πίστωση (€)",
+    "payments": "Καταβολές (€)",
+    "balance": "Υπόλοιπο (€)",
+}
+
+STATEMENT_DOCUMENT_COLUMNS = (
+    "id, doc_date, project_id, supplier_id, work_title, billing_type, charge, vat, credit, payments"
+)
+
+
+def _statement_sources(archived):
+    # (παραστατικά, JOIN έργων, κωδικός έργου)· με το αρχείο, ένωση των
+    # παραστατικών και δεύτερο JOIN στο archive.projects.
+    if archived and db.archive_exists():
+        return (
+            f"""(SELECT {STATEMENT_DOCUMENT_COLUMNS} FROM documents
+                 UNION ALL
+                 SELECT {STATEMENT_DOCUMENT_COLUMNS} FROM archive.documents)""",
+            """LEFT JOIN projects p ON p.id = d.project_id
+               LEFT JOIN archive.projects ap ON ap.id = d.project_id""",
+            "IFNULL(p.code, ap.code)",
+        )
+    return "documents", "LEFT JOIN projects p ON p.id = d.project_id", "p.code"
+
+
+def _statement_range(start, end):
+    return (
+        db.to_day_key(start) if start else 0,
+        db.to_day_key(end) if end else 99991231,
+    )
+
+
+def statement_totals(supplier_id, start=None, end=None, archived=False):
+    # (υπόλοιπο έναρξης, υπόλοιπο τέλους, πλήθος παραστατικών) του εύρους
+    documents, _, _ = _statement_sources(archived)
+    lo, hi = _statement_range(start, end)
+    amount = db.SUPPLIER_BALANCE_EXPR.format(d="d")
+    row = db.fetch_all(f"""
+        SELECT IFNULL(SUM(CASE WHEN IFNULL(d.doc_date,0) < ? THEN {amount} END), 0) AS opening,
+               IFNULL(SUM(CASE WHEN IFNULL(d.doc_date,0) <= ? THEN {amount} END), 0) AS closing,
+               COUNT(CASE WHEN IFNULL(d.doc_date,0) >= ? THEN 1 END) AS docs
+        FROM {documents} d
+        WHERE d.supplier_id = ? AND IFNULL(d.doc_date,0) <= ?
+    """, (lo, hi, lo, supplier_id, hi))[0]
+    return row["opening"], row["closing"], row["docs"]
+
+
+def _statement_sql(archived, keyset=False, limit=False):
+    documents, projects, project_code = _statement_sources(archived)
+    # Το όριο στην πρώτη στήλη κάνει τη σύγκριση γραμμών seek στο index
+    # (όπως στο listing.fetch_page)
+    after = "AND IFNULL(d.doc_date,0) >= ? AND (IFNULL(d.doc_date,0), d.id) > (?, ?)" if keyset else ""
+    return f"""
+        SELECT r.id, r.doc_date, r.project_code, r.work_title, r.billing_type,
+               r.charge, r.vat, r.credit, r.payments,
+               ? + SUM({db.SUPPLIER_BALANCE_EXPR.format(d="r")})
+                   OVER (ORDER BY r.k, r.id ROWS UNBOUNDED PRECEDING) AS balance,
+               r.k AS _k0, r.id AS _k1
+        FROM (
+            SELECT d.id, d.doc_date, IFNULL(d.doc_date,0) AS k,
+                   {project_code} AS project_code, d.work_title, d.billing_type,
+                   d.charge, d.vat, d.credit, d.payments
+            FROM {documents} d
+            {projects}
+            WHERE d.supplier_id = ? AND IFNULL(d.doc_date,0) BETWEEN ? AND ? {after}
+            ORDER BY IFNULL(d.doc_date,0), d.id
+            {"LIMIT ?" if limit else ""}
+        ) r
+        ORDER BY r.k, r.id
+    """
+
+
+def supplier_statement(supplier_id, start=None, end=None, after=None, opening=0,
+                       page_size=STATEMENT_PAGE_SIZE, archived=False):
+    # after/opening: κλειδί και υπόλοιπο της τελευταίας γραμμής της
+    # προηγούμενης σελίδας. Επιστρέφει (pyarrow.Table, κλειδί τελευταίας
+    # γραμμής, υπόλοιπο τελευταίας γραμμής, υπάρχει επόμενη σελίδα).
+    lo, hi = _statement_range(start, end)
+    params = [opening, supplier_id, lo, hi]
+    if after is not None:
+        params.append(after[0])
+        params.extend(after)
+    params.append(page_size + 1)
+    table = db.fetch_columns(
+        _statement_sql(archived, keyset=after is not None, limit=True),
+        tuple(params), labels=STATEMENT_LABELS
+    )
+
+    has_next = table.num_rows > page_size
+    table = table.slice(0, page_size)
+    last_key, closing = None, opening
+    if table.num_rows:
+        last_key = (table.column("_k0")[-1].as_py(), table.column("_k1")[-1].as_py())
+        # Τα ποσά έρχονται σε € (db.CENT_COLUMNS)· το υπόλοιπο μένει σε λεπτά
+        closing = db.to_cents(table.column("balance")[-1].as_py())
+    return table.drop_columns(["id", "_k0", "_k1"]), last_key, closing, has_next
+
+
+def statement_export_query(supplier_id, start=None, end=None, archived=False):
+    # (ερώτημα, παράμετροι) για το exporter: όλο το εύρος σε ένα πέρασμα
+    lo, hi = _statement_range(start, end)
+    opening, _, _ = statement_totals(supplier_id, start, end, archived)
+    return _statement_sql(archived), (opening, supplier_id, lo, hi)
+
+
+# ------------------------------------------------------------
+# ΩΡΕΣ ΠΡΟΣΩΠΙΚΟΥ
+# ------------------------------------------------------------
+
+# Από τα worklog_weeks / worklog_months (db.py), που ενημερώνονται από
+# triggers σε κάθε εγγραφή του ημερολογίου· κανένα ερώτημα δεν διαβάζει
+# το worklog. Το εύρος στρογγυλεύεται σε ολόκληρες εβδομάδες (Δευτέρα -
+# Κυριακή) ή μήνες. Στόχος = ώρες ανά εβδομάδα· για μήνα, αναλογικά με
+# τις εργάσιμες (Δευτέρα - Παρασκευή) ημέρες του.
+
+WEEKLY_TARGET_HOURS = 40
+PIVOT_PROJECTS = 15
+
+TIMESHEET_PERIODS = {
+    "week": {
+        "label": "Εβδομάδα",
+        "format": lambda k: f"{k % 100:02d}/{k // 100 % 100:02d}/{k // 10000}",
+    },
+    "month": {
+        "label": "Μήνας",
+        "format": lambda k: f"{k % 100:02d}/{k // 100}",
+    },
+}
+
+TIMESHEET_LABELS = {
+    "period": "Περίοδος",
+    "employee": "Υπάλληλος",
+    "hours": "Ώρες",
+    "target": "Στόχος (ώρες)",
+    "utilisation": "Αξιοποίηση %",
+    "projects": "Έργα",
+}
+
+PROJECT_HOURS_LABELS = {
+    "code": "Κωδ. έργου",
+    "employer_name": "Εργοδότης",
+    "status": "Κατάσταση",
+    "hours": "Ώρες",
+    "employees": "Υπάλληλοι",
+}
+
+
+def timesheet_range(start, end, period):
+    # (πρώτη, τελευταία) ημερομηνία των ολόκληρων περιόδων που καλύπτουν το εύρος
+    if period == "week":
+        return start - timedelta(days=start.weekday()), end + timedelta(days=6 - end.weekday())
+    last = date(end.year + end.month // 12, end.month % 12 + 1, 1) - timedelta(days=1)
+    return start.replace(day=1), last
+
+
+def _workdays(first, last):
+    days = (last - first).days + 1
+    weeks, rest = divmod(days, 7)
+    return weeks * 5 + sum((first.weekday() + i) % 7 < 5 for i in range(rest))
+
+
+def _period_target(key, period, weekly):
+    if period == "week":
+        return weekly
+    first = date(key // 100, key % 100, 1)
+    _, last = timesheet_range(first, first, "month")
+    return weekly * _workdays(first, last) / 5
+
+
+def range_target(start, end, period, weekly=WEEKLY_TARGET_HOURS):
+    first, last = timesheet_range(start, end, period)
+    return weekly * _workdays(first, last) / 5
+
+
+def _timesheet_source(start, end, period):
+    # (ερώτημα FROM, παράμετροι) για τα rollups του εύρους
+    first, last = timesheet_range(start, end, period)
+    if period == "week":
+        return "worklog_weeks t WHERE t.week BETWEEN ? AND ?", "t.week", (
+            db.to_day_key(first), db.to_day_key(last)
+        )
+    return "worklog_months t WHERE t.month BETWEEN ? AND ?", "t.month", (
+        db.month_key(first), db.month_key(last)
+    )
+
+
+def employee_hours(start, end, period="week", weekly=WEEKLY_TARGET_HOURS):
+    # Ώρες ανά υπάλληλο και περίοδο, με στόχο και αξιοποίηση
+    import pyarrow as pa
+
+    source, key, params = _timesheet_source(start, end, period)
+    table = db.fetch_columns(f"""
+        SELECT {key} AS period, t.employee, SUM(t.hours) AS hours
+        FROM {source} AND t.employee <> ''
+        GROUP BY 1, 2
+        HAVING ABS(SUM(t.hours)) > 1e-9
+        ORDER BY 1, 2
+    """, params)
+
+    p = TIMESHEET_PERIODS[period]
+    keys = table.column("period").to_pylist()
+    hours = table.column("hours").to_pylist()
+    targets = [_period_target(k, period, weekly) for k in keys]
+    utilisation = [round(100 * h / t, 1) if t else None for h, t in zip(hours, targets)]
+    table = table.set_column(0, "period", pa.array([p["format"](k) for k in keys], type=pa.string()))
+    table = table.append_column("target", pa.array(targets, type=pa.float64()))
+    table = table.append_column("utilisation", pa.array(utilisation, type=pa.float64()))
+    return db.with_labels(table, dict(TIMESHEET_LABELS, period=p["label"]))
+
+
+def project_hours_by_range(start, end):
+    # Ώρες ανά έργο στους ολόκληρους μήνες του εύρους
+    source, _, params = _timesheet_source(start, end, "month")
+    return db.fetch_columns(f"""
+        SELECT h.project_id, p.code, p.employer_name, p.status, h.hours, h.employees
+        FROM (
+            SELECT t.project_id, SUM(t.hours) AS hours,
+                   COUNT(DISTINCT NULLIF(t.employee, '')) AS employees
+            FROM {source}
+            GROUP BY t.project_id
+            HAVING ABS(SUM(t.hours)) > 1e-9
+        ) h
+        LEFT JOIN projects p ON p.id = h.project_id
+        ORDER BY h.hours DESC, h.project_id
+    """, params, labels=PROJECT_HOURS_LABELS)
+
+
+def employee_project_pivot(start, end, weekly=WEEKLY_TARGET_HOURS, limit=PIVOT_PROJECTS):
+    # Υπάλληλοι × έργα (τα limit έργα με τις περισσότερες ώρες, τα
+    # υπόλοιπα σε μία στήλη), με σύνολο και αξιοποίηση του εύρους.
+    projects = project_hours_by_range(start, end).slice(0, limit)
+    ids = projects.column("project_id").to_pylist()
+    names = [
+        "(χωρίς έργο)" if pid == 0 else code or str(pid)
+        for pid, code in zip(ids, projects.column("code").to_pylist())
+    ]
+
+    source, _, params = _timesheet_source(start, end, "month")
+    columns = [f"SUM(CASE WHEN t.project_id = ? THEN t.hours END) AS p{i}" for i in range(len(ids))]
+    others = "t.project_id NOT IN (" + ", ".join("?" * len(ids)) + ")" if ids else "1 = 1"
+    columns.append(f"SUM(CASE WHEN {others} THEN t.hours END) AS others")
+    target = range_target(start, end, "month", weekly)
+    table = db.fetch_columns(f"""
+        SELECT t.employee, {", ".join(columns)}, SUM(t.hours) AS hours,
+               CASE WHEN ? > 0 THEN ROUND(100.0 * SUM(t.hours) / ?, 1) END AS utilisation
+        FROM {source} AND t.employee <> ''
+        GROUP BY t.employee
+        HAVING ABS(SUM(t.hours)) > 1e-9
+        ORDER BY t.employee
+    """, tuple(ids) + tuple(ids) + (target, target) + params)
+
+    labels = {f"p{i}": name for i, name in enumerate(names)}
+    labels.update({
+        "employee": TIMESHEET_LABELS["employee"],
+        "others": "Λοιπά έργα",
+        "hours": "Σύνολο ωρών",
+        "utilisation": TIMESHEET_LABELS["utilisation"],
+    })
+    if table.num_rows and table.column("others").null_count == table.num_rows:
+        table = table.drop_columns(["others"])
+    return db.with_labels(table, labels), target
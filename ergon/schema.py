@@ -0,0 +1,327 @@
+import re
+
+# ------------------------------------------------------------
+# ΦΟΡΗΤΟ ΣΧΗΜΑ (SQLite / PostgreSQL)
+# ------------------------------------------------------------
+
+# Ένας ορισμός ανά πίνακα, με ουδέτερους τύπους που αντιστοιχίζονται ανά
+# διάλεκτο (COLUMN_TYPES). Οι βάσεις SQLite φτάνουν σε αυτό το σχήμα μέσω
+# των migrations του db.py (το ιστορικό τους μένει ως έχει) και το
+# `manage.py check-schema` ελέγχει ότι συμφωνούν· η PostgreSQL το
+# δημιουργεί απευθείας από εδώ (postgres.py). Εκτός μένουν τα ευρετήρια
+# FTS5 και το db_changes, που υπάρχουν μόνο στη SQLite.
+#
+# Στήλη: (όνομα, τύπος, περιορισμοί)
+
+DIALECTS = ("sqlite", "postgres")
+
+COLUMN_TYPES = {
+    "id": ("INTEGER PRIMARY KEY AUTOINCREMENT", "BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"),
+    "ref": ("INTEGER", "BIGINT"),           # id άλλου πίνακα
+    "int": ("INTEGER", "INTEGER"),
+    "day": ("INTEGER", "INTEGER"),          # ΕΕΕΕΜΜΗΗ
+    "cents": ("INTEGER", "BIGINT"),         # λεπτά €
+    "real": ("REAL", "DOUBLE PRECISION"),
+    "text": ("TEXT", "TEXT"),
+}
+
+TABLES = {
+    # ΕΡΓΟΔΟΤΕΣ / ΠΕΛΑΤΕΣ
+    "clients": {
+        "columns": (
+            ("id", "id", ""),
+            ("company_name", "text", ""),       # Επωνυμία
+            ("last_name", "text", ""),          # Επίθετο
+            ("first_name", "text", ""),         # Όνομα
+            ("entity_type", "text", ""),        # Σύσταση
+            ("address", "text", ""),
+            ("postal_code", "text", ""),
+            ("city", "text", ""),
+            ("phone_landline", "text", ""),     # σταθερό
+            ("phone_mobile", "text", ""),       # κινητό
+            ("email", "text", ""),
+            ("afm", "text", ""),
+            ("dou", "text", ""),
+            ("taxis_username", "text", ""),
+            ("taxis_password", "text", ""),
+            ("job", "text", ""),                # Επάγγελμα
+        ),
+    },
+    # ΠΡΟΜΗΘΕΥΤΕΣ
+    "suppliers": {
+        "columns": (
+            ("id", "id", ""),
+            ("company_name", "text", ""),       # Επωνυμία Εταιρίας
+            ("last_name", "text", ""),
+            ("first_name", "text", ""),
+            ("entity_type", "text", ""),        # Σύσταση
+            ("job", "text", ""),                # Επάγγελμα
+            ("iban1", "text", ""),
+            ("bank1", "text", ""),
+            ("iban2", "text", ""),
+            ("bank2", "text", ""),
+            ("iban3", "text", ""),
+            ("bank3", "text", ""),
+            ("iban4", "text", ""),
+            ("bank4", "text", ""),
+            ("address", "text", ""),
+            ("postal_code", "text", ""),
+            ("city", "text", ""),
+            ("phone1", "text", ""),
+            ("phone2", "text", ""),
+            ("email", "text", ""),
+            ("afm", "text", ""),
+            ("dou", "text", ""),
+        ),
+    },
+    # ΕΡΓΑ
+    "projects": {
+        "columns": (
+            ("id", "id", ""),
+            ("code", "text", ""),               # Κωδικός Έργου
+            ("reg_date", "day", ""),            # Ημ/νια Εγγραφής
+            ("protocol_no", "text", ""),        # αρ. πρωτ
+            ("client_id", "ref", ""),           # σχέση με clients
+            ("employer_name", "text", ""),      # Εργοδότης (ελεύθερο κείμενο)
+            ("hf_flag", "text", ""),            # ΗΦ-Φ
+            ("project_type", "text", ""),       # Είδος Έργου
+            ("priority", "text", ""),           # Προτεραιότητα
+            ("status", "text", ""),             # Κατάσταση
+            ("status2", "text", ""),            # Κατάσταση2
+            ("description", "text", ""),        # Περιγραφή
+            ("address", "text", ""),            # Διεύθυνση εργου
+            ("postal_code", "text", ""),        # ΤΚ
+            ("city", "text", ""),               # Πόλη
+            ("agreed_amount", "cents", ""),     # Συμφωνημένη Αξία
+            ("invoice_expenses", "cents", ""),  # Έξοδα παραστατικα
+            ("engineer", "text", ""),           # Μηχανικός
+            ("apy", "text", ""),                # ΑΠΥ
+            ("manager", "text", ""),            # Μάνος-Θανάσης
+        ),
+        "references": (("client_id", "clients"),),
+    },
+    # ΠΑΡΑΣΤΑΤΙΚΑ
+    "documents": {
+        "columns": (
+            ("id", "id", ""),
+            ("seq_no", "int", ""),              # α/α
+            ("doc_date", "day", ""),            # Ημ/νία Παρ/τικού
+            ("project_id", "ref", ""),          # Έργα (σχέση με projects)
+            ("billing_type", "text", ""),       # Τιμολόγηση
+            ("supplier_id", "ref", ""),         # Προμηθευτής - Συνεργείο
+            ("work_title", "text", ""),         # Εργασία
+            ("description", "text", ""),        # Περιγραφή
+            ("charge", "cents", ""),            # Χρέωση
+            ("vat", "cents", ""),               # ΦΠΑ
+            ("credit", "cents", ""),            # Πίστωση
+            ("payment_method", "text", ""),     # Τρόπος Πληρωμής
+            ("payments", "cents", ""),          # Καταβολές
+            ("payment_target", "text", ""),     # Που καταβληθηκαν
+        ),
+        "references": (("project_id", "projects"), ("supplier_id", "suppliers")),
+    },
+    # ΗΜΕΡΟΛΟΓΙΟ
+    "worklog": {
+        "columns": (
+            ("id", "id", ""),
+            ("log_date", "day", ""),            # Ημερομηνία
+            ("employee", "text", ""),           # Υπάλληλος
+            ("project_id", "ref", ""),          # Έργο (σχέση με projects)
+            ("work_desc", "text", ""),          # Εργασία
+            ("hours", "real", ""),              # Ώρες
+        ),
+        "references": (("project_id", "projects"),),
+    },
+    # ΤΑΜΕΙΟ
+    "fee_templates": {
+        "columns": (
+            ("id", "id", ""),
+            ("work_type", "text", ""),          # Είδος Έργου
+            ("amount", "cents", ""),            # Ποσό
+        ),
+    },
+
+    # Συγκεντρωτικά, ενημερωμένα από triggers (βλ. db.py)
+    "supplier_balance": {
+        "columns": (
+            ("supplier_id", "ref", "PRIMARY KEY"),
+            ("balance", "cents", "NOT NULL DEFAULT 0"),
+        ),
+    },
+    "project_cost": {
+        "columns": (
+            ("project_id", "ref", "PRIMARY KEY"),
+            ("total_cost", "cents", "NOT NULL DEFAULT 0"),
+        ),
+    },
+    "document_months": {
+        "columns": (
+            ("month", "int", "NOT NULL"),       # ΕΕΕΕΜΜ
+            ("project_id", "ref", "NOT NULL"),  # 0 = χωρίς έργο
+            ("supplier_id", "ref", "NOT NULL"),
+            ("billing_type", "text", "NOT NULL"),
+            ("charge", "cents", "NOT NULL"),
+            ("vat", "cents", "NOT NULL"),
+            ("credit", "cents", "NOT NULL"),
+            ("payments", "cents", "NOT NULL"),
+            ("docs", "int", "NOT NULL"),
+        ),
+        "primary_key": ("month", "project_id", "supplier_id", "billing_type"),
+        "without_rowid": True,
+    },
+    "stale_months": {
+        "columns": (
+            ("month", "int", "PRIMARY KEY"),
+        ),
+    },
+    "project_hours": {
+        "columns": (
+            ("project_id", "ref", "NOT NULL"),
+            ("employee", "text", "NOT NULL"),
+            ("hours", "real", "NOT NULL DEFAULT 0"),
+        ),
+        "primary_key": ("project_id", "employee"),
+        "without_rowid": True,
+    },
+    "employee_rates": {
+        "columns": (
+            ("employee", "text", "PRIMARY KEY"),
+            ("hourly_rate", "cents", "NOT NULL"),
+        ),
+    },
+    "worklog_weeks": {
+        "columns": (
+            ("week", "day", "NOT NULL"),        # Δευτέρα της εβδομάδας
+            ("employee", "text", "NOT NULL"),
+            ("hours", "real", "NOT NULL DEFAULT 0"),
+        ),
+        "primary_key": ("week", "employee"),
+        "without_rowid": True,
+    },
+    "worklog_months": {
+        "columns": (
+            ("month", "int", "NOT NULL"),
+            ("employee", "text", "NOT NULL"),
+            ("project_id", "ref", "NOT NULL"),
+            ("hours", "real", "NOT NULL DEFAULT 0"),
+        ),
+        "primary_key": ("month", "employee", "project_id"),
+        "without_rowid": True,
+    },
+    "jobs": {
+        "columns": (
+            ("id", "id", ""),
+            ("kind", "text", "NOT NULL"),
+            ("params", "text", "NOT NULL DEFAULT '{}'"),
+            ("status", "text", "NOT NULL DEFAULT 'queued'"),
+            ("progress", "real", ""),
+            ("message", "text", ""),
+            ("cancel_requested", "int", "NOT NULL DEFAULT 0"),
+            ("result_path", "text", ""),
+            ("error", "text", ""),
+            ("pid", "int", ""),
+            ("created_at", "real", "NOT NULL"),  # unix time
+            ("started_at", "real", ""),
+            ("finished_at", "real", ""),
+            ("node", "text", ""),               # server που την εκτελεί
+            ("owner", "text", ""),              # διεργασία που την υπέβαλε (jobs.OWNER)
+        ),
+    },
+}
+
+# Ίδια με τα indexes των migrations του SQLite. Οι εκφράσεις γράφονται με
+# IFNULL, όπως στα ερωτήματα: το SQLite ταιριάζει index και ερώτημα μόνο
+# αν η έκφραση είναι ίδια, και στην PostgreSQL μεταφράζονται και τα δύο
+# σε COALESCE (postgres.translate). (όνομα, πίνακας, στήλες, INCLUDE)
+INDEXES = (
+    ("idx_clients_list", "clients",
+     "IFNULL(company_name,''), IFNULL(last_name,''), IFNULL(first_name,''), id", ""),
+    ("idx_clients_city", "clients", "city", ""),
+    ("idx_suppliers_list", "suppliers", "IFNULL(company_name,''), id", ""),
+    ("idx_suppliers_city", "suppliers", "city", ""),
+    ("idx_projects_list", "projects", "IFNULL(reg_date,0), id", ""),
+    ("idx_projects_status", "projects", "status, IFNULL(reg_date,0), id", ""),
+    ("idx_projects_city", "projects", "city", ""),
+    ("idx_documents_list", "documents", "IFNULL(doc_date,0), id", ""),
+    ("idx_documents_project_list", "documents", "project_id, IFNULL(doc_date,0), id", ""),
+    ("idx_documents_supplier_statement", "documents",
+     "supplier_id, IFNULL(doc_date,0), id", "charge, vat, credit, payments"),
+    ("idx_worklog_list", "worklog", "IFNULL(log_date,0), id", ""),
+    ("idx_worklog_project_list", "worklog", "project_id, IFNULL(log_date,0), id", ""),
+    ("idx_worklog_employee_list", "worklog", "employee, IFNULL(log_date,0), id", ""),
+    ("idx_jobs_kind", "jobs", "kind, id", ""),
+    ("idx_jobs_status", "jobs", "status", ""),
+)
+
+
+def table_ddl(table, dialect):
+    # Τα FOREIGN KEY δηλώνονται μόνο στο SQLite, όπου δεν επιβάλλονται
+    # (χωρίς PRAGMA foreign_keys)· στην PostgreSQL θα άλλαζαν τη
+    # συμπεριφορά των διαγραφών.
+    spec = TABLES[table]
+    column = DIALECTS.index(dialect)
+    lines = [
+        " ".join(part for part in (name, COLUMN_TYPES[kind][column], extra) if part)
+        for name, kind, extra in spec["columns"]
+    ]
+    if "primary_key" in spec:
+        lines.append(f"PRIMARY KEY ({', '.join(spec['primary_key'])})")
+    if dialect == "sqlite":
+        lines.extend(f"FOREIGN KEY({c}) REFERENCES {t}(id)" for c, t in spec.get("references", ()))
+    suffix = " WITHOUT ROWID" if dialect == "sqlite" and spec.get("without_rowid") else ""
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n    {body}\n){suffix}"
+
+
+def index_ddl(index, dialect):
+    # Το SQLite δεν έχει INCLUDE: οι στήλες μπαίνουν στο τέλος του κλειδιού
+    name, table, columns, include = index
+    if include and dialect == "sqlite":
+        columns, include = f"{columns}, {include}", ""
+    suffix = f" INCLUDE ({include})" if include else ""
+    return f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns}){suffix}"
+
+
+# ------------------------------------------------------------
+# ΕΛΕΓΧΟΣ ΣΧΗΜΑΤΟΣ SQLite
+# ------------------------------------------------------------
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalized(sql):
+    return _SPACE_RE.sub("", sql).replace("IFNOTEXISTS", "")
+
+
+def sqlite_differences(conn):
+    # Λίστα διαφορών ανάμεσα στη βάση SQLite και στα TABLES / INDEXES
+    problems = []
+    for table, spec in TABLES.items():
+        actual = {r[1]: r[2].upper() for r in conn.execute(f"PRAGMA table_info({table})")}
+        if not actual:
+            problems.append(f"{table}: λείπει ο πίνακας")
+            continue
+        for name, kind, _ in spec["columns"]:
+            expected = COLUMN_TYPES[kind][0].split()[0]
+            if name not in actual:
+                problems.append(f"{table}.{name}: λείπει η στήλη")
+            elif actual[name] != expected:
+                problems.append(f"{table}.{name}: {actual[name]} αντί για {expected}")
+        declared = {name for name, _, _ in spec["columns"]}
+        problems.extend(
+            f"{table}.{name}: δεν ορίζεται στο schema.py" for name in actual if name not in declared
+        )
+
+    indexes = {
+        name: _normalized(sql)
+        for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        )
+    }
+    for index in INDEXES:
+        name = index[0]
+        if name not in indexes:
+            problems.append(f"{name}: λείπει το index")
+        elif indexes[name] != _normalized(index_ddl(index, "sqlite")):
+            problems.append(f"{name}: διαφορετικές στήλες")
+    return problems
@@ -0,0 +1,159 @@
+from ergon import db
+
+RESULT_LIMIT = 20
+
+
+# ------------------------------------------------------------
+# ΑΝΑΖΗΤΗΣΗ ΠΛΗΡΟΥΣ ΚΕΙΜΕΝΟΥ (FTS5)
+# ------------------------------------------------------------
+
+# Ένα ερώτημα ανά οντότητα, ταξινομημένο κατά bm25 (rank). Τα ευρετήρια
+# *_fts και τα triggers τους ορίζονται στα migrations του db.py.
+
+ENTITIES = {
+    "clients": {
+        "title": "Εργοδότες",
+        "query": """
+            SELECT c.id, c.company_name, c.last_name, c.first_name,
+                   c.afm, c.city, c.phone_mobile
+            FROM clients_fts
+            JOIN clients c ON c.id = clients_fts.rowid
+            WHERE clients_fts MATCH ?
+            ORDER BY clients_fts.rank
+            LIMIT ?
+        """,
+        "labels": {
+            "company_name": "Επωνυμία",
+            "last_name": "Επίθετο",
+            "first_name": "Όνομα",
+            "afm": "ΑΦΜ",
+            "city": "Πόλη",
+            "phone_mobile": "Κινητό"
+        },
+    },
+    "suppliers": {
+        "title": "Προμηθευτές",
+        "query": """
+            SELECT s.id, s.company_name, s.last_name, s.first_name,
+                   s.job, s.afm, s.city
+            FROM suppliers_fts
+            JOIN suppliers s ON s.id = suppliers_fts.rowid
+            WHERE suppliers_fts MATCH ?
+            ORDER BY suppliers_fts.rank
+            LIMIT ?
+        """,
+        "labels": {
+            "company_name": "Επωνυμία",
+            "last_name": "Επίθετο",
+            "first_name": "Όνομα",
+            "job": "Επάγγελμα",
+            "afm": "ΑΦΜ",
+            "city": "Πόλη"
+        },
+    },
+    "projects": {
+        "title": "Έργα",
+        "query": """
+            SELECT p.id, p.code, p.reg_date, p.employer_name,
+                   p.project_type, p.status, p.city
+            FROM projects_fts
+            JOIN projects p ON p.id = projects_fts.rowid
+            WHERE projects_fts MATCH ?
+            ORDER BY projects_fts.rank
+            LIMIT ?
+        """,
+        "labels": {
+            "code": "Κωδικός",
+            "reg_date": "Ημ/νια εγγραφής",
+            "employer_name": "Εργοδότης",
+            "project_type": "Είδος Έργου",
+            "status": "Κατάσταση",
+            "city": "Πόλη"
+        },
+    },
+    "documents": {
+        "title": "Παραστατικά",
+        "query": """
+            SELECT d.id, d.doc_date, p.code AS project_code,
+                   s.company_name AS supplier_name,
+                   d.work_title, d.description, d.charge
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            LEFT JOIN projects p ON d.project_id = p.id
+            LEFT JOIN suppliers s ON d.supplier_id = s.id
+            WHERE documents_fts MATCH ?
+            ORDER BY documents_fts.rank
+            LIMIT ?
+        """,
+        "labels": {
+            "doc_date": "Ημ/νία",
+            "project_code": "Κωδ. έργου",
+            "supplier_name": "Προμηθευτής",
+            "work_title": "Εργασία",
+            "description": "Περιγραφή",
+            "charge": "Χρέωση (€)"
+        },
+    },
+}
+
+
+# Έργα και παραστατικά στη βάση αρχείου (archive.py): ίδια ευρετήρια,
+# μόνο όταν η αναζήτηση ζητηθεί ρητά και στο αρχείο.
+ARCHIVED_ENTITIES = {
+    "archived_projects": {
+        "title": "Έργα (αρχείο)",
+        "query": """
+            SELECT p.id, p.code, p.reg_date, p.employer_name,
+                   p.project_type, p.status, p.city
+            FROM archive.projects_fts
+            JOIN archive.projects p ON p.id = projects_fts.rowid
+            WHERE projects_fts MATCH ?
+            ORDER BY projects_fts.rank
+            LIMIT ?
+        """,
+        "labels": ENTITIES["projects"]["labels"],
+    },
+    "archived_documents": {
+        "title": "Παραστατικά (αρχείο)",
+        "query": """
+            SELECT d.id, d.doc_date, p.code AS project_code,
+                   s.company_name AS supplier_name,
+                   d.work_title, d.description, d.charge
+            FROM archive.documents_fts
+            JOIN archive.documents d ON d.id = documents_fts.rowid
+            LEFT JOIN archive.projects p ON d.project_id = p.id
+            LEFT JOIN suppliers s ON d.supplier_id = s.id
+            WHERE documents_fts MATCH ?
+            ORDER BY documents_fts.rank
+            LIMIT ?
+        """,
+        "labels": ENTITIES["documents"]["labels"],
+    },
+}
+
+
+def entity(key):
+    return ENTITIES.get(key) or ARCHIVED_ENTITIES[key]
+
+
+def match_expression(text):
+    # Κάθε λέξη ως πρόθεμα ("παπαδ"*), όλες υποχρεωτικές. Το gr_fold
+    # αφαιρεί εισαγωγικά/τελεστές, οπότε η είσοδος δεν σπάει τη σύνταξη.
+    return " ".join(f'"{token}"*' for token in db.fold_text(text).split())
+
+
+def search(text, limit=RESULT_LIMIT, entities=None, archived=False):
+    expression = match_expression(text)
+    if not expression:
+        return {}
+    specs = dict(ENTITIES)
+    if archived and db.archive_exists():
+        specs.update(ARCHIVED_ENTITIES)
+    results = {}
+    for key, spec in specs.items():
+        if entities and key not in entities:
+            continue
+        rows = db.fetch_all(spec["query"], (expression, limit))
+        if rows:
+            results[key] = rows
+    return results
@@ -0,0 +1,233 @@
+import random
+from datetime import date, timedelta
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# ΣΥΝΘΕΤΙΚΑ ΔΕΔΟΜΕΝΑ (για δοκιμές κλίμακας)
+# ------------------------------------------------------------
+
+# Ίδιος σπόρος = ίδια δεδομένα. Οι κατανομές είναι λοξές όπως στην
+# πράξη: λίγοι προμηθευτές/έργα μαζεύουν τα περισσότερα παραστατικά,
+# περισσότερη κίνηση άνοιξη–φθινόπωρο, ποσά log-normal.
+
+LAST_NAMES = (
+    "Παπαδόπουλος", "Γεωργίου", "Οικονόμου", "Νικολάου", "Δημητρίου", "Ιωάννου",
+    "Κωνσταντίνου", "Αθανασίου", "Παπανικολάου", "Βασιλείου", "Χριστοδούλου",
+    "Μακρής", "Καραγιάννης", "Αλεξίου", "Σταματόπουλος", "Ζαχαρίου", "Λαμπράκης",
+    "Πετρίδης", "Αντωνίου", "Μιχαηλίδης", "Σωτηρίου", "Τσιμάρας", "Φωτίου",
+)
+FIRST_NAMES = (
+    "Γιώργος", "Νίκος", "Κώστας", "Δημήτρης", "Γιάννης", "Μαρία", "Ελένη",
+    "Κατερίνα", "Σοφία", "Αθανάσιος", "Μάνος", "Χρήστος", "Άννα", "Βασίλης",
+)
+COMPANY_WORDS = (
+    "Δομική", "Τεχνική", "Ηλεκτρολογική", "Υδραυλική", "Σιδηρουργία", "Ξυλουργική",
+    "Μεταλλική", "Αλουμίνια", "Μάρμαρα", "Χρώματα", "Οικοδομικά Υλικά", "Σκυρόδεμα",
+    "Μονώσεις", "Κλιματισμός", "Πλακάκια", "Τζάμια",
+)
+COMPANY_FORMS = ("ΑΕ", "ΟΕ", "ΕΕ", "ΙΚΕ", "ΕΠΕ", "")
+CITIES = (
+    "Αθήνα", "Αθήνα", "Αθήνα", "Πειραιάς", "Θεσσαλονίκη", "Θεσσαλονίκη", "Πάτρα",
+    "Ηράκλειο", "Λάρισα", "Βόλος", "Χαλάνδρι", "Μαρούσι", "Γλυφάδα", "Κηφισιά",
+)
+STREETS = ("Πανεπιστημίου", "Σταδίου", "Ερμού", "Αθηνάς", "Κηφισίας", "Βουλιαγμένης", "Εγνατίας")
+DOUS = ("Α' Αθηνών", "ΙΓ' Αθηνών", "Χαλανδρίου", "Αμαρουσίου", "Γλυφάδας", "Δ' Θεσσαλονίκης")
+JOBS = ("Ηλεκτρολόγος", "Υδραυλικός", "Σιδεράς", "Ξυλουργός", "Ελαιοχρωματιστής", "Μαρμαράς", "Χονδρέμπορος")
+PROJECT_TYPES = (
+    "Άδεια Δόμησης", "Νομιμοποίηση", "Ανακαίνιση", "Ενεργειακή Αναβάθμιση",
+    "Στατική Μελέτη", "Τοπογραφικό", "Αυθαίρετα", "Επίβλεψη",
+)
+STATUSES = ("ΣΕ ΕΞΕΛΙΞΗ", "ΣΕ ΕΞΕΛΙΞΗ", "ΣΕ ΕΞΕΛΙΞΗ", "ΟΛΟΚΛΗΡΩΘΗΚΕ", "ΑΝΑΜΟΝΗ", "ΑΚΥΡΩΘΗΚΕ")
+PRIORITIES = ("Υψηλή", "Κανονική", "Κανονική", "Χαμηλή")
+ENGINEERS = ("Μάνος", "Θανάσης", "Ελένη", "Κώστας")
+WORK_TITLES = (
+    "Σοβατίσματα", "Ηλεκτρολογικά", "Υδραυλικά", "Χρωματισμοί", "Πλακάκια",
+    "Κουφώματα", "Μόνωση ταράτσας", "Σκυροδέτηση", "Αποξήλωση", "Μεταφορές",
+)
+BILLING_TYPES = ("Τιμολόγιο", "Τιμολόγιο", "Τιμολόγιο", "Απόδειξη", "ΑΠΥ", "")
+PAYMENT_METHODS = ("Κατάθεση", "Μετρητά", "Επιταγή", "Κάρτα")
+WORK_DESCS = ("Αυτοψία", "Σχέδια", "Υποβολή φακέλου", "Επίβλεψη", "Συνάντηση με πελάτη", "Υπολογισμοί")
+
+
+def skewed_picker(rnd, count, exponent=1.1):
+    # Zipf-like: το στοιχείο k επιλέγεται με βάρος 1/k^exponent
+    weights = [1 / (k ** exponent) for k in range(1, count + 1)]
+    ids = list(range(1, count + 1))
+    rnd.shuffle(ids)
+
+    def pick(n):
+        return rnd.choices(ids, weights=weights, k=n)
+    return pick
+
+
+def random_day(rnd, start, days):
+    # Εποχικότητα: λιγότερη κίνηση Αύγουστο και Δεκέμβριο–Ιανουάριο
+    while True:
+        day = start + timedelta(days=rnd.randrange(days))
+        if day.weekday() < 6 and rnd.random() < (0.35 if day.month in (8, 12, 1) else 1.0):
+            return day
+
+
+def money(rnd, median, sigma=0.9):
+    return int(rnd.lognormvariate(0, sigma) * median * 100)
+
+
+def afm(rnd):
+    return f"{rnd.randrange(10 ** 8, 10 ** 9)}"
+
+
+def phone(rnd, prefix):
+    return f"{prefix}{rnd.randrange(10 ** 7, 10 ** 8)}"
+
+
+def person(rnd):
+    return rnd.choice(LAST_NAMES), rnd.choice(FIRST_NAMES)
+
+
+def company(rnd):
+    last, _ = person(rnd)
+    form = rnd.choice(COMPANY_FORMS)
+    return f"{rnd.choice(COMPANY_WORDS)} {last} {form}".strip()
+
+
+def scale_counts(documents):
+    # Πλήθος γραμμών ανά πίνακα για δεδομένο πλήθος παραστατικών
+    return {
+        "clients": max(20, documents // 40),
+        "suppliers": max(10, documents // 250),
+        "projects": max(20, documents // 20),
+        "documents": documents,
+        "worklog": documents // 2,
+        "fee_templates": len(PROJECT_TYPES),
+    }
+
+
+def seed(documents=10000, years=5, seed_value=1, batch_size=5000, progress=None):
+    # Τα id των αναφορών υπολογίζονται ως 1..N, οπότε θέλει άδεια βάση
+    for table in ("clients", "suppliers", "projects", "documents", "worklog"):
+        if db.fetch_all(f"SELECT 1 FROM {table} LIMIT 1", cache=False):
+            raise ValueError(f"Η βάση δεν είναι άδεια (πίνακας {table}).")
+
+    rnd = random.Random(seed_value)
+    counts = scale_counts(documents)
+    today = date.today()
+    start = date(today.year - years, today.month, 1)
+    span = (today - start).days + 1
+
+    def insert(table, columns, rows):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        done = 0
+        for i in range(0, len(rows), batch_size):
+            db.executemany(sql, rows[i:i + batch_size])
+            done += len(rows[i:i + batch_size])
+            if progress:
+                progress(table, done)
+
+    # Εργοδότες: μισοί ιδιώτες, μισοί εταιρίες
+    rows = []
+    for _ in range(counts["clients"]):
+        last, first = person(rnd)
+        is_company = rnd.random() < 0.5
+        rows.append((
+            company(rnd) if is_company else None, last, first,
+            rnd.choice(COMPANY_FORMS[:-1]) if is_company else "Φυσικό πρόσωπο",
+            f"{rnd.choice(STREETS)} {rnd.randrange(1, 200)}", f"{rnd.randrange(10000, 85000)}",
+            rnd.choice(CITIES), phone(rnd, "21"), phone(rnd, "69"),
+            f"client{rnd.randrange(10 ** 6)}@example.gr", afm(rnd), rnd.choice(DOUS),
+            rnd.choice(JOBS),
+        ))
+    insert("clients", (
+        "company_name", "last_name", "first_name", "entity_type", "address", "postal_code",
+        "city", "phone_landline", "phone_mobile", "email", "afm", "dou", "job",
+    ), rows)
+
+    rows = []
+    for _ in range(counts["suppliers"]):
+        last, first = person(rnd)
+        rows.append((
+            company(rnd), last, first, rnd.choice(COMPANY_FORMS[:-1]), rnd.choice(JOBS),
+            f"GR{rnd.randrange(10 ** 24, 10 ** 25)}", "Εθνική",
+            f"{rnd.choice(STREETS)} {rnd.randrange(1, 200)}", f"{rnd.randrange(10000, 85000)}",
+            rnd.choice(CITIES), phone(rnd, "21"), phone(rnd, "69"),
+            f"supplier{rnd.randrange(10 ** 6)}@example.gr", afm(rnd), rnd.choice(DOUS),
+        ))
+    insert("suppliers", (
+        "company_name", "last_name", "first_name", "entity_type", "job", "iban1", "bank1",
+        "address", "postal_code", "city", "phone1", "phone2", "email", "afm", "dou",
+    ), rows)
+
+    client_names = {
+        r["id"]: r["company_name"] or f"{r['last_name']} {r['first_name']}"
+        for r in db.fetch_all("SELECT id, company_name, last_name, first_name FROM clients", cache=False)
+    }
+    pick_client = skewed_picker(rnd, counts["clients"], 0.8)
+    rows = []
+    for n, client_id in enumerate(pick_client(counts["projects"]), 1):
+        reg_date = random_day(rnd, start, span)
+        rows.append((
+            f"{reg_date.year % 100:02d}-{n:05d}", db.to_day_key(reg_date), f"{rnd.randrange(1, 9999)}",
+            client_id, client_names[client_id], rnd.choice(("ΗΦ", "Φ")),
+            rnd.choice(PROJECT_TYPES), rnd.choice(PRIORITIES),
+            rnd.choice(STATUSES) if reg_date.year < today.year else "ΣΕ ΕΞΕΛΙΞΗ",
+            rnd.choice(("", "Πληρώθηκε", "Εκκρεμεί")),
+            f"{rnd.choice(PROJECT_TYPES)} κατοικίας",
+            f"{rnd.choice(STREETS)} {rnd.randrange(1, 200)}", f"{rnd.randrange(10000, 85000)}",
+            rnd.choice(CITIES), money(rnd, 8000), money(rnd, 300),
+            rnd.choice(ENGINEERS), rnd.choice(("", "ΑΠΥ")), rnd.choice(ENGINEERS[:2]),
+        ))
+    insert("projects", (
+        "code", "reg_date", "protocol_no", "client_id", "employer_name", "hf_flag",
+        "project_type", "priority", "status", "status2", "description", "address",
+        "postal_code", "city", "agreed_amount", "invoice_expenses", "engineer", "apy", "manager",
+    ), rows)
+
+    # Παραστατικά: οι προμηθευτές και τα έργα με λοξή κατανομή
+    pick_supplier = skewed_picker(rnd, counts["suppliers"], 1.1)
+    pick_project = skewed_picker(rnd, counts["projects"], 0.9)
+    suppliers = pick_supplier(documents)
+    projects = pick_project(documents)
+    rows = []
+    for n in range(documents):
+        doc_date = random_day(rnd, start, span)
+        charge = money(rnd, 450)
+        vat = charge * 24 // 100 if rnd.random() < 0.85 else 0
+        paid = rnd.random()
+        rows.append((
+            n + 1, db.to_day_key(doc_date), projects[n] if rnd.random() < 0.95 else None,
+            rnd.choice(BILLING_TYPES), suppliers[n],
+            rnd.choice(WORK_TITLES), f"{rnd.choice(WORK_TITLES)} – {rnd.choice(CITIES)}",
+            charge, vat, charge // 10 if rnd.random() < 0.05 else 0,
+            rnd.choice(PAYMENT_METHODS),
+            charge + vat if paid < 0.7 else (charge + vat) // 2 if paid < 0.85 else 0,
+            rnd.choice(("Λογαριασμός", "Ταμείο", "")),
+        ))
+    insert("documents", (
+        "seq_no", "doc_date", "project_id", "billing_type", "supplier_id", "work_title",
+        "description", "charge", "vat", "credit", "payment_method", "payments", "payment_target",
+    ), rows)
+    rows = None
+
+    employees = list(dict.fromkeys(f"{first} {last}" for last, first in (person(rnd) for _ in range(12))))
+    projects = pick_project(counts["worklog"])
+    rows = [
+        (
+            db.to_day_key(random_day(rnd, start, span)), rnd.choice(employees), projects[n],
+            rnd.choice(WORK_DESCS), rnd.choice((0.5, 1, 1, 2, 2, 3, 4, 8)),
+        )
+        for n in range(counts["worklog"])
+    ]
+    insert("worklog", ("log_date", "employee", "project_id", "work_desc", "hours"), rows)
+
+    insert("fee_templates", ("work_type", "amount"), [
+        (work_type, money(rnd, 1500, 0.4)) for work_type in PROJECT_TYPES
+    ])
+    db.executemany("""
+        INSERT INTO employee_rates (employee, hourly_rate) VALUES (?, ?)
+        ON CONFLICT(employee) DO UPDATE SET hourly_rate = excluded.hourly_rate
+    """, [
+        (employee, rnd.randrange(15, 45) * 100) for employee in employees[:-2]
+    ])
+    db.refresh_rollups()
+    return counts
@@ -0,0 +1,258 @@
+import argparse
+import sys
+from datetime import date
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# ΕΝΤΟΛΕΣ ΣΥΝΤΗΡΗΣΗΣ
+#   python manage.py migrate
+#   python manage.py check-schema
+#   python manage.py rebuild-ledgers
+#   python manage.py verify-ledgers
+#   python manage.py rebuild-rollups
+#   python manage.py rebuild-search
+#   python manage.py import-xlsx αρχείο.xlsx [--sheet Έργα ...]
+#   python manage.py export-xlsx αρχείο.xlsx [--sheet Παραστατικά ...]
+#   python manage.py archive [--before 2024-01-01] [--status Ολοκληρώθηκε ...] [--dry-run] [--vacuum]
+#   python manage.py unarchive 120 121 ...
+#   python manage.py --db bench.db seed --documents 100000
+#   python manage.py --db bench.db bench [--save-baseline]
+#   python manage.py --db postgresql://user@host/ergon copy-from-sqlite erp_ergon.db
+# ------------------------------------------------------------
+
+def cmd_migrate(args):
+    print(f"Έκδοση σχήματος: {db.get_manager().version()}")
+    unparsed = db.unparsed_legacy_dates()
+    if unparsed:
+        print(f"{unparsed} ημερομηνίες δεν αναγνωρίστηκαν· το αρχικό κείμενο κρατήθηκε στον πίνακα legacy_dates.")
+
+
+def cmd_check_schema(args):
+    # Η PostgreSQL δημιουργείται απευθείας από το schema.py· στη SQLite το
+    # σχήμα προκύπτει από τα migrations και ελέγχεται ότι συμφωνεί.
+    from ergon import schema
+
+    if db.is_postgres():
+        print("Το σχήμα της PostgreSQL δημιουργείται από το schema.py.")
+        return 0
+    with db.get_manager().reading() as conn:
+        differences = schema.sqlite_differences(conn)
+    for line in differences:
+        print(line)
+    if differences:
+        print(f"{len(differences)} διαφορές από το schema.py.")
+        return 1
+    print("Το σχήμα της βάσης συμφωνεί με το schema.py.")
+    return 0
+
+
+def cmd_rebuild_ledgers(args):
+    db.rebuild_ledgers()
+    print("Τα υπόλοιπα προμηθευτών και κόστη έργων ξαναϋπολογίστηκαν.")
+
+
+def cmd_verify_ledgers(args):
+    mismatches = db.verify_ledgers()
+    for table, key, stored, fresh in mismatches:
+        print(f"{table} #{key}: αποθηκευμένο {db.from_cents(stored):.2f}, πραγματικό {db.from_cents(fresh):.2f}")
+    if mismatches:
+        print(f"{len(mismatches)} διαφορές. Τρέξτε: python manage.py rebuild-ledgers")
+        return 1
+    print("Τα υπόλοιπα συμφωνούν με τα παραστατικά.")
+    return 0
+
+
+def cmd_rebuild_rollups(args):
+    db.rebuild_rollups()
+    print("Τα μηνιαία σύνολα παραστατικών ξαναϋπολογίστηκαν.")
+
+
+def cmd_rebuild_search(args):
+    db.rebuild_search()
+    print("Τα ευρετήρια αναζήτησης ξαναδημιουργήθηκαν.")
+
+
+def cmd_import_xlsx(args):
+    from ergon import importer
+
+    def progress(sheet, rows):
+        print(f"  {sheet}: {rows} γραμμές", end="\r", flush=True)
+
+    report = importer.import_workbook(
+        args.path, sheets=args.sheet, batch_size=args.batch_size, progress=progress
+    )
+    for sheet, result in report.items():
+        line = f"{sheet}: {result['rows']} εγγραφές"
+        if result["unresolved"]:
+            line += f" ({result['unresolved']} αναφορές χωρίς αντιστοίχιση)"
+        print(line.ljust(60))
+
+
+def cmd_export_xlsx(args):
+    from ergon import exporter
+
+    def progress(sheet, rows):
+        print(f"  {sheet}: {rows} γραμμές", end="\r", flush=True)
+
+    counts = exporter.export_workbook(args.path, sheets=args.sheet, progress=progress)
+    for sheet, rows in counts.items():
+        print(f"{sheet}: {rows} γραμμές".ljust(60))
+    print(f"Αποθηκεύτηκε στο {args.path}")
+
+
+def cmd_archive(args):
+    from ergon import archive
+
+    candidates = archive.candidates(args.before, args.status)
+    for row in candidates.to_pylist():
+        print(f"{row['code'] or '':12} {row['employer_name'] or '':40} {row['status']:14} "
+              f"{row['last_activity']}  {row['docs']} παραστατικά, {row['logs']} ημερολόγιο")
+    if args.dry_run or not candidates.num_rows:
+        print(f"{candidates.num_rows} έργα προς αρχειοθέτηση.")
+        return
+    moved = archive.archive_projects(candidates.column("id").to_pylist(), args.status)
+    print(f"Αρχειοθετήθηκαν {moved} έργα στο {db.archive_path()}.")
+    if args.vacuum:
+        archive.compact()
+        print("Η κύρια βάση συμπιέστηκε (VACUUM).")
+
+
+def cmd_unarchive(args):
+    from ergon import archive
+
+    moved = archive.unarchive_projects(args.ids)
+    print(f"Επανήλθαν {moved} έργα στην κύρια βάση.")
+
+
+def cmd_seed(args):
+    from ergon import seed
+
+    def progress(table, rows):
+        print(f"  {table}: {rows} γραμμές", end="\r", flush=True)
+
+    counts = seed.seed(args.documents, years=args.years, seed_value=args.seed, progress=progress)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} γραμμές".ljust(60))
+
+
+def cmd_bench(args):
+    from ergon import bench
+
+    def progress(name, result):
+        print(f"{name:40} p50 {result['p50']:9.2f} ms   p95 {result['p95']:9.2f} ms   "
+              f"μνήμη {result['peak_kb']:8d} KB")
+
+    results = bench.run(
+        repeat=args.repeat, pages=not args.no_pages, startup=not args.no_startup,
+        only=args.only, progress=progress
+    )
+
+    baseline = bench.load_baseline(args.baseline)
+    status = 0
+    if baseline:
+        if baseline["environment"]["rows"] != bench.environment()["rows"]:
+            print("Προσοχή: η baseline μετρήθηκε σε βάση με διαφορετικό πλήθος γραμμών.")
+        regressions = bench.compare(results, baseline, tolerance=args.tolerance)
+        for name, before, after in regressions:
+            print(f"ΠΑΛΙΝΔΡΟΜΗΣΗ {name}: p95 {before:.2f} -> {after:.2f} ms")
+        if regressions:
+            status = 1
+        else:
+            print("Καμία παλινδρόμηση σε σχέση με τη baseline.")
+    if args.save_baseline:
+        bench.save_baseline(results, args.baseline)
+        print(f"Η baseline αποθηκεύτηκε στο {args.baseline}")
+    return status
+
+
+def cmd_copy_from_sqlite(args):
+    if not db.is_postgres():
+        print("Η αντιγραφή γίνεται προς βάση PostgreSQL (--db postgresql://...).")
+        return 1
+    from ergon import postgres
+
+    def progress(table, rows):
+        print(f"  {table}: {rows} γραμμές", end="\r", flush=True)
+
+    counts = postgres.copy_from_sqlite(args.path, batch_size=args.batch_size, progress=progress)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} γραμμές".ljust(60))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Εργαλεία βάσης Complete Construction")
+    parser.add_argument("--db", default=db.DB_PATH, help="Αρχείο βάσης SQLite ή postgresql://... URL")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("migrate", help="Εφαρμογή εκκρεμών migrations").set_defaults(func=cmd_migrate)
+    sub.add_parser("check-schema", help="Σύγκριση του σχήματος της βάσης με το schema.py") \
+        .set_defaults(func=cmd_check_schema)
+    sub.add_parser("rebuild-ledgers", help="Επανυπολογισμός υπολοίπων από τα παραστατικά") \
+        .set_defaults(func=cmd_rebuild_ledgers)
+    sub.add_parser("verify-ledgers", help="Έλεγχος υπολοίπων έναντι των παραστατικών") \
+        .set_defaults(func=cmd_verify_ledgers)
+    sub.add_parser("rebuild-rollups", help="Επανυπολογισμός μηνιαίων συνόλων για τις αναφορές") \
+        .set_defaults(func=cmd_rebuild_rollups)
+    sub.add_parser("rebuild-search", help="Αναδημιουργία ευρετηρίων αναζήτησης") \
+        .set_defaults(func=cmd_rebuild_search)
+
+    p = sub.add_parser("import-xlsx", help="Εισαγωγή δεδομένων από το παλιό βιβλίο Excel")
+    p.add_argument("path", help="Αρχείο .xlsx")
+    p.add_argument("--sheet", action="append", help="Μόνο τα συγκεκριμένα φύλλα (επαναλαμβανόμενο)")
+    p.add_argument("--batch-size", type=int, default=5000)
+    p.set_defaults(func=cmd_import_xlsx)
+
+    p = sub.add_parser("export-xlsx", help="Εξαγωγή πινάκων και αναφορών σε Excel")
+    p.add_argument("path", help="Αρχείο .xlsx προς δημιουργία")
+    p.add_argument("--sheet", action="append", help="Μόνο τα συγκεκριμένα φύλλα (επαναλαμβανόμενο)")
+    p.set_defaults(func=cmd_export_xlsx)
+
+    p = sub.add_parser("archive", help="Μεταφορά κλειστών έργων στη βάση αρχείου")
+    p.add_argument("--before", type=date.fromisoformat,
+                   help="Χωρίς κίνηση από αυτή την ημερομηνία (ΕΕΕΕ-ΜΜ-ΗΗ)· προεπιλογή: πριν ένα έτος")
+    p.add_argument("--status", action="append",
+                   help="Κατάσταση κλειστού έργου, χωρίς διάκριση τόνων/κεφαλαίων "
+                        "(επαναλαμβανόμενο)· προεπιλογή: archive.CLOSED_STATUSES")
+    p.add_argument("--dry-run", action="store_true", help="Μόνο εμφάνιση των έργων")
+    p.add_argument("--vacuum", action="store_true", help="VACUUM της κύριας βάσης μετά τη μεταφορά")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("unarchive", help="Επαναφορά έργων από τη βάση αρχείου")
+    p.add_argument("ids", type=int, nargs="+", help="id έργων")
+    p.set_defaults(func=cmd_unarchive)
+
+    p = sub.add_parser("seed", help="Συνθετικά δεδομένα σε άδεια βάση (για benchmarks)")
+    p.add_argument("--documents", type=int, default=10000, help="Πλήθος παραστατικών· οι άλλοι πίνακες αναλογικά")
+    p.add_argument("--years", type=int, default=5)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=cmd_seed)
+
+    p = sub.add_parser("bench", help="Χρόνοι ερωτημάτων και σελίδων (p50/p95, μνήμη)")
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--only", action="append", help="Μόνο μετρήσεις με αυτό το πρόθεμα (επαναλαμβανόμενο)")
+    p.add_argument("--no-pages", action="store_true", help="Χωρίς πλήρη απόδοση σελίδων (AppTest)")
+    p.add_argument("--no-startup", action="store_true", help="Χωρίς μέτρηση ψυχρής εκκίνησης")
+    p.add_argument("--baseline", default="bench_baseline.json")
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Ανοχή στο p95 (0.25 = +25%%)")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("copy-from-sqlite", help="Αντιγραφή βάσης SQLite σε άδεια βάση PostgreSQL")
+    p.add_argument("path", help="Αρχείο βάσης SQLite")
+    p.add_argument("--batch-size", type=int, default=5000)
+    p.set_defaults(func=cmd_copy_from_sqlite)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    db.DB_PATH = args.db
+    db.ensure_schema()
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import pytest
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# ΒΑΣΗ ΑΝΑ TEST
+# ------------------------------------------------------------
+
+# Κάθε test παίρνει δική του βάση SQLite με όλα τα migrations· ο manager,
+# το σχήμα και το cache της διεργασίας ξεκινούν από την αρχή και
+# επανέρχονται μετά το test.
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "ergon.db"))
+    monkeypatch.setattr(db, "_manager", None)
+    monkeypatch.setattr(db, "_schema_ready", False)
+    db.query_cache.clear()
+    db.ensure_schema()
+    manager = db.get_manager()
+    yield manager
+    manager.close_all()
+    db.query_cache.clear()
@@ -0,0 +1,73 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from ergon import db, seed
+
+
+# ------------------------------------------------------------
+# ΥΠΟΛΟΙΠΑ (triggers) ΑΠΕΝΑΝΤΙ ΣΕ ΕΠΑΝΥΠΟΛΟΓΙΣΜΟ
+# ------------------------------------------------------------
+
+def _random_amount(rnd):
+    return rnd.choice((None, 0, rnd.randint(1, 500000)))
+
+
+def _random_writes(rnd, count):
+    projects = [r[0] for r in db.fetch_all("SELECT id FROM projects", cache=False)] + [None]
+    suppliers = [r[0] for r in db.fetch_all("SELECT id FROM suppliers", cache=False)] + [None]
+    for _ in range(count):
+        ids = [r[0] for r in db.fetch_all("SELECT id FROM documents", cache=False)]
+        op = rnd.random()
+        if op < 0.4:
+            db.execute("""
+                INSERT INTO documents (doc_date, project_id, supplier_id, charge, vat, credit, payments)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (20240000 + rnd.randint(1, 12) * 100 + rnd.randint(1, 28), rnd.choice(projects),
+                  rnd.choice(suppliers), *(_random_amount(rnd) for _ in range(4))))
+        elif op < 0.8:
+            # Αλλαγή ποσών και μεταφορά σε άλλο έργο / προμηθευτή
+            db.execute("""
+                UPDATE documents SET project_id = ?, supplier_id = ?, charge = ?, payments = ?
+                WHERE id = ?
+            """, (rnd.choice(projects), rnd.choice(suppliers), _random_amount(rnd),
+                  _random_amount(rnd), rnd.choice(ids)))
+        else:
+            db.execute("DELETE FROM documents WHERE id = ?", (rnd.choice(ids),))
+        if rnd.random() < 0.3:
+            db.execute(
+                "INSERT INTO worklog (log_date, employee, project_id, hours) VALUES (?, ?, ?, ?)",
+                (20240115, rnd.choice(("Α", "Β", "Γ")), rnd.choice(projects), rnd.choice((0.5, 1, 2.25)))
+            )
+
+
+def _nonzero(rows):
+    return {key: value for key, value in rows if value}
+
+
+def test_ledgers_match_recomputation(database):
+    seed.seed(documents=300, years=1, seed_value=3)
+    _random_writes(random.Random(7), 200)
+
+    balance, cost = defaultdict(int), defaultdict(int)
+    hours = defaultdict(float)
+    for r in db.fetch_all(
+        "SELECT supplier_id, project_id, charge, vat, credit, payments FROM documents", cache=False
+    ):
+        charge, vat, credit, payments = (v or 0 for v in tuple(r)[2:])
+        if r["supplier_id"] is not None:
+            balance[r["supplier_id"]] += charge + vat - credit - payments
+        if r["project_id"] is not None:
+            cost[r["project_id"]] += charge + vat
+    for r in db.fetch_all("SELECT project_id, employee, hours FROM worklog", cache=False):
+        if r["project_id"] is not None:
+            hours[(r["project_id"], r["employee"])] += r["hours"] or 0
+
+    stored = db.fetch_all("SELECT supplier_id, balance FROM supplier_balance", cache=False)
+    assert _nonzero(tuple(r) for r in stored) == _nonzero(balance.items())
+    stored = db.fetch_all("SELECT project_id, total_cost FROM project_cost", cache=False)
+    assert _nonzero(tuple(r) for r in stored) == _nonzero(cost.items())
+    stored = db.fetch_all("SELECT project_id, employee, hours FROM project_hours", cache=False)
+    assert _nonzero(((r[0], r[1]), r[2]) for r in stored) == pytest.approx(_nonzero(hours.items()))
+    assert db.verify_ledgers() == []
@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+
+from ergon import db, listing, seed
+
+
+# ------------------------------------------------------------
+# ΣΕΛΙΔΟΠΟΙΗΣΗ KEYSET
+# ------------------------------------------------------------
+
+PAGE_SIZE = 7
+
+
+@pytest.fixture
+def seeded(database):
+    seed.seed(documents=400, years=1, seed_value=5)
+    # Γραμμές χωρίς ημερομηνία και πολλές με την ίδια: το κλειδί
+    # (IFNULL(ημερομηνία,0), id) πρέπει να τις διατρέχει όλες μία φορά
+    db.execute("UPDATE projects SET reg_date = NULL WHERE id % 5 = 0")
+    db.execute("UPDATE documents SET doc_date = NULL WHERE id % 11 = 0")
+    db.execute("UPDATE documents SET doc_date = 20240301 WHERE id % 11 = 1")
+    db.execute("UPDATE worklog SET log_date = NULL WHERE id % 9 = 0")
+    return database
+
+
+def _offset_ids(spec, filters):
+    terms = listing.sort_terms(spec)
+    direction = "DESC" if spec["descending"] else "ASC"
+    clauses, params = listing.build_where(spec, filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    ids, offset = [], 0
+    while True:
+        rows = db.fetch_all(f"""
+            SELECT {spec["id"]} FROM {spec["from"]} {where}
+            ORDER BY {", ".join(f"{t} {direction}" for t in terms)}
+            LIMIT ? OFFSET ?
+        """, tuple(params) + (PAGE_SIZE, offset), cache=False)
+        if not rows:
+            return ids
+        ids.extend(r[0] for r in rows)
+        offset += PAGE_SIZE
+
+
+def _keyset_ids(spec, filters):
+    ids, after = [], None
+    while True:
+        table, after, has_next = listing.fetch_page(spec, filters, after, page_size=PAGE_SIZE)
+        ids.extend(table.column("id").to_pylist())
+        if not has_next:
+            return ids
+
+
+@pytest.mark.parametrize("name, filters", [
+    ("clients", {}),
+    ("suppliers", {}),
+    ("projects", {}),
+    ("documents", {}),
+    ("documents", {"doc_date": (date(2024, 3, 1), None)}),
+    ("worklog", {}),
+])
+def test_keyset_walk_matches_offset(seeded, name, filters):
+    spec = listing.LISTS[name]
+    expected = _offset_ids(spec, filters)
+    assert len(expected) > PAGE_SIZE
+    assert _keyset_ids(spec, filters) == expected
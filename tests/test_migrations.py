@@ -0,0 +1,62 @@
+import sqlite3
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# ΜΕΤΑΤΡΟΠΗ ΗΜΕΡΟΜΗΝΙΩΝ / ΠΟΣΩΝ (migration 6)
+# ------------------------------------------------------------
+
+def _legacy_database(path, monkeypatch):
+    # Βάση στην έκδοση 5: ημερομηνίες κείμενο, ποσά REAL
+    conn = db.configure_connection(sqlite3.connect(path))
+    monkeypatch.setattr(db, "MIGRATIONS", db.MIGRATIONS[:5])
+    db.apply_migrations(conn)
+    monkeypatch.undo()
+    assert db.schema_version(conn) == 5
+    return conn
+
+
+def test_legacy_dates_and_amounts(tmp_path, monkeypatch):
+    conn = _legacy_database(str(tmp_path / "legacy.db"), monkeypatch)
+    conn.execute("INSERT INTO suppliers (id, company_name) VALUES (1, 'Προμηθευτής')")
+    conn.execute("INSERT INTO projects (id, code, reg_date, agreed_amount) VALUES (1, 'P1', '15/3/2021', 1500.5)")
+    conn.executemany("""
+        INSERT INTO documents (id, doc_date, project_id, supplier_id, charge, vat, credit, payments, day, month, year)
+        VALUES (?, ?, 1, 1, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (1, "2023-06-02", 0.285, 2.675, None, None, None, None, None),
+        (2, "2023-06-02 10:11", 1.005, None, 0.125, None, None, None, None),
+        (3, "02/06/2023", -0.125, None, None, "12.345", None, None, None),
+        (4, "2/6/23", 10, None, None, None, None, None, None),
+        (5, "02.06.2023", 10, None, None, None, None, None, None),
+        (6, "σύντομα", 10, None, None, None, 5, 7, 2022),
+        (7, "κάποτε", 10, None, None, None, None, None, None),
+        (8, "", 10, None, None, None, None, None, None),
+    ])
+    conn.execute("INSERT INTO worklog (id, log_date, employee, hours) VALUES (1, '31/12/2022', 'Α', 2), (2, '31/02/2022', 'Β', 1)")
+    conn.commit()
+
+    assert db.apply_migrations(conn)[0] == 6
+    assert db.schema_version(conn) == db.MIGRATIONS[-1][0]
+
+    docs = {r["id"]: tuple(r)[1:] for r in conn.execute(
+        "SELECT id, doc_date, charge, vat, credit, payments FROM documents"
+    )}
+    # Όλες οι μορφές της παλιάς εφαρμογής, και ΗΜΕΡΑ/ΜΗΝΑ/ΕΤΟΣ όπου λείπει η ημερομηνία
+    assert [docs[i][0] for i in range(1, 9)] == [20230602] * 5 + [20220705, None, None]
+    # Μισό λεπτό προς τα πάνω, όπως το db.to_cents
+    assert docs[1][1:] == (29, 268, None, None)
+    assert docs[2][1:] == (101, None, 13, None)
+    assert docs[3][1:] == (-13, None, None, 1235)
+    assert [db.to_cents(v) for v in (0.285, 2.675, 1.005, 0.125, -0.125)] == [29, 268, 101, 13, -13]
+
+    assert tuple(conn.execute("SELECT reg_date, agreed_amount FROM projects").fetchone()) == (20210315, 150050)
+    assert [r[0] for r in conn.execute("SELECT log_date FROM worklog ORDER BY id")] == [20221231, None]
+    # Ό,τι δεν αναγνωρίστηκε κρατιέται αυτούσιο
+    assert sorted(tuple(r) for r in conn.execute(
+        "SELECT table_name, row_id, value FROM legacy_dates"
+    )) == [("documents", 6, "σύντομα"), ("documents", 7, "κάποτε"), ("worklog", 2, "31/02/2022")]
+
+    assert db._verify_ledgers(conn) == []
+    conn.close()
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from ergon import db
+
+
+# ------------------------------------------------------------
+# GROUP COMMIT: ΑΠΟΜΟΝΩΣΗ ΛΑΘΩΝ
+# ------------------------------------------------------------
+
+def _insert(work_type):
+    def run(conn):
+        return conn.execute(
+            "INSERT INTO fee_templates (work_type, amount) VALUES (?, 0)", (work_type,)
+        ).lastrowid
+    return run
+
+
+def _work_types():
+    return sorted(r[0] for r in db.fetch_all("SELECT work_type FROM fee_templates", cache=False))
+
+
+def test_failed_job_rolls_back_alone(database):
+    calls = []
+
+    def side_effect(conn):
+        # Όχι replayable: δεν πρέπει να ξανατρέξει λόγω λάθους άλλης εργασίας
+        calls.append(1)
+        return _insert("side")(conn)
+
+    def failing(conn):
+        _insert("bad")(conn)
+        raise RuntimeError("boom")
+
+    # Το thread εγγραφής περιμένει, ώστε όλες οι εργασίες να μπουν στην ουρά μαζί
+    gate = threading.Event()
+    database.submit(lambda conn: gate.wait(), replayable=True)
+    ok = [database.submit(_insert(f"ok{i}"), ("fee_templates",), replayable=True) for i in range(5)]
+    side = database.submit(side_effect, ("fee_templates",))
+    ok += [database.submit(_insert(f"ok{i}"), ("fee_templates",), replayable=True) for i in range(5, 8)]
+    bad = database.submit(failing, ("fee_templates",), replayable=True)
+    ok += [database.submit(_insert(f"ok{i}"), ("fee_templates",), replayable=True) for i in range(8, 10)]
+    gate.set()
+
+    assert all(f.result(timeout=10) for f in ok)
+    assert side.result(timeout=10)
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=10)
+    assert calls == [1]
+    assert _work_types() == sorted([f"ok{i}" for i in range(10)] + ["side"])
+
+
+def test_failed_side_effect_job_does_not_touch_batch(database):
+    def failing(conn):
+        _insert("bad")(conn)
+        raise RuntimeError("boom")
+
+    gate = threading.Event()
+    database.submit(lambda conn: gate.wait(), replayable=True)
+    before = [database.submit(_insert(f"ok{i}"), ("fee_templates",), replayable=True) for i in range(3)]
+    bad = database.submit(failing, ("fee_templates",))
+    after = [database.submit(_insert(f"ok{i}"), ("fee_templates",), replayable=True) for i in range(3, 6)]
+    gate.set()
+
+    assert all(f.result(timeout=10) for f in before + after)
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=10)
+    assert _work_types() == [f"ok{i}" for i in range(6)]